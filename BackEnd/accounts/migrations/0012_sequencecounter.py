@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_passwordresetrequest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SequenceCounter',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0, help_text='Last number handed out')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
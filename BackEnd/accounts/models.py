@@ -1,6 +1,6 @@
 # accounts/models.py
 
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import BaseUserManager, PermissionsMixin
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.utils import timezone
@@ -236,4 +236,45 @@ class PasswordResetRequest(models.Model):
     completed_at = models.DateTimeField(blank=True, null=True)
 
     def __str__(self):
-        return f"{self.email} - {self.status}"
\ No newline at end of file
+        return f"{self.email} - {self.status}"
+
+
+# =========================
+# Sequence Counter
+# =========================
+class SequenceCounter(models.Model):
+    """
+    Named, gap-free counter for human-facing numbers
+    (student numbers, transaction reference numbers).
+
+    allocate() locks the counter row for the rest of the caller's transaction,
+    so concurrent approvals queue up instead of colliding, and a rolled-back
+    transaction returns its numbers instead of leaving a gap.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0, help_text="Last number handed out")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} = {self.value}"
+
+    @classmethod
+    def allocate(cls, name, count=1, seed=None):
+        """
+        Reserve `count` consecutive numbers from the named counter and return them as a range.
+        `seed` is an optional callable returning the last number already in use;
+        it only runs the first time a counter is created.
+        """
+        if count < 1:
+            return range(0)
+        with transaction.atomic():
+            counter = cls.objects.select_for_update().filter(name=name).first()
+            if counter is None:
+                counter, _ = cls.objects.get_or_create(
+                    name=name, defaults={"value": int(seed() or 0) if seed else 0}
+                )
+                counter = cls.objects.select_for_update().get(name=name)
+            first = counter.value + 1
+            counter.value += count
+            counter.save(update_fields=["value", "updated_at"])
+        return range(first, first + count)
@@ -1,4 +1,5 @@
 # accounts/serializers.py
+from django.db.models import Count, Prefetch
 from rest_framework import serializers
 from .models import User, UserProfile, TeacherProfile, AdminProfile, Section, Subject, PasswordResetRequest
 
@@ -54,17 +55,26 @@ class SectionSerializer(serializers.ModelSerializer):
             return obj.adviser.user.username
         return None
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Name lists are opt-in (?include_names=1); the section pickers only need counts.
+        request = self.context.get("request")
+        if not (request and request.query_params.get("include_names") == "1"):
+            self.fields.pop("student_names")
+
     def get_student_count(self, obj):
-        return obj.students.count()
+        # section_queryset() annotates the count; fall back to a query otherwise.
+        count = getattr(obj, "roster_size", None)
+        return obj.students.count() if count is None else count
 
     def get_is_full(self, obj):
         capacity = getattr(obj, "capacity", 0) or 0
         if capacity <= 0:
             return False
-        return obj.students.count() >= capacity
+        return self.get_student_count(obj) >= capacity
 
     def get_student_ids(self, obj):
-        return list(obj.students.values_list("id", flat=True))
+        return [student.id for student in obj.students.all()]
 
     def get_student_names(self, obj):
         return [
@@ -72,6 +82,17 @@ class SectionSerializer(serializers.ModelSerializer):
             for student in obj.students.all()
         ]
 
+    @staticmethod
+    def section_queryset():
+        """Sections with the roster counted and the roster prefetched: a constant number of queries."""
+        roster = UserProfile.objects.only("id", "section_id", "student_first_name", "student_last_name")
+        return (
+            Section.objects
+            .select_related("room", "adviser", "adviser__user")
+            .annotate(roster_size=Count("students"))
+            .prefetch_related(Prefetch("students", queryset=roster))
+        )
+
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
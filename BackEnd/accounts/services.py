@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import send_mail
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from .models import PasswordResetRequest
+
+
+# =========================
+# Background jobs
+# =========================
+def send_password_reset_link(reset_request_id):
+    """Job handler: email the reset link for an admin-approved password reset request."""
+    reset_request = PasswordResetRequest.objects.select_related("user").filter(pk=reset_request_id).first()
+    if reset_request is None or reset_request.status == "COMPLETED":
+        return
+
+    user = reset_request.user
+    # The token is generated at send time so it never sits in the job table.
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
+    token = default_token_generator.make_token(user)
+
+    frontend_url = getattr(settings, "FRONTEND_URL", "http://localhost:5173")
+    reset_link = f"{frontend_url}/reset-password/{uid}/{token}"
+
+    send_mail(
+        subject="CESI Password Reset Link",
+        message=(
+            f"Hello {user.username or user.email},\n\n"
+            f"Your password reset request has been approved by the admin.\n\n"
+            f"Click this link to reset your password:\n"
+            f"{reset_link}\n\n"
+            f"If you did not request this, please ignore this email.\n\n"
+            f"Thanks,\n"
+            f"CESI Admin"
+        ),
+        from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@cesi.com"),
+        recipient_list=[user.email],
+        fail_silently=False,
+    )
@@ -1,3 +1,75 @@
+from django.db import connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .models import Section, SequenceCounter, User, UserProfile
+
+
+class SequenceCounterTest(TestCase):
+    def test_block_allocation_is_consecutive(self):
+        self.assertEqual(list(SequenceCounter.allocate("test", 3)), [1, 2, 3])
+        self.assertEqual(list(SequenceCounter.allocate("test", 2)), [4, 5])
+        self.assertEqual(list(SequenceCounter.allocate("other")), [1])
+
+    def test_seed_runs_once_and_rollback_leaves_no_gap(self):
+        calls = []
+
+        def seed():
+            calls.append(1)
+            return 41
+
+        self.assertEqual(list(SequenceCounter.allocate("seeded", seed=seed)), [42])
+        try:
+            with transaction.atomic():
+                SequenceCounter.allocate("seeded", 5, seed=seed)
+                raise RuntimeError("approval failed")
+        except RuntimeError:
+            pass
+        self.assertEqual(list(SequenceCounter.allocate("seeded", seed=seed)), [43])
+        self.assertEqual(len(calls), 1)
+
+
+class SectionListQueryTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(
+            username="admin", email="admin@test.com", password="x", role="ADMIN"
+        ))
+
+    def add_sections(self, count):
+        for i in range(count):
+            section = Section.objects.create(name=f"S{Section.objects.count()}", grade_level="grade1", capacity=2)
+            for j in range(2):
+                user = User.objects.create_user(
+                    username=f"{section.name}-{j}", email=f"{section.name}-{j}@test.com", password="x"
+                )
+                UserProfile.objects.create(
+                    user=user, section=section, student_first_name="Kid", student_last_name=str(j),
+                    grade_level="grade1", parent_first_name="P", parent_last_name="Q",
+                    contact_number="0917", address="Manila",
+                )
+
+    def list_sections(self, query=""):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f"/api/accounts/sections/{query}")
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_sections(self):
+        self.add_sections(2)
+        data, few = self.list_sections()
+        self.add_sections(5)
+        data, many = self.list_sections()
+
+        self.assertEqual(few, many)
+        self.assertEqual(len(data), 7)
+        self.assertEqual(data[0]["student_count"], 2)
+        self.assertTrue(data[0]["is_full"])
+        self.assertEqual(len(data[0]["student_ids"]), 2)
+        self.assertNotIn("student_names", data[0])
+
+    def test_student_names_are_opt_in(self):
+        self.add_sections(1)
+        data, _ = self.list_sections("?include_names=1")
+        self.assertEqual(data[0]["student_names"], ["Kid 0", "Kid 1"])
@@ -3,9 +3,9 @@ import token
 from urllib import request
 
 from django.contrib.auth.tokens import default_token_generator
-from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
-from django.utils.encoding import force_bytes, force_str
-from django.core.mail import send_mail
+from django.utils.http import urlsafe_base64_decode
+from django.utils.encoding import force_str
+from django.db import transaction
 from django.conf import settings
 from django.utils import timezone
 from django.db.models import Q
@@ -38,6 +38,7 @@ from .serializers import (
 )
 
 from enrollment.models import Enrollment
+from jobs.services import enqueue
 
 
 #
@@ -382,13 +383,7 @@ class SubjectDetail(generics.RetrieveUpdateDestroyAPIView):
 # SECTION CRUD
 # ══════════════════════════════════════════════════════
 class SectionListCreate(generics.ListCreateAPIView):
-    queryset = (
-        Section.objects
-        .select_related("adviser", "adviser__user")
-        .prefetch_related("students")
-        .all()
-        .order_by("grade_level", "name")
-    )
+    queryset = SectionSerializer.section_queryset().order_by("grade_level", "name")
     serializer_class = SectionSerializer
     permission_classes = [IsAuthenticated]
 
@@ -399,12 +394,7 @@ class SectionListCreate(generics.ListCreateAPIView):
 
 
 class SectionDetail(generics.RetrieveUpdateDestroyAPIView):
-    queryset = (
-        Section.objects
-        .select_related("adviser", "adviser__user")
-        .prefetch_related("students")
-        .all()
-    )
+    queryset = SectionSerializer.section_queryset()
     serializer_class = SectionSerializer
     permission_classes = [IsAuthenticated]
 
@@ -704,41 +694,15 @@ class AdminSendPasswordResetLinkView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user = reset_request.user
-
-        uid = urlsafe_base64_encode(force_bytes(user.pk))
-        token = default_token_generator.make_token(user)
-
-        frontend_url = getattr(settings, "FRONTEND_URL", "http://localhost:5173")
-        reset_link = f"{frontend_url}/reset-password/{uid}/{token}"
-
-        subject = "CESI Password Reset Link"
-        message = (
-            f"Hello {user.username or user.email},\n\n"
-            f"Your password reset request has been approved by the admin.\n\n"
-            f"Click this link to reset your password:\n"
-            f"{reset_link}\n\n"
-            f"If you did not request this, please ignore this email.\n\n"
-            f"Thanks,\n"
-            f"CESI Admin"
-        )
-        print("SENDING TO:", user.email)
-        print("RESET LINK:", reset_link)
-            
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@cesi.com"),
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
-
-        reset_request.status = "LINK_SENT"
-        reset_request.sent_at = timezone.now()
-        reset_request.save()
+        # The email goes out from the job worker; the request only records it.
+        with transaction.atomic():
+            enqueue("accounts.services.send_password_reset_link", {"reset_request_id": reset_request.pk})
+            reset_request.status = "LINK_SENT"
+            reset_request.sent_at = timezone.now()
+            reset_request.save()
 
         return Response(
-            {"detail": "Reset link sent successfully."},
+            {"detail": "Reset link queued for sending."},
             status=status.HTTP_200_OK,
         )
 
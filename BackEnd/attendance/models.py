@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Count, Q
 from django.conf import settings
 
 
@@ -68,10 +69,25 @@ class AttendanceRecord(models.Model):
             subject = "General"
         return f"{self.student.username} - {self.date} - {subject} - {self.status}"
 
+    @staticmethod
+    def status_counts():
+        """Conditional-aggregate annotations: total plus one count per status."""
+        return {
+            "total": Count("id"),
+            "present": Count("id", filter=Q(status="PRESENT")),
+            "absent": Count("id", filter=Q(status="ABSENT")),
+            "late": Count("id", filter=Q(status="LATE")),
+            "excused": Count("id", filter=Q(status="EXCUSED")),
+        }
+
+    @staticmethod
+    def _empty_stats():
+        return {"total": 0, "present": 0, "absent": 0, "late": 0, "excused": 0, "percentage": None}
+
     @classmethod
-    def get_student_attendance_stats(
+    def get_roster_attendance_stats(
         cls,
-        student_id,
+        student_ids,
         quarter_start,
         quarter_end,
         schedule_id=None,
@@ -79,12 +95,18 @@ class AttendanceRecord(models.Model):
         section_id=None,
     ):
         """
-        Calculate attendance stats for a student within a date range.
-        Optionally filter by a specific schedule, a list of schedules, or a section.
-        Returns dict with counts and percentage.
+        Attendance stats for many students within a date range, in one
+        grouped conditional-aggregate query.
+        Accepts the same filters as get_student_attendance_stats.
+        Returns {student_id: stats} with an entry for every requested student.
         """
+        student_ids = [int(s) for s in student_ids]
+        stats = {student_id: cls._empty_stats() for student_id in student_ids}
+        if not student_ids:
+            return stats
+
         records = cls.objects.filter(
-            student_id=student_id,
+            student_id__in=student_ids,
             date__gte=quarter_start,
             date__lte=quarter_end,
         )
@@ -95,28 +117,49 @@ class AttendanceRecord(models.Model):
         elif schedule_id:
             records = records.filter(schedule_id=schedule_id)
 
-        total = records.count()
-        if total == 0:
-            return {"total": 0, "present": 0, "absent": 0, "late": 0, "excused": 0, "percentage": None}
-
-        present = records.filter(status="PRESENT").count()
-        absent = records.filter(status="ABSENT").count()
-        late = records.filter(status="LATE").count()
-        excused = records.filter(status="EXCUSED").count()
-
-        # For grade: Present + Late + Excused counts as "attended"
-        attended = present + late + excused
-        percentage = (attended / total) * 100 if total > 0 else 0
+        rows = (
+            records.values("student_id")
+            .annotate(**cls.status_counts())
+            .order_by()
+        )
+        for row in rows:
+            total = row["total"]
+            # For grade: Present + Late + Excused counts as "attended"
+            attended = row["present"] + row["late"] + row["excused"]
+            stats[row["student_id"]] = {
+                "total": total,
+                "present": row["present"],
+                "absent": row["absent"],
+                "late": row["late"],
+                "excused": row["excused"],
+                "attended": attended,
+                "percentage": round((attended / total) * 100, 2),
+            }
+        return stats
 
-        return {
-            "total": total,
-            "present": present,
-            "absent": absent,
-            "late": late,
-            "excused": excused,
-            "attended": attended,
-            "percentage": round(percentage, 2),
-        }
+    @classmethod
+    def get_student_attendance_stats(
+        cls,
+        student_id,
+        quarter_start,
+        quarter_end,
+        schedule_id=None,
+        schedule_ids=None,
+        section_id=None,
+    ):
+        """
+        Calculate attendance stats for a student within a date range.
+        Optionally filter by a specific schedule, a list of schedules, or a section.
+        Returns dict with counts and percentage.
+        """
+        return cls.get_roster_attendance_stats(
+            [student_id],
+            quarter_start,
+            quarter_end,
+            schedule_id=schedule_id,
+            schedule_ids=schedule_ids,
+            section_id=section_id,
+        )[int(student_id)]
 
     @classmethod
     def get_daily_summary(cls, student_id, date):
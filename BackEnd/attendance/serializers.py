@@ -80,30 +80,70 @@ class AttendanceRecordSerializer(serializers.ModelSerializer):
         return None
 
 
+def validate_attendance_records(data):
+    for record in data:
+        if "student_id" not in record:
+            raise serializers.ValidationError("Each record must have a student_id")
+        if not str(record["student_id"]).isdigit():
+            raise serializers.ValidationError(f"Invalid student_id: {record['student_id']}")
+        if "status" not in record:
+            raise serializers.ValidationError("Each record must have a status")
+        if record["status"] not in ["PRESENT", "ABSENT", "LATE", "EXCUSED"]:
+            raise serializers.ValidationError(f"Invalid status: {record['status']}")
+    return data
+
+
+class AttendanceSessionSerializer(serializers.Serializer):
+    """One date + schedule (subject period) worth of attendance inside a bulk payload."""
+    date = serializers.DateField()
+    schedule = serializers.IntegerField(required=False, allow_null=True)
+    subject = serializers.IntegerField(required=False, allow_null=True)
+    records = serializers.ListField(
+        child=serializers.DictField(
+            child=serializers.CharField(allow_blank=True),
+        )
+    )
+
+    def validate_records(self, data):
+        return validate_attendance_records(data)
+
+
 class BulkAttendanceSerializer(serializers.Serializer):
     """
     For bulk creating/updating attendance records.
     Now supports per-subject attendance with optional schedule field.
+    Either a single session (date/schedule/records) or a list of
+    sessions covering several dates and schedules.
     """
     section = serializers.IntegerField()
-    date = serializers.DateField()
+    date = serializers.DateField(required=False)
     schedule = serializers.IntegerField(required=False, allow_null=True)
     subject = serializers.IntegerField(required=False, allow_null=True)
     records = serializers.ListField(
         child=serializers.DictField(
             child=serializers.CharField(allow_blank=True),
-        )
+        ),
+        required=False,
     )
+    sessions = AttendanceSessionSerializer(many=True, required=False)
 
     def validate_records(self, data):
-        for record in data:
-            if "student_id" not in record:
-                raise serializers.ValidationError("Each record must have a student_id")
-            if "status" not in record:
-                raise serializers.ValidationError("Each record must have a status")
-            if record["status"] not in ["PRESENT", "ABSENT", "LATE", "EXCUSED"]:
-                raise serializers.ValidationError(f"Invalid status: {record['status']}")
-        return data
+        return validate_attendance_records(data)
+
+    def validate(self, attrs):
+        if attrs.get("sessions"):
+            if "records" in attrs or "date" in attrs:
+                raise serializers.ValidationError("Send either sessions or date/records, not both.")
+            return attrs
+        if "date" not in attrs or "records" not in attrs:
+            raise serializers.ValidationError("date and records are required when sessions is not given.")
+        attrs["sessions"] = [{
+            "date": attrs.pop("date"),
+            "schedule": attrs.pop("schedule", None),
+            "subject": attrs.pop("subject", None),
+            "records": attrs.pop("records"),
+        }]
+        return attrs
 
 
 class SectionSimpleSerializer(serializers.ModelSerializer):
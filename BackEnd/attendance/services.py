@@ -0,0 +1,100 @@
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import AttendanceRecord
+
+
+UPSERT_FIELDS = ["section_id", "status", "notes", "marked_by_id", "subject_id", "updated_at"]
+
+
+class InvalidScheduleError(ValueError):
+    """A submitted schedule does not belong to the submitted section."""
+
+
+def resolve_session_subjects(section_id, sessions):
+    """
+    Validate every schedule in the payload against the section with one query.
+    Returns sessions with the canonical subject filled in from the schedule.
+    """
+    from classmanagement.models import Schedule
+
+    schedule_ids = {s["schedule"] for s in sessions if s.get("schedule") is not None}
+    schedule_subjects = dict(
+        Schedule.objects.filter(id__in=schedule_ids, section_id=section_id).values_list("id", "subject_id")
+    )
+    missing = schedule_ids - set(schedule_subjects)
+    if missing:
+        raise InvalidScheduleError(sorted(missing))
+
+    resolved = []
+    for session in sessions:
+        schedule_id = session.get("schedule")
+        subject_id = session.get("subject")
+        if schedule_id is not None:
+            # Canonical subject comes from schedule when schedule is provided.
+            subject_id = schedule_subjects[schedule_id]
+        resolved.append({**session, "schedule": schedule_id, "subject": subject_id})
+    return resolved
+
+
+def upsert_attendance(section_id, sessions, marked_by):
+    """
+    Create or update attendance for one or more (date, schedule) sessions of a section.
+
+    `sessions` is a list of {"date", "schedule", "subject", "records": [{student_id, status, notes}]}.
+    Existing rows are fetched in one query and written back with one bulk_update
+    and one bulk_create inside a single transaction. If the same
+    (student, date, schedule) appears twice, the later entry wins.
+    Returns (created_count, updated_count).
+    """
+    rows = {}
+    for session in sessions:
+        for record in session["records"]:
+            key = (int(record["student_id"]), session["date"], session["schedule"])
+            rows[key] = {
+                "section_id": section_id,
+                "status": record["status"],
+                "notes": record.get("notes", ""),
+                "marked_by_id": marked_by.id if marked_by else None,
+                "subject_id": session["subject"],
+            }
+    if not rows:
+        return 0, 0
+
+    student_ids = {key[0] for key in rows}
+    dates = {key[1] for key in rows}
+    schedule_ids = {key[2] for key in rows if key[2] is not None}
+    schedule_filter = Q(schedule_id__in=schedule_ids)
+    if any(key[2] is None for key in rows):
+        schedule_filter |= Q(schedule__isnull=True)
+
+    with transaction.atomic():
+        existing = {
+            (rec.student_id, rec.date, rec.schedule_id): rec
+            for rec in AttendanceRecord.objects.select_for_update()
+            .filter(schedule_filter, student_id__in=student_ids, date__in=dates)
+            .order_by("id")
+        }
+
+        now = timezone.now()
+        to_create, to_update = [], []
+        for key, values in rows.items():
+            record = existing.get(key)
+            if record is None:
+                to_create.append(AttendanceRecord(
+                    student_id=key[0], date=key[1], schedule_id=key[2], **values
+                ))
+                continue
+            for field, value in values.items():
+                setattr(record, field, value)
+            # bulk_update skips auto_now, so stamp it explicitly.
+            record.updated_at = now
+            to_update.append(record)
+
+        if to_update:
+            AttendanceRecord.objects.bulk_update(to_update, UPSERT_FIELDS, batch_size=500)
+        if to_create:
+            AttendanceRecord.objects.bulk_create(to_create, batch_size=500)
+
+    return len(to_create), len(to_update)
@@ -1,3 +1,179 @@
+from datetime import date, time
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User, Section, Subject
+from classmanagement.models import Schedule
+from .models import AttendanceRecord
+
+
+class RosterAttendanceStatsTest(TestCase):
+    def setUp(self):
+        self.section = Section.objects.create(name="Section A", grade_level="grade1")
+        self.students = [
+            User.objects.create_user(username=f"student{i}", email=f"student{i}@test.com", password="testpass123")
+            for i in range(3)
+        ]
+        s0, s1, _ = self.students
+        for day, status in [(1, "PRESENT"), (2, "LATE"), (3, "ABSENT"), (4, "EXCUSED")]:
+            AttendanceRecord.objects.create(
+                student=s0, section=self.section, date=date(2025, 6, day), status=status
+            )
+        AttendanceRecord.objects.create(
+            student=s1, section=self.section, date=date(2025, 6, 1), status="ABSENT"
+        )
+        # Outside the range
+        AttendanceRecord.objects.create(
+            student=s1, section=self.section, date=date(2025, 9, 1), status="PRESENT"
+        )
+
+    def test_roster_stats_in_one_query(self):
+        ids = [s.id for s in self.students]
+        with self.assertNumQueries(1):
+            stats = AttendanceRecord.get_roster_attendance_stats(ids, date(2025, 6, 1), date(2025, 8, 31))
+
+        self.assertEqual(stats[ids[0]], {
+            "total": 4, "present": 1, "absent": 1, "late": 1, "excused": 1,
+            "attended": 3, "percentage": 75.0,
+        })
+        self.assertEqual(stats[ids[1]]["percentage"], 0.0)
+        self.assertIsNone(stats[ids[2]]["percentage"])
+
+    def test_single_student_wrapper_matches_roster(self):
+        student = self.students[0]
+        single = AttendanceRecord.get_student_attendance_stats(
+            student.id, date(2025, 6, 1), date(2025, 8, 31), section_id=self.section.id
+        )
+        roster = AttendanceRecord.get_roster_attendance_stats(
+            [student.id], date(2025, 6, 1), date(2025, 8, 31), section_id=self.section.id
+        )
+        self.assertEqual(single, roster[student.id])
+
+
+class BulkUpsertTest(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(
+            username="teacher1", email="teacher1@test.com", password="testpass123", role="TEACHER"
+        )
+        self.section = Section.objects.create(name="Section A", grade_level="grade1")
+        self.other_section = Section.objects.create(name="Section B", grade_level="grade1")
+        self.math = Subject.objects.create(name="Math", code="MATH")
+        self.science = Subject.objects.create(name="Science", code="SCI")
+        self.math_period = Schedule.objects.create(
+            subject=self.math, section=self.section, day_of_week="MON",
+            start_time=time(8, 0), end_time=time(9, 0),
+        )
+        self.science_period = Schedule.objects.create(
+            subject=self.science, section=self.section, day_of_week="MON",
+            start_time=time(9, 0), end_time=time(10, 0),
+        )
+        self.foreign_period = Schedule.objects.create(
+            subject=self.math, section=self.other_section, day_of_week="MON",
+            start_time=time(8, 0), end_time=time(9, 0),
+        )
+        self.students = [
+            User.objects.create_user(username=f"student{i}", email=f"student{i}@test.com", password="testpass123")
+            for i in range(4)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+        self.url = "/api/attendance/records/bulk_upsert/"
+
+    def _records(self, status):
+        return [{"student_id": s.id, "status": status, "notes": ""} for s in self.students]
+
+    def test_single_session_creates_then_updates(self):
+        payload = {
+            "section": self.section.id, "date": "2025-06-02",
+            "schedule": self.math_period.id, "records": self._records("PRESENT"),
+        }
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual((response.data["created"], response.data["updated"]), (4, 0))
+
+        payload["records"] = self._records("LATE")
+        with self.assertNumQueries(5):
+            response = self.client.post(self.url, payload, format="json")
+        self.assertEqual((response.data["created"], response.data["updated"]), (0, 4))
+        records = AttendanceRecord.objects.filter(schedule=self.math_period)
+        self.assertEqual(set(records.values_list("status", flat=True)), {"LATE"})
+        self.assertEqual(set(records.values_list("subject_id", flat=True)), {self.math.id})
+        self.assertEqual(set(records.values_list("marked_by_id", flat=True)), {self.teacher.id})
+
+    def test_week_payload_in_one_request(self):
+        sessions = [
+            {"date": f"2025-06-0{day}", "schedule": period.id, "records": self._records("PRESENT")}
+            for day in (2, 3, 4, 5, 6)
+            for period in (self.math_period, self.science_period)
+        ]
+        response = self.client.post(self.url, {"section": self.section.id, "sessions": sessions}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 5 * 2 * 4)
+        self.assertEqual(
+            AttendanceRecord.objects.filter(schedule=self.science_period, subject=self.science).count(), 20
+        )
+
+    def test_schedule_from_another_section_is_rejected(self):
+        sessions = [
+            {"date": "2025-06-02", "schedule": self.math_period.id, "records": self._records("PRESENT")},
+            {"date": "2025-06-02", "schedule": self.foreign_period.id, "records": self._records("PRESENT")},
+        ]
+        response = self.client.post(self.url, {"section": self.section.id, "sessions": sessions}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(AttendanceRecord.objects.exists())
+
+
+class AttendanceHistoryTest(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(
+            username="teacher1", email="teacher1@test.com", password="testpass123", role="TEACHER"
+        )
+        self.section = Section.objects.create(name="Section A", grade_level="grade1")
+        self.math = Subject.objects.create(name="Math", code="MATH")
+        self.science = Subject.objects.create(name="Science", code="SCI")
+        self.periods = [
+            Schedule.objects.create(
+                subject=subject, section=self.section, day_of_week="MON",
+                start_time=time(8 + i, 0), end_time=time(9 + i, 0),
+            )
+            for i, subject in enumerate([self.math, self.science])
+        ]
+        students = [
+            User.objects.create_user(username=f"student{i}", email=f"student{i}@test.com", password="testpass123")
+            for i in range(2)
+        ]
+        for day in range(1, 11):
+            for period in self.periods:
+                for student, status in zip(students, ["PRESENT", "ABSENT" if day % 2 else "LATE"]):
+                    AttendanceRecord.objects.create(
+                        student=student, section=self.section, schedule=period, subject=period.subject,
+                        date=date(2025, 6, day), status=status,
+                    )
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+        self.url = "/api/attendance/records/history/"
+
+    def test_grouped_history_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {"section": self.section.id})
+        self.assertEqual(len(response.data), 10)
+        self.assertEqual(response.data[0], {
+            "date": date(2025, 6, 10), "total": 4, "present": 2, "absent": 0, "late": 2, "excused": 0,
+        })
+
+    def test_pages_by_date_with_schedule_columns(self):
+        params = {"section": self.section.id, "limit": 4, "by_schedule": "1"}
+        with self.assertNumQueries(2):
+            first = self.client.get(self.url, params)
+        self.assertTrue(first.data["has_more"])
+        self.assertEqual([d["date"].day for d in first.data["results"]], [10, 9, 8, 7])
+        self.assertEqual(
+            [(c["subject_name"], c["absent"]) for c in first.data["results"][1]["schedules"]],
+            [("Math", 1), ("Science", 1)],
+        )
 
-# Create your tests here.
+        last = self.client.get(self.url, {**params, "before": "2025-06-03"})
+        self.assertFalse(last.data["has_more"])
+        self.assertIsNone(last.data["next_before"])
+        self.assertEqual([d["date"].day for d in last.data["results"]], [2, 1])
+        self.assertEqual(self.client.get(self.url, {**params, "before": "june"}).status_code, 400)
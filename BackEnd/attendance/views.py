@@ -5,8 +5,10 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from django.db.models import Q
+from django.utils.dateparse import parse_date
 
 from .models import AttendanceRecord
+from .services import InvalidScheduleError, resolve_session_subjects, upsert_attendance
 from .serializers import (
     AttendanceRecordSerializer,
     BulkAttendanceSerializer,
@@ -69,6 +71,7 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
     """
     serializer_class = AttendanceRecordSerializer
     permission_classes = [IsAuthenticated]
+    HISTORY_MAX_DAYS = 366
 
     def get_queryset(self):
         user = self.request.user
@@ -133,60 +136,29 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
                 {"student_id": 11, "status": "ABSENT", "notes": "Sick"},
             ]
         }
+        or, for a whole week / several periods at once:
+        {
+            "section": 1,
+            "sessions": [
+                {"date": "2025-01-13", "schedule": 5, "records": [...]},
+                {"date": "2025-01-14", "schedule": 6, "records": [...]},
+            ]
+        }
+        Everything is saved in one transaction.
         """
         serializer = BulkAttendanceSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         section_id = serializer.validated_data["section"]
-        record_date = serializer.validated_data["date"]
-        schedule_id = serializer.validated_data.get("schedule", None)
-        subject_id = serializer.validated_data.get("subject", None)
-        records = serializer.validated_data["records"]
-
-        if schedule_id is not None:
-            from classmanagement.models import Schedule
-            schedule_obj = Schedule.objects.select_related("subject").filter(
-                id=schedule_id,
-                section_id=section_id,
-            ).first()
-            if not schedule_obj:
-                return Response(
-                    {"error": "Selected schedule is invalid for the given section."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-            # Canonical subject comes from schedule when schedule is provided.
-            subject_id = schedule_obj.subject_id
-
-        created_count = 0
-        updated_count = 0
-
-        for record_data in records:
-            student_id = record_data["student_id"]
-            status_value = record_data["status"]
-            notes = record_data.get("notes", "")
-
-            # Use schedule in update_or_create if provided
-            lookup = {
-                "student_id": student_id,
-                "date": record_date,
-                "schedule_id": schedule_id,
-            }
-            defaults = {
-                "section_id": section_id,
-                "status": status_value,
-                "notes": notes,
-                "marked_by": request.user,
-                "subject_id": subject_id,
-            }
-
-            obj, created = AttendanceRecord.objects.update_or_create(
-                **lookup,
-                defaults=defaults,
+        try:
+            sessions = resolve_session_subjects(section_id, serializer.validated_data["sessions"])
+        except InvalidScheduleError:
+            return Response(
+                {"error": "Selected schedule is invalid for the given section."},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-            if created:
-                created_count += 1
-            else:
-                updated_count += 1
+
+        created_count, updated_count = upsert_attendance(section_id, sessions, request.user)
 
         return Response({
             "message": f"Attendance saved: {created_count} created, {updated_count} updated",
@@ -276,6 +248,9 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
     def history(self, request):
         """
         Get attendance history for a section, grouped by date.
+        Optional: ?by_schedule=1 adds per-schedule counts for each date;
+        ?limit=N returns N dates per page ({results, has_more, next_before})
+        and ?before=YYYY-MM-DD fetches the page older than that date.
         """
         section_id = request.query_params.get("section")
         if not section_id:
@@ -284,7 +259,7 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Get unique dates with attendance
+        # Records in scope for this history view
         records = AttendanceRecord.objects.filter(
             section_id=section_id,
             subject__isnull=False,
@@ -303,28 +278,80 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
         if end_date:
             records = records.filter(date__lte=end_date)
 
-        # Group by date
-        dates = records.values_list("date", flat=True).distinct()
-
-        history = []
-        for record_date in dates:
-            day_records = records.filter(date=record_date)
-            present = day_records.filter(status="PRESENT").count()
-            absent = day_records.filter(status="ABSENT").count()
-            late = day_records.filter(status="LATE").count()
-            excused = day_records.filter(status="EXCUSED").count()
-            total = day_records.count()
-
-            history.append({
-                "date": record_date,
-                "total": total,
-                "present": present,
-                "absent": absent,
-                "late": late,
-                "excused": excused,
-            })
+        # Date-range paging: ?limit=N dates per page, ?before=YYYY-MM-DD for the next page
+        before = request.query_params.get("before")
+        if before:
+            before_date = parse_date(before)
+            if before_date is None:
+                return Response(
+                    {"error": "before must be a date (YYYY-MM-DD)"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            records = records.filter(date__lt=before_date)
 
-        return Response(history)
+        limit = request.query_params.get("limit")
+        paginate = limit is not None
+        if paginate:
+            try:
+                limit = max(1, min(int(limit), self.HISTORY_MAX_DAYS))
+            except ValueError:
+                limit = self.HISTORY_MAX_DAYS
+
+        # One GROUP BY date conditional aggregate for the whole range
+        day_rows = (
+            records.values("date")
+            .annotate(**AttendanceRecord.status_counts())
+            .order_by("-date")
+        )
+        if paginate:
+            day_rows = list(day_rows[:limit + 1])
+            has_more = len(day_rows) > limit
+            day_rows = day_rows[:limit]
+        else:
+            day_rows = list(day_rows)
+
+        history = [
+            {
+                "date": row["date"],
+                "total": row["total"],
+                "present": row["present"],
+                "absent": row["absent"],
+                "late": row["late"],
+                "excused": row["excused"],
+            }
+            for row in day_rows
+        ]
+
+        # Optional per-schedule columns, one more grouped query over the same dates
+        if request.query_params.get("by_schedule") == "1" and history:
+            by_date = {entry["date"]: entry for entry in history}
+            for entry in history:
+                entry["schedules"] = []
+            schedule_rows = (
+                records.filter(date__gte=history[-1]["date"], date__lte=history[0]["date"])
+                .values("date", "schedule_id", "subject_id", "subject__name", "schedule__start_time")
+                .annotate(**AttendanceRecord.status_counts())
+                .order_by("-date", "schedule__start_time", "schedule_id")
+            )
+            for row in schedule_rows:
+                by_date[row["date"]]["schedules"].append({
+                    "schedule": row["schedule_id"],
+                    "subject": row["subject_id"],
+                    "subject_name": row["subject__name"],
+                    "total": row["total"],
+                    "present": row["present"],
+                    "absent": row["absent"],
+                    "late": row["late"],
+                    "excused": row["excused"],
+                })
+
+        if not paginate:
+            return Response(history)
+        return Response({
+            "results": history,
+            "has_more": has_more,
+            "next_before": history[-1]["date"] if has_more else None,
+        })
 
     @action(detail=False, methods=["get"])
     def quarter_stats(self, request):
@@ -363,16 +390,19 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
         enrollments = Enrollment.objects.filter(
             section__grade_level=int(grade_level),
             status="ACTIVE",
-        ).select_related("student")
+            student__isnull=False,
+        ).only("student_id")
+
+        student_ids = [e.student_id for e in enrollments]
+        roster_stats = AttendanceRecord.get_roster_attendance_stats(
+            student_ids, quarter_start, quarter_end
+        )
 
         results = []
-        for enrollment in enrollments:
-            student = enrollment.student
-            stats = AttendanceRecord.get_student_attendance_stats(
-                student.id, quarter_start, quarter_end
-            )
+        for student_id in student_ids:
+            stats = roster_stats[student_id]
             results.append({
-                "student_id": student.id,
+                "student_id": student_id,
                 "total": stats["total"],
                 "present": stats["present"],
                 "absent": stats["absent"],
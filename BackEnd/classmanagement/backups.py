@@ -0,0 +1,267 @@
+"""
+Online snapshots of the SQLite database plus content-addressed media backups.
+
+The database is copied with SQLite's backup API in paged steps, sleeping between
+steps so the app's writers are never blocked for long. Uploaded files referenced
+by the models in MEDIA_FIELDS are stored once under their SHA-256, so each backup
+only copies files it has not seen before.
+
+Layout of a backup directory:
+
+    snapshots/<name>.sqlite3   database copy
+    snapshots/<name>.json      manifest: checksums and the media files it references
+    media/<ab>/<sha256>        file contents, shared by all snapshots
+"""
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+SNAPSHOT_DIR = "snapshots"
+MEDIA_DIR = "media"
+
+# (model label, file field) pairs whose files are part of a backup.
+MEDIA_FIELDS = [
+    ("enrollment.EnrollmentDocument", "file"),
+    ("finance.ProofOfPayment", "proof_image"),
+    ("accounts.UserProfile", "avatar"),
+    ("accounts.TeacherProfile", "avatar"),
+]
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _raw_sqlite_connection():
+    if connection.vendor != "sqlite":
+        raise ValueError(f"Online backups need the SQLite backend, not {connection.vendor}")
+    if connection.in_atomic_block:
+        # The backup would wait forever on this connection's own write lock.
+        raise ValueError("Backups cannot run inside a transaction")
+    connection.ensure_connection()
+    return connection.connection
+
+
+def _object_path(backup_dir, sha256):
+    return os.path.join(backup_dir, MEDIA_DIR, sha256[:2], sha256)
+
+
+def _copy_atomic(source, dest):
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp_path = f"{dest}.tmp"
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, dest)
+
+
+# ═══════════════════════════════════════════════════════════
+# BACKUP
+# ═══════════════════════════════════════════════════════════
+def snapshot_database(dest, pages=256, sleep=0.005):
+    """
+    Copy the live database to `dest`, `pages` pages per step. The source is only
+    locked while a step runs, so writers get in between steps.
+    """
+    source = _raw_sqlite_connection()
+    tmp_path = f"{dest}.tmp"
+    target = sqlite3.connect(tmp_path)
+    try:
+        source.backup(target, pages=pages, sleep=sleep)
+    finally:
+        target.close()
+    os.replace(tmp_path, dest)
+
+
+def referenced_media():
+    """Names (relative to MEDIA_ROOT) of the files referenced by MEDIA_FIELDS."""
+    names = set()
+    for label, field in MEDIA_FIELDS:
+        Model = apps.get_model(label)
+        names.update(
+            Model._default_manager.exclude(**{f"{field}__isnull": True})
+            .exclude(**{field: ""})
+            .values_list(field, flat=True)
+        )
+    return sorted(names)
+
+
+def backup_media(backup_dir, previous=None):
+    """
+    Store the referenced media files by content hash. Files whose size and mtime
+    match the previous manifest are not re-hashed. Returns (entries, copied, missing).
+    """
+    previous = previous or {}
+    entries, copied, missing = {}, 0, []
+    for name in referenced_media():
+        path = os.path.join(settings.MEDIA_ROOT, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            missing.append(name)
+            continue
+
+        known = previous.get(name)
+        if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime:
+            sha256 = known["sha256"]
+        else:
+            sha256 = file_sha256(path)
+
+        object_path = _object_path(backup_dir, sha256)
+        if not os.path.exists(object_path):
+            _copy_atomic(path, object_path)
+            copied += 1
+        entries[name] = {"sha256": sha256, "size": stat.st_size, "mtime": stat.st_mtime}
+    return entries, copied, missing
+
+
+def create_backup(backup_dir, keep=7, pages=256, sleep=0.005, include_media=True):
+    """Take a snapshot, write its manifest and rotate old snapshots. Returns the manifest."""
+    snapshot_dir = os.path.join(backup_dir, SNAPSHOT_DIR)
+    os.makedirs(snapshot_dir, exist_ok=True)
+
+    created_at = timezone.now()
+    name = created_at.strftime("%Y%m%d-%H%M%S")
+    suffix = 1
+    while os.path.exists(os.path.join(snapshot_dir, f"{name}.json")):
+        name = f"{created_at.strftime('%Y%m%d-%H%M%S')}-{suffix}"
+        suffix += 1
+
+    db_file = f"{name}.sqlite3"
+    db_path = os.path.join(snapshot_dir, db_file)
+    snapshot_database(db_path, pages=pages, sleep=sleep)
+
+    manifest = {
+        "name": name,
+        "created_at": created_at.isoformat(),
+        "database": {"file": db_file, "size": os.path.getsize(db_path), "sha256": file_sha256(db_path)},
+        "media": {},
+        "media_copied": 0,
+        "media_missing": [],
+    }
+    if include_media:
+        snapshots = list_snapshots(backup_dir)
+        previous = snapshots[-1]["media"] if snapshots else None
+        manifest["media"], manifest["media_copied"], manifest["media_missing"] = backup_media(
+            backup_dir, previous
+        )
+
+    tmp_path = os.path.join(snapshot_dir, f"{name}.json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(snapshot_dir, f"{name}.json"))
+
+    manifest["rotated"] = rotate_snapshots(backup_dir, keep)
+    return manifest
+
+
+# ═══════════════════════════════════════════════════════════
+# SNAPSHOTS & ROTATION
+# ═══════════════════════════════════════════════════════════
+def list_snapshots(backup_dir):
+    """Manifests of all snapshots, oldest first."""
+    snapshot_dir = os.path.join(backup_dir, SNAPSHOT_DIR)
+    if not os.path.isdir(snapshot_dir):
+        return []
+    manifests = []
+    for file_name in os.listdir(snapshot_dir):
+        if file_name.endswith(".json"):
+            with open(os.path.join(snapshot_dir, file_name), "r", encoding="utf-8") as f:
+                manifests.append(json.load(f))
+    return sorted(manifests, key=lambda m: (m["created_at"], m["name"]))
+
+
+def load_snapshot(backup_dir, name="latest"):
+    snapshots = list_snapshots(backup_dir)
+    if not snapshots:
+        raise ValueError(f"No snapshots in {backup_dir}")
+    if name == "latest":
+        return snapshots[-1]
+    for manifest in snapshots:
+        if manifest["name"] == name:
+            return manifest
+    raise ValueError(f"Snapshot not found: {name}")
+
+
+def rotate_snapshots(backup_dir, keep):
+    """Delete all but the newest `keep` snapshots and media no snapshot references."""
+    snapshots = list_snapshots(backup_dir)
+    expired = snapshots[:-keep] if keep > 0 else []
+    snapshot_dir = os.path.join(backup_dir, SNAPSHOT_DIR)
+    for manifest in expired:
+        os.remove(os.path.join(snapshot_dir, f"{manifest['name']}.json"))
+        db_path = os.path.join(snapshot_dir, manifest["database"]["file"])
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+    if expired:
+        kept = {entry["sha256"] for m in snapshots[len(expired):] for entry in m["media"].values()}
+        media_root = os.path.join(backup_dir, MEDIA_DIR)
+        for dir_path, _, file_names in os.walk(media_root):
+            for file_name in file_names:
+                if file_name not in kept:
+                    os.remove(os.path.join(dir_path, file_name))
+    return [m["name"] for m in expired]
+
+
+# ═══════════════════════════════════════════════════════════
+# VERIFY & RESTORE
+# ═══════════════════════════════════════════════════════════
+def verify_snapshot(backup_dir, manifest, include_media=True):
+    """Check the database checksum and integrity and every media object. Returns a list of problems."""
+    problems = []
+    db_path = os.path.join(backup_dir, SNAPSHOT_DIR, manifest["database"]["file"])
+    if not os.path.exists(db_path):
+        return [f"Database file missing: {manifest['database']['file']}"]
+    if file_sha256(db_path) != manifest["database"]["sha256"]:
+        problems.append(f"Database checksum mismatch: {manifest['database']['file']}")
+    else:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        finally:
+            conn.close()
+        if result != "ok":
+            problems.append(f"Database integrity check failed: {result}")
+
+    if include_media:
+        for name, entry in manifest["media"].items():
+            object_path = _object_path(backup_dir, entry["sha256"])
+            if not os.path.exists(object_path):
+                problems.append(f"Media file missing: {name}")
+            elif file_sha256(object_path) != entry["sha256"]:
+                problems.append(f"Media checksum mismatch: {name}")
+    return problems
+
+
+def restore_snapshot(backup_dir, manifest, pages=256, include_media=True):
+    """
+    Copy the snapshot back over the live database and put back media files that
+    are missing or changed. Returns the number of media files written.
+    """
+    target = _raw_sqlite_connection()
+    db_path = os.path.join(backup_dir, SNAPSHOT_DIR, manifest["database"]["file"])
+    source = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        source.backup(target, pages=pages)
+    finally:
+        source.close()
+
+    restored = 0
+    if include_media:
+        for name, entry in manifest["media"].items():
+            dest = os.path.join(settings.MEDIA_ROOT, name)
+            if os.path.exists(dest) and file_sha256(dest) == entry["sha256"]:
+                continue
+            _copy_atomic(_object_path(backup_dir, entry["sha256"]), dest)
+            restored += 1
+    return restored
@@ -0,0 +1,191 @@
+"""
+Streaming NDJSON export/import shared by export_to_json and import_from_json.
+
+Each model is written to its own `<app_label>.<Model>.ndjson[.gz|.zst]` file, one
+serialized object per line, read from the database in chunks. A manifest.json
+next to the files records the model order and row counts for the importer.
+"""
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from django.apps import apps
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.management.color import no_style
+from django.core.serializers.python import Deserializer as PythonDeserializer
+from django.db import connection, transaction
+
+MANIFEST_NAME = "manifest.json"
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstd compression needs the 'zstandard' package (pip install zstandard)")
+    return zstandard
+
+
+def open_text(path, mode):
+    """Open a plain, .gz or .zst file for text reading ("r") or writing ("w")."""
+    if path.endswith(".gz"):
+        return gzip.open(path, f"{mode}t", encoding="utf-8", compresslevel=6)
+    if path.endswith(".zst"):
+        return _zstandard().open(path, f"{mode}t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8", newline="\n")
+
+
+# ═══════════════════════════════════════════════════════════
+# EXPORT
+# ═══════════════════════════════════════════════════════════
+def export_model(model_label, directory, compress="gzip", chunk_size=2000):
+    """Stream one model to NDJSON. Returns (file name, row count)."""
+    Model = apps.get_model(model_label)
+    file_name = f"{model_label}.ndjson{COMPRESSION_SUFFIXES[compress]}"
+    rows = 0
+    queryset = Model._default_manager.order_by("pk").prefetch_related(
+        *[f.name for f in Model._meta.many_to_many]
+    )
+    with open_text(os.path.join(directory, file_name), "w") as f:
+        chunk = []
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(obj)
+            if len(chunk) >= chunk_size:
+                rows += _write_chunk(f, chunk)
+                chunk = []
+        rows += _write_chunk(f, chunk)
+    return file_name, rows
+
+
+def _export_in_thread(*args):
+    try:
+        return export_model(*args)
+    finally:
+        # Each worker thread opened its own connection.
+        connection.close()
+
+
+def _write_chunk(f, objects):
+    if not objects:
+        return 0
+    for data in serializers.serialize("python", objects):
+        f.write(json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False))
+        f.write("\n")
+    return len(objects)
+
+
+def export_models(model_labels, directory, compress="gzip", workers=4, chunk_size=2000, on_done=None):
+    """
+    Export the models in parallel (`workers` at a time) and write the manifest.
+    `on_done(label, rows)` is called as each model finishes. Returns the manifest dict.
+    """
+    if compress == "zstd":
+        _zstandard()
+    os.makedirs(directory, exist_ok=True)
+
+    results = {}
+
+    def done(label, file_name, rows):
+        results[label] = {"file": file_name, "rows": rows}
+        if on_done:
+            on_done(label, rows)
+
+    if workers <= 1:
+        for label in model_labels:
+            done(label, *export_model(label, directory, compress, chunk_size))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                label: pool.submit(_export_in_thread, label, directory, compress, chunk_size)
+                for label in model_labels
+            }
+            for label, future in futures.items():
+                done(label, *future.result())
+
+    manifest = {
+        "exported_at": datetime.now().isoformat(),
+        "format": "ndjson",
+        # Dict order is the dependency order the importer must follow.
+        "models": {label: results[label] for label in model_labels},
+    }
+    with open(os.path.join(directory, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+# ═══════════════════════════════════════════════════════════
+# IMPORT
+# ═══════════════════════════════════════════════════════════
+def iter_ndjson(path):
+    with open_text(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_batches(records, batch_size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_batch(records):
+    """
+    Save one batch of serialized objects of a single model: one pk lookup for the
+    whole batch, one bulk_create for the new rows, then many-to-many links.
+    Returns (imported, skipped).
+    """
+    objects = list(PythonDeserializer(records))
+    if not objects:
+        return 0, 0
+    Model = objects[0].object.__class__
+
+    existing = set(
+        Model._default_manager.filter(pk__in=[o.object.pk for o in objects]).values_list("pk", flat=True)
+    )
+    new = [o for o in objects if o.object.pk not in existing]
+
+    with transaction.atomic():
+        Model._default_manager.bulk_create([o.object for o in new])
+        for o in new:
+            for field_name, values in (o.m2m_data or {}).items():
+                if values:
+                    getattr(o.object, field_name).set(values)
+
+    return len(new), len(objects) - len(new)
+
+
+def group_by_model(records):
+    """Split a stream of serialized objects into runs of the same model."""
+    current, run = None, []
+    for record in records:
+        if record["model"] != current and run:
+            yield run
+            run = []
+        current = record["model"]
+        run.append(record)
+    if run:
+        yield run
+
+
+def reset_sequences(models):
+    """Move auto-increment sequences past the imported primary keys (no-op on SQLite)."""
+    statements = connection.ops.sequence_reset_sql(no_style(), list(models))
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST_NAME), "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -1,12 +1,17 @@
 """
 Django management command to export database to JSON without BOM.
 This creates a portable backup that can be included in version control.
+
+--format ndjson streams each model to its own (optionally compressed) NDJSON
+file instead, in parallel and in chunks, so large tables never sit in memory.
 """
 import json
 from django.core.management.base import BaseCommand
 from django.core.serializers import serialize
 from django.apps import apps
 
+from classmanagement.data_transfer import COMPRESSION_SUFFIXES, export_models
+
 
 class Command(BaseCommand):
     help = "Export database to JSON file without BOM for version control"
@@ -23,6 +28,35 @@ class Command(BaseCommand):
             default=2,
             help='JSON indentation (default: 2)'
         )
+        parser.add_argument(
+            '--format',
+            choices=['json', 'ndjson'],
+            default='json',
+            help='json: one indented file; ndjson: one streamed file per model (default: json)'
+        )
+        parser.add_argument(
+            '--output-dir',
+            default='db_backup',
+            help='Directory for --format ndjson (default: db_backup)'
+        )
+        parser.add_argument(
+            '--compress',
+            choices=list(COMPRESSION_SUFFIXES),
+            default='gzip',
+            help='Compression for --format ndjson (default: gzip)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Models exported in parallel for --format ndjson (default: 4)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Rows read from the database per query for --format ndjson (default: 2000)'
+        )
 
     def handle(self, *args, **options):
         output_file = options['output']
@@ -46,15 +80,26 @@ class Command(BaseCommand):
             'announcements.AnnouncementMedia',
             # Enrollment
             'enrollment.Enrollment',
+            'enrollment.ParentInfo',
             # Attendance
-            'attendance.Attendance',
+            'attendance.AttendanceRecord',
             # Grades
-            'grades.Grade',
+            'grades.GradeWeight',
+            'grades.GradeItem',
+            'grades.StudentScore',
             # Finance
-            'finance.Payment',
-            'finance.PaymentRecord',
+            'finance.TuitionConfig',
+            'finance.Transaction',
+            # Messaging
+            'messaging.Chat',
+            'messaging.ChatMember',
+            'messaging.Message',
         ]
 
+        if options['format'] == 'ndjson':
+            self._export_ndjson(models_to_export, options)
+            return
+
         all_data = []
         
         for model_name in models_to_export:
@@ -81,3 +126,31 @@ class Command(BaseCommand):
         self.stdout.write(
             self.style.SUCCESS(f"\nExported {len(all_data)} total records to {output_file}")
         )
+
+    def _export_ndjson(self, models_to_export, options):
+        labels = []
+        for model_name in models_to_export:
+            try:
+                apps.get_model(model_name)
+                labels.append(model_name)
+            except LookupError:
+                self.stdout.write(self.style.WARNING(f"  Model not found: {model_name}"))
+
+        try:
+            manifest = export_models(
+                labels,
+                options['output_dir'],
+                compress=options['compress'],
+                workers=options['workers'],
+                chunk_size=max(1, options['chunk_size']),
+                on_done=lambda label, rows: self.stdout.write(f"  Exported {rows} {label} records"),
+            )
+        except ValueError as e:
+            self.stdout.write(self.style.ERROR(f"  {e}"))
+            return
+
+        total = sum(entry['rows'] for entry in manifest['models'].values())
+        self.stdout.write(
+            self.style.SUCCESS(f"\nExported {total} total records to {options['output_dir']}/")
+        )
+
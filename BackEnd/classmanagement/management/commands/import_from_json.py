@@ -1,70 +1,128 @@
 """
 Django management command to import database from JSON backup.
+
+Accepts either a JSON array file (export_to_json) or an NDJSON export directory
+(export_to_json --format ndjson). Objects are saved in batches: one primary-key
+lookup and one bulk_create per batch instead of an exists() check per object.
+A batch that fails is retried one object at a time, so a bad object is reported
+and skipped without losing the rest of its batch.
 """
 import json
+import os
+from django.apps import apps
 from django.core.management.base import BaseCommand
-from django.core.serializers import deserialize
-from django.db import transaction
+from django.core.serializers.base import DeserializationError
+from django.db import DatabaseError, transaction
+
+from classmanagement.data_transfer import (
+    group_by_model,
+    import_batch,
+    iter_batches,
+    iter_ndjson,
+    read_manifest,
+    reset_sequences,
+)
+from finance.services import refresh_ledger_summaries
+from grades.eligibility import invalidate_all_eligibility
+from grades.services import rebuild_quarter_snapshots
+
+# Imported rows of these models change the materialized quarter grades.
+GRADE_MODELS = {'grades.gradeweight', 'grades.gradeitem', 'grades.studentscore', 'grades.classstanding'}
+IMPORT_ERRORS = (DatabaseError, DeserializationError, LookupError, ValueError)
 
 
 class Command(BaseCommand):
-    help = "Import database from JSON backup file"
+    help = "Import database from JSON backup file or NDJSON export directory"
 
     def add_arguments(self, parser):
         parser.add_argument(
             '--input',
             default='db_backup.json',
-            help='Input JSON file path (default: db_backup.json)'
+            help='Input JSON file or NDJSON export directory (default: db_backup.json)'
         )
         parser.add_argument(
             '--clear',
             action='store_true',
             help='Clear existing data before import (use with caution!)'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Objects checked and inserted per batch (default: 1000)'
+        )
 
     def handle(self, *args, **options):
-        input_file = options['input']
-        
-        try:
-            with open(input_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            self.stdout.write(self.style.WARNING(f"Backup file not found: {input_file}"))
-            self.stdout.write("Skipping import - database will use existing data or be empty.")
-            return
-        except json.JSONDecodeError as e:
-            self.stdout.write(self.style.ERROR(f"Invalid JSON in {input_file}: {e}"))
-            return
+        input_path = options['input']
+        batch_size = max(1, options['batch_size'])
 
-        if not data:
-            self.stdout.write(self.style.WARNING("Backup file is empty, skipping import."))
-            return
+        if os.path.isdir(input_path):
+            try:
+                manifest = read_manifest(input_path)
+            except (FileNotFoundError, json.JSONDecodeError) as e:
+                self.stdout.write(self.style.ERROR(f"Invalid export directory {input_path}: {e}"))
+                return
+            runs = (
+                (label, iter_ndjson(os.path.join(input_path, entry['file'])))
+                for label, entry in manifest['models'].items()
+            )
+        else:
+            try:
+                with open(input_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                self.stdout.write(self.style.WARNING(f"Backup file not found: {input_path}"))
+                self.stdout.write("Skipping import - database will use existing data or be empty.")
+                return
+            except json.JSONDecodeError as e:
+                self.stdout.write(self.style.ERROR(f"Invalid JSON in {input_path}: {e}"))
+                return
+
+            if not data:
+                self.stdout.write(self.style.WARNING("Backup file is empty, skipping import."))
+                return
 
-        self.stdout.write(f"Found {len(data)} records in {input_file}")
+            self.stdout.write(f"Found {len(data)} records in {input_path}")
+            runs = ((run[0]['model'], run) for run in group_by_model(data))
 
         imported = 0
         skipped = 0
         errors = 0
-
-        # Convert back to JSON string for deserializer
-        json_str = json.dumps(data)
+        touched = set()
+        ledger_parent_ids = set()
 
         try:
+            # One outer transaction: FK checks are deferred to the end, so models
+            # that reference each other (chat <-> last message) import cleanly.
             with transaction.atomic():
-                for obj in deserialize('json', json_str):
-                    try:
-                        # Check if object already exists
-                        Model = obj.object.__class__
-                        pk = obj.object.pk
-                        
-                        if Model.objects.filter(pk=pk).exists():
-                            skipped += 1
-                        else:
-                            obj.save()
-                            imported += 1
-                    except Exception as e:
-                        errors += 1
-                        self.stdout.write(self.style.WARNING(f"  Error importing {obj.object}: {e}"))
+                for label, records in runs:
+                    model_imported = model_skipped = 0
+                    for batch in iter_batches(records, batch_size):
+                        new, existing, saved, failed = self._import_batch(label, batch)
+                        model_imported += new
+                        model_skipped += existing
+                        errors += failed
+                        if new and label.lower() == 'finance.transaction':
+                            ledger_parent_ids.update(r['fields'].get('parent') for r in saved)
+                    imported += model_imported
+                    skipped += model_skipped
+                    if model_imported:
+                        touched.add(apps.get_model(label))
+                    self.stdout.write(f"  {label}: {model_imported} imported, {model_skipped} skipped")
+
+                reset_sequences(touched)
+
+                # bulk_create skips the Transaction signals that keep the ledger summaries.
+                ledger_parent_ids.discard(None)
+                if ledger_parent_ids:
+                    refresh_ledger_summaries(ledger_parent_ids)
+                # ...and the grade signals that keep the quarter-grade snapshots.
+                # Stored eligibility reads balances, profiles and snapshots, so it is
+                # dropped either way (the rebuild does it) and recomputed on demand.
+                if any(model._meta.label_lower in GRADE_MODELS for model in touched):
+                    rebuild_quarter_snapshots()
+                elif touched:
+                    invalidate_all_eligibility()
 
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"Import failed: {e}"))
@@ -75,3 +133,31 @@ class Command(BaseCommand):
                 f"\nImport complete: {imported} imported, {skipped} skipped (already exist), {errors} errors"
             )
         )
+
+    def _import_batch(self, label, batch):
+        """
+        Import one batch; if it fails, retry its objects one by one, each in its
+        own savepoint. Returns (imported, skipped, records saved, errors).
+        """
+        try:
+            new, existing = import_batch(batch)
+            return new, existing, batch, 0
+        except IMPORT_ERRORS as e:
+            if len(batch) == 1:
+                self.stdout.write(self.style.WARNING(f"  Error importing {label} pk={batch[0].get('pk')}: {e}"))
+                return 0, 0, [], 1
+
+        new = existing = failed = 0
+        saved = []
+        for record in batch:
+            try:
+                with transaction.atomic():
+                    record_new, record_existing = import_batch([record])
+            except IMPORT_ERRORS as e:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f"  Error importing {label} pk={record.get('pk')}: {e}"))
+                continue
+            new += record_new
+            existing += record_existing
+            saved.append(record)
+        return new, existing, saved, failed
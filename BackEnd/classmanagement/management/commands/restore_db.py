@@ -0,0 +1,88 @@
+"""
+Django management command to verify or restore a backup_db snapshot.
+
+The snapshot's checksums and SQLite integrity are always verified first; a
+snapshot that fails verification is never restored.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from classmanagement.backups import list_snapshots, load_snapshot, restore_snapshot, verify_snapshot
+
+
+class Command(BaseCommand):
+    help = "Verify a database snapshot and optionally restore it with its media files"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'snapshot',
+            nargs='?',
+            default='latest',
+            help='Snapshot name (default: latest)'
+        )
+        parser.add_argument(
+            '--backup-dir',
+            default='backups',
+            help='Backup directory (default: backups)'
+        )
+        parser.add_argument(
+            '--verify-only',
+            action='store_true',
+            help='Check the snapshot without restoring it'
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List available snapshots'
+        )
+        parser.add_argument(
+            '--no-media',
+            action='store_true',
+            help='Skip media files'
+        )
+        parser.add_argument(
+            '--noinput', '--no-input',
+            action='store_false',
+            dest='interactive',
+            help='Do not ask for confirmation before restoring'
+        )
+
+    def handle(self, *args, **options):
+        backup_dir = options['backup_dir']
+        include_media = not options['no_media']
+
+        if options['list']:
+            for manifest in list_snapshots(backup_dir):
+                self.stdout.write(
+                    f"  {manifest['name']}  {manifest['created_at']}  "
+                    f"{manifest['database']['size']} bytes, {len(manifest['media'])} media files"
+                )
+            return
+
+        try:
+            manifest = load_snapshot(backup_dir, options['snapshot'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        problems = verify_snapshot(backup_dir, manifest, include_media=include_media)
+        if problems:
+            for problem in problems:
+                self.stdout.write(self.style.ERROR(f"  {problem}"))
+            raise CommandError(f"Snapshot {manifest['name']} failed verification")
+        self.stdout.write(self.style.SUCCESS(f"Snapshot {manifest['name']} verified"))
+
+        if options['verify_only']:
+            return
+
+        if options['interactive']:
+            answer = input(
+                f"This will overwrite the current database with snapshot {manifest['name']}. "
+                "Type 'yes' to continue: "
+            )
+            if answer != 'yes':
+                self.stdout.write("Restore cancelled.")
+                return
+
+        restored = restore_snapshot(backup_dir, manifest, include_media=include_media)
+        self.stdout.write(
+            self.style.SUCCESS(f"\nRestored snapshot {manifest['name']} ({restored} media files written)")
+        )
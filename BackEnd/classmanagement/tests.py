@@ -1,3 +1,170 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from accounts.models import Section, Subject, User, UserProfile
+from finance.models import ParentLedgerSummary, ProofOfPayment, Transaction
+from grades.models import GradeItem, QuarterGradeSnapshot, StudentScore
+from .backups import list_snapshots
+from .data_transfer import iter_ndjson, read_manifest
+
+
+class NdjsonExportImportTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        for i in range(5):
+            User.objects.create_user(username=f"user{i}", email=f"user{i}@test.com", password="x")
+        Section.objects.create(name="Rizal", grade_level="grade1")
+
+    def test_round_trip_with_batch_existence_checks(self):
+        call_command(
+            "export_to_json", "--format", "ndjson", "--output-dir", self.directory,
+            "--workers", "1", "--chunk-size", "2", stdout=StringIO(),
+        )
+        manifest = read_manifest(self.directory)
+        entry = manifest["models"]["accounts.User"]
+        self.assertEqual(entry["rows"], 5)
+        self.assertTrue(entry["file"].endswith(".ndjson.gz"))
+        rows = list(iter_ndjson(os.path.join(self.directory, entry["file"])))
+        self.assertEqual([r["fields"]["username"] for r in rows], [f"user{i}" for i in range(5)])
+
+        User.objects.filter(username__in=["user1", "user3"]).delete()
+        out = StringIO()
+        call_command("import_from_json", "--input", self.directory, "--batch-size", "2", stdout=out)
+
+        self.assertIn("accounts.User: 2 imported, 3 skipped", out.getvalue())
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Section.objects.count(), 1)
+
+
+    def test_bad_object_only_loses_itself(self):
+        path = os.path.join(self.directory, "db_backup.json")
+        call_command("export_to_json", "--output", path, stdout=StringIO())
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        for record in data:
+            if record["model"] == "accounts.user" and record["fields"]["username"] == "user3":
+                # Clashes with user0, which is still in the database.
+                record["fields"]["username"] = "user0"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+        User.objects.filter(username__in=["user1", "user3", "user4"]).delete()
+        out = StringIO()
+        call_command("import_from_json", "--input", path, stdout=out)
+
+        self.assertIn("accounts.user: 2 imported, 2 skipped", out.getvalue())
+        self.assertIn("1 errors", out.getvalue())
+        self.assertEqual(
+            sorted(User.objects.values_list("username", flat=True)), ["user0", "user1", "user2", "user4"]
+        )
+
+class JsonImportDerivedRowsTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.path = os.path.join(self.directory, "db_backup.json")
+        self.parent = User.objects.create_user(username="parent1", email="parent1@test.com", password="x")
+
+    def round_trip(self, *models):
+        call_command("export_to_json", "--output", self.path, stdout=StringIO())
+        for model in models:
+            model.objects.all().delete()
+        out = StringIO()
+        call_command("import_from_json", "--input", self.path, stdout=out)
+        return out.getvalue()
+
+    def test_ledger_summaries_are_rebuilt(self):
+        Transaction.objects.create(parent=self.parent, entry_type="DEBIT", item="MONTHLY", amount=Decimal("1500"))
+        Transaction.objects.create(parent=self.parent, entry_type="CREDIT", item="PAYMENT", amount=Decimal("500"))
+
+        self.round_trip(Transaction, ParentLedgerSummary)
+
+        self.assertEqual(Transaction.objects.count(), 2)
+        self.assertEqual(ParentLedgerSummary.objects.get(parent=self.parent).balance, Decimal("1000.00"))
+
+
+    def test_quarter_grade_snapshots_are_rebuilt(self):
+        subject = Subject.objects.create(name="Math", code="MATH")
+        item = GradeItem.objects.create(
+            teacher=self.parent, subject=subject, grade_level=1,
+            quarter=1, category="QUIZ", title="Quiz 1", total_score=20,
+        )
+        StudentScore.objects.create(student=self.parent, grade_item=item, score=Decimal("15"))
+        expected = QuarterGradeSnapshot.objects.get().quarter_grade
+
+        self.round_trip(GradeItem, QuarterGradeSnapshot)
+
+        self.assertEqual(StudentScore.objects.count(), 1)
+        self.assertEqual(QuarterGradeSnapshot.objects.get().quarter_grade, expected)
+
+class BackupDbTest(TransactionTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.backup_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, True)
+        self.addCleanup(shutil.rmtree, self.backup_dir, True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        parent = User.objects.create_user(username="parent", email="parent@test.com", password="x")
+        self.write_media("proofs/receipt.png", b"receipt")
+        self.write_media("avatars/kid.png", b"avatar")
+        ProofOfPayment.objects.create(
+            user=parent, reference_number="REF-1", description="Tuition", proof_image="proofs/receipt.png"
+        )
+        UserProfile.objects.create(
+            user=parent, student_first_name="Ana", student_last_name="Cruz", grade_level="grade1",
+            parent_first_name="Luz", parent_last_name="Cruz", contact_number="0917", address="Manila",
+            avatar="avatars/kid.png",
+        )
+
+    def write_media(self, name, content):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+
+    def backup(self):
+        call_command("backup_db", "--output-dir", self.backup_dir, "--keep", "2", stdout=StringIO())
+        return list_snapshots(self.backup_dir)[-1]
+
+    def test_media_is_copied_incrementally_and_snapshots_rotate(self):
+        first = self.backup()
+        self.assertEqual(first["media_copied"], 2)
+        self.assertEqual(self.backup()["media_copied"], 0)
+
+        self.write_media("avatars/kid.png", b"new avatar")
+        third = self.backup()
+        self.assertEqual(third["media_copied"], 1)
+
+        snapshots = list_snapshots(self.backup_dir)
+        self.assertEqual(len(snapshots), 2)
+        self.assertNotIn(first["name"], [m["name"] for m in snapshots])
+
+        # Once no kept snapshot references the old avatar, its copy is pruned.
+        media_dir = os.path.join(self.backup_dir, "media")
+        self.assertEqual(sum(len(files) for _, _, files in os.walk(media_dir)), 3)
+        self.backup()
+        self.assertEqual(sum(len(files) for _, _, files in os.walk(media_dir)), 2)
+
+    def test_verify_detects_corrupted_media(self):
+        manifest = self.backup()
+        out = StringIO()
+        call_command("restore_db", "--backup-dir", self.backup_dir, "--verify-only", stdout=out)
+        self.assertIn(f"Snapshot {manifest['name']} verified", out.getvalue())
+
+        sha256 = manifest["media"]["proofs/receipt.png"]["sha256"]
+        with open(os.path.join(self.backup_dir, "media", sha256[:2], sha256), "wb") as f:
+            f.write(b"tampered")
+        with self.assertRaises(CommandError):
+            call_command("restore_db", "--backup-dir", self.backup_dir, "--verify-only", stdout=StringIO())
@@ -0,0 +1,201 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+
+from accounts.models import User
+from .models import Enrollment, ParentInfo
+
+
+# ══════════════════════════════════════════════════════
+# STREAMING READER  —  one array element at a time, bounded memory
+# ══════════════════════════════════════════════════════
+READ_SIZE = 1 << 16
+
+
+def iter_json_array(fp, read_size=READ_SIZE):
+    """
+    Yield the elements of a top-level JSON array from a text file, reading it
+    in `read_size` blocks. Only the current element is held in memory.
+    Raises ValueError if the file is not a JSON array.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill():
+        nonlocal buf, pos, eof
+        block = fp.read(read_size)
+        if not block:
+            eof = True
+        buf = buf[pos:] + block
+        pos = 0
+
+    def next_token():
+        """Skip whitespace and return the next character ("" at end of file)."""
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf) or eof:
+                return buf[pos] if pos < len(buf) else ""
+            fill()
+
+    fill()
+    if next_token() != "[":
+        raise ValueError("JSON must be a list of enrollment objects")
+    pos += 1
+
+    expect_value = True
+    while True:
+        token = next_token()
+        if token == "]":
+            return
+        if not expect_value:
+            if token != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, found {token!r}")
+            pos += 1
+            expect_value = True
+            continue
+        if token == "":
+            raise ValueError("Unexpected end of file inside JSON array")
+
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+        if end == len(buf) and not eof:
+            # A scalar cut at the block boundary parses "successfully"; read on to be sure.
+            fill()
+            continue
+
+        pos = end
+        expect_value = False
+        yield value
+
+
+# ══════════════════════════════════════════════════════
+# CHUNK IMPORT  —  validate, resolve users, bulk insert
+# ══════════════════════════════════════════════════════
+ENROLLMENT_FIELDS = {f.name for f in Enrollment._meta.concrete_fields} | {
+    f.attname for f in Enrollment._meta.concrete_fields
+}
+PARENT_INFO_FIELDS = {f.name for f in ParentInfo._meta.concrete_fields} - {"id", "enrollment"}
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.skipped = 0
+        self.errors = []  # (row number, message)
+
+    def add(self, other):
+        self.created += other.created
+        self.skipped += other.skipped
+        self.errors.extend(other.errors)
+
+
+def _validated(instance, given):
+    """Field-level validation for the fields the record actually provides."""
+    excluded = [f.name for f in instance._meta.fields if f.name not in given and f.attname not in given]
+    instance.clean_fields(exclude=excluded)
+    return instance
+
+
+def _prepare(idx, record):
+    """(enrollment, parent_info, student email, username) for one record; raises ValueError/ValidationError."""
+    data = dict(record)
+    parent_info_data = data.pop("parent_info", None) or {}
+
+    unknown = set(data) - ENROLLMENT_FIELDS
+    unknown |= {f"parent_info.{key}" for key in set(parent_info_data) - PARENT_INFO_FIELDS}
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+
+    # The student / enrollment links are filled in at insert time, so they are not validated here.
+    enrollment = _validated(Enrollment(**data), set(data))
+    parent_info = _validated(ParentInfo(**parent_info_data), set(parent_info_data)) if parent_info_data else None
+
+    email = data.get("email") or f"student_{idx}@school.local"
+    username = f"student_{data.get('last_name', '')}_{idx}".lower().replace(" ", "_")
+    return enrollment, parent_info, email, username
+
+
+def import_enrollment_rows(rows):
+    """
+    Import a chunk of (row number, record) pairs in one transaction.
+
+    Records are validated in memory first; existing students are resolved with
+    one email lookup, and new users, enrollments and parent info each go in with
+    one bulk_create. If the chunk hits a database error, its rows are retried one
+    by one so a single bad row does not sink the rest. Returns an ImportResult.
+    """
+    result = ImportResult()
+    prepared = []
+    for idx, record in rows:
+        if record.pop("website", ""):
+            result.skipped += 1
+            result.errors.append((idx, "Skipped: honeypot detected"))
+            continue
+        try:
+            prepared.append((idx, *_prepare(idx, record)))
+        except ValidationError as e:
+            result.errors.append((idx, "; ".join(f"{k}: {', '.join(v)}" for k, v in e.message_dict.items())))
+        except (TypeError, ValueError) as e:
+            result.errors.append((idx, str(e)))
+
+    if not prepared:
+        return result
+
+    try:
+        with transaction.atomic():
+            _insert(prepared)
+    except DatabaseError as e:
+        if len(prepared) == 1:
+            result.errors.append((prepared[0][0], str(e)))
+            return result
+        for row in prepared:
+            # Clear primary keys handed out by the rolled-back bulk insert.
+            for instance in row[1:3]:
+                if instance is not None:
+                    instance.pk = None
+            try:
+                with transaction.atomic():
+                    _insert([row])
+            except DatabaseError as row_error:
+                result.errors.append((row[0], str(row_error)))
+            else:
+                result.created += 1
+        return result
+
+    result.created += len(prepared)
+    return result
+
+
+def _insert(prepared):
+    emails = {email for _, _, _, email, _ in prepared}
+    students = {user.email: user for user in User.objects.filter(email__in=emails)}
+
+    new_users = []
+    for _, _, _, email, username in prepared:
+        if email not in students:
+            students[email] = User(email=email, username=username)
+            new_users.append(students[email])
+    if new_users:
+        User.objects.bulk_create(new_users, batch_size=500)
+
+    enrollments = []
+    for _, enrollment, _, email, _ in prepared:
+        enrollment.student = students[email]
+        enrollments.append(enrollment)
+    Enrollment.objects.bulk_create(enrollments, batch_size=500)
+
+    parent_infos = []
+    for _, enrollment, parent_info, _, _ in prepared:
+        if parent_info is not None:
+            parent_info.enrollment = enrollment
+            parent_infos.append(parent_info)
+    if parent_infos:
+        ParentInfo.objects.bulk_create(parent_infos, batch_size=500)
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from enrollment.models import Enrollment
+from enrollment.services import create_enrollment_ledgers
+
+
+class Command(BaseCommand):
+    help = "Create tuition ledgers for active enrollments that do not have one yet (opening-day processing)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--academic-year",
+            default=None,
+            help="Only process enrollments for this academic year (e.g. 2026-2027)"
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=200,
+            help="Number of enrollments processed per bulk insert/transaction"
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options["chunk_size"])
+
+        enrollments = Enrollment.objects.filter(status="ACTIVE", parent_user__isnull=False).order_by("id")
+        if options["academic_year"]:
+            enrollments = enrollments.filter(academic_year=options["academic_year"])
+
+        ids = list(enrollments.values_list("id", flat=True))
+        total = len(ids)
+        created = 0
+
+        for start in range(0, total, chunk_size):
+            chunk = list(Enrollment.objects.filter(id__in=ids[start:start + chunk_size]))
+            created += create_enrollment_ledgers(chunk)
+            self.stdout.write(f"  Processed {min(start + chunk_size, total)}/{total} enrollments")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Ledger build complete. Created {created} transactions.")
+        )
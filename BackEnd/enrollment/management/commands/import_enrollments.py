@@ -1,12 +1,15 @@
 import json
+import os
+from itertools import islice
+
 from django.core.management.base import BaseCommand
-from django.db import transaction
-from accounts.models import User
-from enrollment.models import Enrollment, ParentInfo
+
+from enrollment.imports import ImportResult, import_enrollment_rows, iter_json_array
+from enrollment.services import invalidate_enrollment_statistics
 
 
 class Command(BaseCommand):
-    help = "Bulk import enrollments from a JSON file"
+    help = "Bulk import enrollments from a JSON file (streamed, committed per chunk, resumable)"
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -14,94 +17,94 @@ class Command(BaseCommand):
             type=str,
             help='Path to JSON file with enrollment data (e.g., "enrollments.json")',
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of records validated and inserted per transaction"
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=None,
+            help="Checkpoint file path (default: <file>.checkpoint)"
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue after the last committed chunk recorded in the checkpoint"
+        )
+
+    def _file_signature(self, file_path):
+        stat = os.stat(file_path)
+        return {"path": os.path.abspath(file_path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+    def _load_checkpoint(self, checkpoint_path, signature):
+        try:
+            with open(checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0
+        if {k: checkpoint.get(k) for k in signature} != signature:
+            self.stdout.write(self.style.WARNING("Checkpoint is for a different or modified file; starting over"))
+            return 0
+        return int(checkpoint.get("done", 0))
+
+    def _save_checkpoint(self, checkpoint_path, signature, done):
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({**signature, "done": done}, f)
+        os.replace(tmp_path, checkpoint_path)
 
-    @transaction.atomic
     def handle(self, *args, **options):
         file_path = options["file"]
+        chunk_size = max(1, options["chunk_size"])
+        checkpoint_path = options["checkpoint"] or f"{file_path}.checkpoint"
 
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            self.stdout.write(
-                self.style.ERROR(f"File not found: {file_path}")
-            )
-            return
-        except json.JSONDecodeError:
-            self.stdout.write(
-                self.style.ERROR(f"Invalid JSON in file: {file_path}")
-            )
+        if not os.path.exists(file_path):
+            self.stdout.write(self.style.ERROR(f"File not found: {file_path}"))
             return
 
-        if not isinstance(data, list):
-            self.stdout.write(
-                self.style.ERROR("JSON must be a list of enrollment objects")
-            )
+        signature = self._file_signature(file_path)
+        done = self._load_checkpoint(checkpoint_path, signature) if options["resume"] else 0
+        if done:
+            self.stdout.write(f"  Resuming after record {done}")
+
+        totals = ImportResult()
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                records = enumerate(iter_json_array(f), 1)
+                # Committed records are re-parsed but not re-imported.
+                for _ in islice(records, done):
+                    pass
+
+                while True:
+                    chunk = list(islice(records, chunk_size))
+                    if not chunk:
+                        break
+                    result = import_enrollment_rows(chunk)
+                    totals.add(result)
+                    for idx, message in result.errors:
+                        self.stdout.write(self.style.WARNING(f"  Entry {idx}: {message}"))
+
+                    done = chunk[-1][0]
+                    self._save_checkpoint(checkpoint_path, signature, done)
+                    self.stdout.write(f"  Committed records up to {done} ({totals.created} created)")
+        except ValueError as e:
+            # json.JSONDecodeError is a ValueError; committed chunks stay and --resume continues after them.
+            self.stdout.write(self.style.ERROR(f"Invalid JSON in file {file_path}: {e}"))
             return
+        finally:
+            # bulk_create skips post_save, so drop the cached statistics explicitly.
+            invalidate_enrollment_statistics()
 
-        created_count = 0
-        skipped_count = 0
-        error_count = 0
-
-        for idx, enrollment_data in enumerate(data, 1):
-            try:
-                parent_info_data = enrollment_data.pop("parent_info", {})
-                website = enrollment_data.pop("website", "")
-
-                # Skip honeypot check
-                if website:
-                    self.stdout.write(
-                        self.style.WARNING(f"Skipping entry {idx}: Honeypot detected")
-                    )
-                    skipped_count += 1
-                    continue
-
-                # Get or create student user (public_user)
-                student_email = enrollment_data.get("email") or f"student_{idx}@school.local"
-                first_name = enrollment_data.get("first_name", "")
-                last_name = enrollment_data.get("last_name", "")
-                
-                student, created = User.objects.get_or_create(
-                    email=student_email,
-                    defaults={
-                        "username": f"student_{last_name}_{idx}".lower().replace(" ", "_"),
-                    },
-                )
-
-                enrollment_data["student"] = student
-
-                # Create enrollment
-                enrollment = Enrollment.objects.create(**enrollment_data)
-
-                # Create parent info if provided
-                if parent_info_data:
-                    ParentInfo.objects.create(
-                        enrollment=enrollment, **parent_info_data
-                    )
-
-                created_count += 1
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"✓ Entry {idx}: {enrollment_data.get('first_name')} "
-                        f"{enrollment_data.get('last_name')} ({enrollment_data.get('grade_level')})"
-                    )
-                )
-
-            except KeyError as e:
-                error_count += 1
-                self.stdout.write(
-                    self.style.ERROR(f"Entry {idx}: Missing required field {e}")
-                )
-            except Exception as e:
-                error_count += 1
-                self.stdout.write(
-                    self.style.ERROR(f"Entry {idx}: {str(e)}")
-                )
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
 
+        error_count = len(totals.errors) - totals.skipped
         self.stdout.write(
             self.style.SUCCESS(f"\n{'='*50}")
         )
         self.stdout.write(
-            self.style.SUCCESS(f"Completed: {created_count} created, "
-                              f"{skipped_count} skipped, {error_count} errors")
+            self.style.SUCCESS(f"Completed: {totals.created} created, "
+                              f"{totals.skipped} skipped, {error_count} errors")
         )
@@ -0,0 +1,510 @@
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from accounts.models import Section, SequenceCounter, User, UserProfile
+from finance.models import Transaction, TuitionConfig
+from finance.services import (
+    allocate_reference_numbers,
+    outstanding_balances,
+    recompute_ledger_balances,
+    refresh_ledger_summaries,
+)
+from grades.eligibility import refresh_eligibility_on_commit
+from jobs.services import enqueue
+from .models import Enrollment
+
+
+# ══════════════════════════════════════════════════════
+# STUDENT NUMBERS  —  <year><6-digit seq> from a locked counter
+# ══════════════════════════════════════════════════════
+def _last_student_sequence(prefix):
+    last = (
+        Enrollment.objects
+        .filter(student_number__startswith=prefix)
+        .aggregate(max_sn=Max("student_number"))
+        .get("max_sn")
+    )
+    return int(last[len(prefix):]) if last else 0
+
+
+def _student_numbers_in_use(numbers):
+    return set(
+        Enrollment.objects.filter(student_number__in=numbers).values_list("student_number", flat=True)
+    ) | set(
+        UserProfile.objects.filter(student_number__in=numbers).values_list("student_number", flat=True)
+    )
+
+
+def allocate_student_numbers(count=1):
+    """
+    Reserve `count` student numbers for the current year.
+    The existing-number scan only runs once, when the year's counter is created;
+    after that a single lookup makes sure no number was already set by hand.
+    """
+    prefix = str(timezone.now().year)
+    name = f"student_number:{prefix}"
+    with transaction.atomic():
+        numbers = SequenceCounter.allocate(name, count, seed=lambda: _last_student_sequence(prefix))
+        numbers = [f"{prefix}{seq:06d}" for seq in numbers]
+        # A number entered outside the counter: move the counter past it and draw again.
+        while used := _student_numbers_in_use(numbers):
+            last = max(int(number[len(prefix):]) for number in used)
+            SequenceCounter.objects.filter(name=name, value__lt=last).update(value=last)
+            numbers = [f"{prefix}{seq:06d}" for seq in SequenceCounter.allocate(name, count)]
+    return numbers
+
+
+# ══════════════════════════════════════════════════════
+# STATISTICS  —  one grouped query, cached until the next enrollment save
+# ══════════════════════════════════════════════════════
+STATISTICS_CACHE_KEY = "enrollment_statistics_cube"
+# Safety net for writes that bypass model signals (queryset.update()).
+STATISTICS_CACHE_TTL = 300
+
+
+def enrollment_count_cube():
+    """
+    Enrollment counts grouped by status × grade_level × academic_year × student_type,
+    as a list of {status, grade_level, academic_year, student_type, count} rows.
+    Served from cache; rebuilt with a single GROUP BY query on a miss.
+    """
+    rows = cache.get(STATISTICS_CACHE_KEY)
+    if rows is None:
+        rows = list(
+            Enrollment.objects.values("status", "grade_level", "academic_year", "student_type")
+            .annotate(count=Count("id"))
+            .order_by("academic_year", "grade_level", "status", "student_type")
+        )
+        cache.set(STATISTICS_CACHE_KEY, rows, STATISTICS_CACHE_TTL)
+    return rows
+
+
+def invalidate_enrollment_statistics():
+    cache.delete(STATISTICS_CACHE_KEY)
+
+
+def _tally(rows, field, blank=None):
+    totals = {}
+    for row in rows:
+        key = row[field] or blank
+        totals[key] = totals.get(key, 0) + row["count"]
+    return totals
+
+
+def enrollment_statistics(academic_year=None):
+    """
+    Dashboard statistics derived from the cached count cube.
+    Keeps the original response keys and adds by_status / by_student_type /
+    by_academic_year breakdowns plus the raw cube rows.
+    """
+    rows = enrollment_count_cube()
+    if academic_year:
+        rows = [row for row in rows if row["academic_year"] == academic_year]
+
+    by_status = _tally(rows, "status")
+    by_grade_code = _tally(rows, "grade_level")
+
+    return {
+        "total_enrollments": sum(row["count"] for row in rows),
+        "active_enrollments": by_status.get("ACTIVE", 0),
+        "completed_enrollments": by_status.get("COMPLETED", 0),
+        "dropped_enrollments": by_status.get("DROPPED", 0),
+        "pending_enrollments": by_status.get("PENDING", 0),
+        "by_grade": {
+            label: by_grade_code.get(code, 0) for code, label in Enrollment.GRADE_LEVEL_CHOICES
+        },
+        "by_status": {code: by_status.get(code, 0) for code, _ in Enrollment.STATUS_CHOICES},
+        "by_student_type": _tally(rows, "student_type", blank="unspecified"),
+        "by_academic_year": _tally(rows, "academic_year"),
+        "academic_year": academic_year or None,
+        "breakdown": rows,
+    }
+
+
+# ══════════════════════════════════════════════════════
+# FINANCE LEDGERS  —  built in memory, inserted with one bulk_create
+# ══════════════════════════════════════════════════════
+def semester_from_date(dt):
+    return "1st" if dt.month in [6, 7, 8, 9, 10] else "2nd"
+
+
+def student_full_name(enrollment):
+    return " ".join(
+        p for p in [
+            enrollment.first_name or "",
+            enrollment.middle_name or "",
+            enrollment.last_name or "",
+        ] if p
+    ).strip()
+
+
+def build_installment_schedule(tuition):
+    items = []
+
+    initial = Decimal(str(tuition.initial or 0))
+    monthly = Decimal(str(tuition.monthly or 0))
+    misc_aug = Decimal(str(tuition.misc_aug or 0))
+    misc_nov = Decimal(str(tuition.misc_nov or 0))
+
+    initial_due = date(2026, 5, 31)
+    if initial > 0:
+        items.append({
+            "item": "INITIAL",
+            "description": "Initial Tuition Billing",
+            "amount": initial,
+            "transaction_date": initial_due,
+            "due_date": initial_due,
+            "semester": semester_from_date(initial_due),
+        })
+
+    months = [
+        ("June", date(2026, 6, 30)),
+        ("July", date(2026, 7, 31)),
+        ("August", date(2026, 8, 31)),
+        ("September", date(2026, 9, 30)),
+        ("October", date(2026, 10, 31)),
+        ("November", date(2026, 11, 30)),
+        ("December", date(2026, 12, 31)),
+        ("January", date(2027, 1, 31)),
+        ("February", date(2027, 2, 28)),
+        ("March", date(2027, 3, 31)),
+    ]
+
+    if monthly > 0:
+        for label, due in months:
+            items.append({
+                "item": "MONTHLY",
+                "description": f"{label} Installment",
+                "amount": monthly,
+                "transaction_date": due,
+                "due_date": due,
+                "semester": semester_from_date(due),
+            })
+
+    if misc_aug > 0:
+        due = date(2026, 8, 31)
+        items.append({
+            "item": "MISC",
+            "description": "Miscellaneous (August)",
+            "amount": misc_aug,
+            "transaction_date": due,
+            "due_date": due,
+            "semester": semester_from_date(due),
+        })
+
+    if misc_nov > 0:
+        due = date(2026, 11, 30)
+        items.append({
+            "item": "MISC",
+            "description": "Miscellaneous (November)",
+            "amount": misc_nov,
+            "transaction_date": due,
+            "due_date": due,
+            "semester": semester_from_date(due),
+        })
+
+    return items
+
+
+def ledger_entries_for_enrollment(enrollment, tuition, today):
+    """
+    The tuition ledger rows for one enrollment as plain dicts, in posting order.
+    Cash: billing + payment. Installment: the schedule's debits + the initial payment credit.
+    """
+    payment_mode = (enrollment.payment_mode or "").strip().lower()
+    semester = semester_from_date(today)
+    entries = []
+
+    if payment_mode == "cash":
+        total_cash = Decimal(str(tuition.total_cash or 0))
+        entries.append({
+            "entry_type": "DEBIT", "item": "REGISTRATION", "amount": total_cash,
+            "description": "Cash Tuition Billing", "semester": semester,
+            "transaction_date": today, "due_date": None, "status": "POSTED",
+        })
+        entries.append({
+            "entry_type": "CREDIT", "item": "PAYMENT", "amount": total_cash,
+            "description": "Cash Tuition Payment", "semester": semester,
+            "transaction_date": today, "due_date": None, "status": "PAID",
+        })
+
+    elif payment_mode == "installment":
+        for sched in build_installment_schedule(tuition):
+            entries.append({
+                "entry_type": "DEBIT", "item": sched["item"], "amount": sched["amount"],
+                "description": sched["description"], "semester": sched["semester"],
+                "transaction_date": sched["transaction_date"], "due_date": sched["due_date"],
+                "status": "POSTED" if sched["item"] == "INITIAL" else "PENDING",
+            })
+
+        initial = Decimal(str(tuition.initial or 0))
+        if initial > 0:
+            initial_due = date(2026, 5, 31)
+            entries.append({
+                "entry_type": "CREDIT", "item": "INITIAL", "amount": initial,
+                "description": "Initial Tuition Payment", "semester": semester_from_date(initial_due),
+                "transaction_date": today, "due_date": initial_due, "status": "PAID",
+            })
+
+    return entries
+
+
+def _enrollments_with_ledgers(enrollments):
+    """Ids of the given enrollments that already have a tuition ledger (one query)."""
+    parent_ids = {e.parent_user_id for e in enrollments}
+    existing = Transaction.objects.filter(
+        Q(enrollment__in=enrollments)
+        | Q(item__in=["REGISTRATION", "INITIAL"], school_year__in={e.academic_year or "" for e in enrollments}),
+        parent_id__in=parent_ids,
+        transaction_type="TUITION",
+    ).values_list("enrollment_id", "parent_id", "student_name", "school_year")
+
+    by_enrollment, by_student = set(), set()
+    for enrollment_id, parent_id, student_name, school_year in existing:
+        if enrollment_id:
+            by_enrollment.add(enrollment_id)
+        by_student.add((parent_id, student_name, school_year))
+
+    return {
+        e.pk for e in enrollments
+        if e.pk in by_enrollment
+        or (e.parent_user_id, student_full_name(e), e.academic_year or "") in by_student
+    }
+
+
+def create_enrollment_ledgers(enrollments, today=None):
+    """
+    Create the tuition ledger for every given enrollment that does not have one yet.
+
+    Tuition configs, existing ledgers, fallback student numbers and existing parent
+    rows are each read with one query; reference numbers come from one counter
+    allocation; all rows go in with one bulk_create, with debit/credit/balance
+    already computed. Works the same for a single approval or a whole opening day.
+    Returns the number of transactions created.
+    """
+    enrollments = [e for e in enrollments if e.parent_user_id]
+    if not enrollments:
+        return 0
+    today = today or timezone.localdate()
+
+    tuitions = {
+        t.grade_key: t
+        for t in TuitionConfig.objects.filter(
+            grade_key__in={(e.grade_level or "").strip().lower() for e in enrollments},
+            is_active=True,
+            status="active",
+        )
+    }
+    done = _enrollments_with_ledgers(enrollments)
+    pending = [
+        (e, tuitions[(e.grade_level or "").strip().lower()])
+        for e in enrollments
+        if e.pk not in done and (e.grade_level or "").strip().lower() in tuitions
+    ]
+    if not pending:
+        return 0
+
+    profile_numbers = dict(
+        UserProfile.objects.filter(
+            user_id__in={e.parent_user_id for e, _ in pending if not e.student_number}
+        ).values_list("user_id", "student_number")
+    )
+
+    rows = []
+    for enrollment, tuition in pending:
+        base = {
+            "parent_id": enrollment.parent_user_id,
+            "enrollment": enrollment,
+            "student_name": student_full_name(enrollment),
+            "student_number_snapshot": (
+                enrollment.student_number or profile_numbers.get(enrollment.parent_user_id) or ""
+            ),
+            "grade_level_snapshot": enrollment.grade_level or "",
+            "payment_mode_snapshot": enrollment.payment_mode or "",
+            "student_type_snapshot": enrollment.student_type or "",
+            "school_year": enrollment.academic_year or "",
+            "transaction_type": "TUITION",
+            "payment_method": "CASH",
+        }
+        rows.extend({**base, **entry} for entry in ledger_entries_for_enrollment(enrollment, tuition, today))
+    if not rows:
+        return 0
+
+    parent_ids = {row["parent_id"] for row in rows}
+    with transaction.atomic():
+        parents_with_history = set(
+            Transaction.objects.filter(parent_id__in=parent_ids)
+            .values_list("parent_id", flat=True)
+            .distinct()
+        )
+        references = allocate_reference_numbers(len(rows))
+
+        transactions = []
+        for row, reference in zip(rows, references):
+            amount = Decimal(str(row.pop("amount") or 0))
+            tx = Transaction(reference_number=reference, date_posted=today, amount=amount, **row)
+            # Same debit/credit split Transaction.save() applies.
+            tx.debit = amount if tx.entry_type == "DEBIT" else Decimal("0.00")
+            tx.credit = amount if tx.entry_type != "DEBIT" else Decimal("0.00")
+            transactions.append(tx)
+
+        # Running balance in finance.services.LEDGER_ORDER (date_posted is today for every row).
+        running = {}
+        for _, tx in sorted(enumerate(transactions), key=lambda pair: (pair[1].transaction_date, pair[0])):
+            running[tx.parent_id] = running.get(tx.parent_id, Decimal("0")) + tx.debit - tx.credit
+            tx.balance = running[tx.parent_id]
+
+        Transaction.objects.bulk_create(transactions, batch_size=500)
+        # bulk_create sends no post_save: bring the ledger summaries and the
+        # eligibility rows that read them up to date.
+        refresh_ledger_summaries(parent_ids)
+        refresh_eligibility_on_commit(parent_ids)
+
+        # Parents who already had rows need their whole ledger re-threaded.
+        if parents_with_history:
+            recompute_ledger_balances(parents_with_history)
+
+    return len(transactions)
+
+
+# ══════════════════════════════════════════════════════
+# APPROVAL  —  shared by mark_active and bulk_approve
+# ══════════════════════════════════════════════════════
+VALID_GRADES = {"prek", "kinder", "grade1", "grade2", "grade3", "grade4", "grade5", "grade6"}
+LRN_GRADES = VALID_GRADES - {"prek"}
+
+
+def approval_error(enrollment):
+    """Why this enrollment cannot be approved yet, or None when it can."""
+    grade_code = (enrollment.grade_level or "").strip()
+    if grade_code not in VALID_GRADES:
+        return f"Invalid grade_level on enrollment: {enrollment.grade_level}"
+
+    required = [
+        "first_name", "last_name", "birth_date", "education_level", "grade_level",
+        "student_type", "academic_year", "payment_mode", "parent_facebook",
+    ]
+    required_missing = [field for field in required if not getattr(enrollment, field)]
+
+    if not (enrollment.email or enrollment.mobile_number or enrollment.telephone_number):
+        required_missing.append("contact")
+
+    if grade_code in LRN_GRADES:
+        if not enrollment.lrn:
+            required_missing.append("lrn")
+        elif len(str(enrollment.lrn).strip()) != 12:
+            return "LRN must be exactly 12 digits before approval."
+
+    if required_missing:
+        return f"Cannot approve. Missing required fields: {', '.join(required_missing)}"
+    return None
+
+
+def first_section_by_grade(grade_codes):
+    """{grade code: first section by id} for auto-assignment, in one query."""
+    sections = {}
+    for section in Section.objects.filter(grade_level__in=grade_codes).order_by("id"):
+        sections.setdefault(section.grade_level, section)
+    return sections
+
+
+def users_by_email(emails):
+    """{lower-cased email: user} for the given addresses, in one query."""
+    users = {}
+    matches = (
+        User.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in={e.lower() for e in emails if e})
+        .order_by("id")
+    )
+    for user in matches:
+        users.setdefault(user.email_lower, user)
+    return users
+
+
+# ══════════════════════════════════════════════════════
+# EMAILS  —  sent by the job worker, never inside the approval transaction
+# ══════════════════════════════════════════════════════
+def _from_email():
+    return getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@localhost")
+
+
+def parent_portal_email(enrollment, parent_email, student_number):
+    uidb64 = urlsafe_base64_encode(force_bytes(enrollment.parent_user.pk))
+    token = default_token_generator.make_token(enrollment.parent_user)
+
+    frontend_base = getattr(settings, "FRONTEND_URL", "http://localhost:5173")
+    reset_url = f"{frontend_base}/set-password/{uidb64}/{token}"
+
+    return EmailMessage(
+        subject="Your Student Portal Account",
+        body=(
+            f"Student: {enrollment.first_name} {enrollment.last_name}\n\n"
+            f"Username: {enrollment.parent_user.username}\n"
+            f"Email:    {enrollment.parent_user.email}\n\n"
+            f"Student Number: {student_number}\n\n"
+            f"Set your password here:\n{reset_url}\n\n"
+            "If you did not request this, ignore this email."
+        ),
+        from_email=_from_email(),
+        to=[parent_email],
+    )
+
+
+def promotion_email(enrollment, parent_email, grade_code, student_number):
+    return EmailMessage(
+        subject="Student Promotion Confirmed",
+        body=(
+            f"Dear Parent/Guardian,\n\n"
+            f"This is to confirm that {enrollment.first_name} {enrollment.last_name} "
+            f"has been successfully promoted.\n\n"
+            f"New Grade Level : {grade_code}\n"
+            f"Academic Year   : {enrollment.academic_year}\n"
+            f"Student No.     : {student_number}\n\n"
+            f"You may log in to the Student Portal to view the updated enrollment.\n\n"
+            "If you have any questions, please contact the school."
+        ),
+        from_email=_from_email(),
+        to=[parent_email],
+    )
+
+
+def send_enrollment_email(enrollment_id, parent_email, promotion=False, grade_code=""):
+    """Job handler: email the parent their portal account or promotion notice."""
+    enrollment = Enrollment.objects.select_related("parent_user").filter(pk=enrollment_id).first()
+    if enrollment is None or enrollment.parent_user is None:
+        return
+
+    student_number = enrollment.student_number
+    if not student_number:
+        student_number = (
+            UserProfile.objects.filter(user=enrollment.parent_user)
+            .values_list("student_number", flat=True)
+            .first()
+        ) or ""
+
+    if promotion:
+        message = promotion_email(enrollment, parent_email, grade_code, student_number)
+    else:
+        message = parent_portal_email(enrollment, parent_email, student_number)
+    message.send(fail_silently=False)
+
+
+def queue_enrollment_email(enrollment, parent_email, promotion=False, grade_code=""):
+    """Queue the approval email; it is sent by the job worker after the approval commits."""
+    enqueue("enrollment.services.send_enrollment_email", {
+        "enrollment_id": enrollment.pk,
+        "parent_email": parent_email,
+        "promotion": promotion,
+        "grade_code": grade_code,
+    })
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Enrollment
+from .services import invalidate_enrollment_statistics
+
+
+# ══════════════════════════════════════════════════════
+# STATISTICS CACHE  —  drop the cached counts on any enrollment change
+# ══════════════════════════════════════════════════════
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def enrollment_changed(sender, **kwargs):
+    invalidate_enrollment_statistics()
@@ -1,6 +1,23 @@
+import io
+import json
+import os
+import tempfile
+from decimal import Decimal
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 from accounts.models import User, Section
-from .models import Enrollment
+from finance.models import Transaction, TuitionConfig
+from jobs.services import run_pending
+from .imports import iter_json_array
+from .models import Enrollment, ParentInfo
+from .services import allocate_student_numbers, create_enrollment_ledgers
 
 
 class EnrollmentModelTest(TestCase):
@@ -41,3 +58,238 @@ class EnrollmentModelTest(TestCase):
         )
         expected_str = f"{self.student.username} - Grade 1 ({self.section.name}) - 2024-2025"
         self.assertEqual(str(enrollment), expected_str)
+
+
+
+class StudentNumberTest(TestCase):
+    def test_numbers_set_by_hand_are_skipped(self):
+        first = allocate_student_numbers()[0]
+        prefix, seq = first[:4], int(first[4:])
+        student = User.objects.create_user(
+            username="student1", email="student1@test.com", password="testpass123", role="PARENT_STUDENT"
+        )
+        Enrollment.objects.create(
+            student=student, grade_level=1, status="ACTIVE", student_number=f"{prefix}{seq + 2:06d}"
+        )
+
+        self.assertEqual(
+            allocate_student_numbers(2),
+            [f"{prefix}{seq + 3:06d}", f"{prefix}{seq + 4:06d}"],
+        )
+
+
+class EnrollmentStatisticsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            username="admin1", email="admin1@test.com", password="testpass123", role="ADMIN", is_staff=True
+        )
+        rows = [
+            ("grade1", "ACTIVE", "2025-2026", "new"),
+            ("grade1", "ACTIVE", "2025-2026", "old"),
+            ("grade2", "PENDING", "2025-2026", None),
+            ("kinder", "COMPLETED", "2024-2025", "old"),
+        ]
+        for i, (grade, status, year, student_type) in enumerate(rows):
+            student = User.objects.create_user(
+                username=f"student{i}", email=f"student{i}@test.com", password="testpass123"
+            )
+            Enrollment.objects.create(
+                student=student, grade_level=grade, status=status,
+                academic_year=year, student_type=student_type,
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.url = "/api/enrollments/statistics/"
+
+    def test_counts_are_cached_and_invalidated_on_save(self):
+        with self.assertNumQueries(1):
+            data = self.client.get(self.url).data
+        self.assertEqual(data["total_enrollments"], 4)
+        self.assertEqual(data["active_enrollments"], 2)
+        self.assertEqual(data["by_grade"]["Grade 1"], 2)
+        self.assertEqual(data["by_student_type"], {"new": 1, "old": 2, "unspecified": 1})
+
+        with self.assertNumQueries(0):
+            year = self.client.get(self.url, {"academic_year": "2025-2026"}).data
+        self.assertEqual(year["total_enrollments"], 3)
+        self.assertEqual(year["completed_enrollments"], 0)
+
+        enrollment = Enrollment.objects.get(status="PENDING")
+        enrollment.status = "ACTIVE"
+        enrollment.save()
+        self.assertEqual(self.client.get(self.url).data["active_enrollments"], 3)
+
+
+class EnrollmentLedgerTest(TestCase):
+    def setUp(self):
+        TuitionConfig.objects.create(
+            grade_key="grade1", grade_label="Grade 1", cash=Decimal("20000"),
+            installment=Decimal("22000"), initial=Decimal("2000"), monthly=Decimal("2000"),
+            misc_aug=Decimal("500"),
+        )
+
+    def _enrollment(self, i, payment_mode):
+        parent = User.objects.create_user(username=f"parent{i}", email=f"parent{i}@test.com", password="x")
+        student = User.objects.create_user(username=f"student{i}", email=f"student{i}@test.com", password="x")
+        return Enrollment.objects.create(
+            student=student, parent_user=parent, first_name=f"Student{i}", last_name="Test", grade_level="grade1",
+            payment_mode=payment_mode, academic_year="2026-2027", status="ACTIVE",
+            student_number=f"2026{i:06d}",
+        )
+
+    def _queries(self, enrollments):
+        with CaptureQueriesContext(connection) as ctx:
+            created = create_enrollment_ledgers(enrollments)
+        return created, len(ctx.captured_queries)
+
+    def test_batch_builds_ledgers_with_constant_queries(self):
+        # The first allocation creates the reference counter; measure after it exists.
+        create_enrollment_ledgers([self._enrollment(0, "cash")])
+        _, single = self._queries([self._enrollment(1, "installment")])
+        batch = [self._enrollment(i, mode) for i, mode in enumerate(["installment", "cash", "installment"], 2)]
+        created, many = self._queries(batch)
+
+        self.assertEqual(single, many)
+        # 12 debits + initial credit per installment ledger, billing + payment for cash.
+        self.assertEqual(created, 13 + 2 + 13)
+
+        ledger = list(Transaction.objects.filter(parent=batch[0].parent_user).order_by("transaction_date", "id"))
+        self.assertEqual(ledger[-1].balance, Decimal("20500.00"))
+        self.assertTrue(all(tx.enrollment_id == batch[0].pk for tx in ledger))
+        self.assertEqual(Transaction.objects.filter(parent=batch[1].parent_user).last().balance, Decimal("0.00"))
+
+        references = sorted(Transaction.objects.values_list("reference_number", flat=True))
+        self.assertEqual(len(set(references)), len(references))
+
+        # Already-built ledgers are skipped.
+        self.assertEqual(create_enrollment_ledgers(batch), 0)
+
+
+class BulkApproveTest(TestCase):
+    def setUp(self):
+        TuitionConfig.objects.create(
+            grade_key="grade1", grade_label="Grade 1", cash=Decimal("20000"),
+            installment=Decimal("22000"), initial=Decimal("2000"), monthly=Decimal("2000"),
+        )
+        self.section = Section.objects.create(name="Rizal", grade_level="grade1")
+        self.admin = User.objects.create_user(
+            username="registrar", email="registrar@test.com", password="x", role="ADMIN", is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def _enrollment(self, i, email, **extra):
+        student = User.objects.create_user(username=f"student{i}", email=f"student{i}@test.com", password="x")
+        fields = {
+            "student": student, "first_name": f"Student{i}", "last_name": "Test",
+            "birth_date": "2018-01-01", "education_level": "elementary", "grade_level": "grade1",
+            "student_type": "new", "academic_year": "2026-2027", "payment_mode": "installment",
+            "parent_facebook": "fb", "email": email, "lrn": f"{i:012d}",
+        }
+        fields.update(extra)
+        return Enrollment.objects.create(**fields)
+
+    def test_bulk_approve_reports_per_item_and_shares_parent_accounts(self):
+        first = self._enrollment(1, "family@test.com")
+        sibling = self._enrollment(2, "Family@test.com")
+        invalid = self._enrollment(3, "other@test.com", lrn="")
+
+        response = self.client.post(
+            "/api/enrollments/bulk-approve/", {"ids": [first.pk, sibling.pk, invalid.pk, 9999]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["approved"], response.data["failed"]), (2, 2))
+        statuses = [r["status"] for r in response.data["results"]]
+        self.assertEqual(statuses, ["approved", "approved", "failed", "failed"])
+        self.assertIn("lrn", response.data["results"][2]["detail"])
+
+        first.refresh_from_db()
+        sibling.refresh_from_db()
+        self.assertEqual(first.status, "ACTIVE")
+        self.assertEqual(first.section, self.section)
+        self.assertEqual(first.parent_user_id, sibling.parent_user_id)
+        self.assertEqual(int(sibling.student_number), int(first.student_number) + 1)
+        self.assertEqual(Transaction.objects.filter(enrollment__in=[first, sibling]).count(), 2 * 12)
+        # Parent emails are queued for the job worker, not sent in the request.
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(run_pending("test-worker"), (2, 0))
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertIn(first.student_number, mail.outbox[0].body)
+
+    def test_bulk_approve_failed_item_keeps_nothing(self):
+        first = self._enrollment(1, "first@test.com")
+        second = self._enrollment(2, "second@test.com")
+
+        def fail_first(enrollments):
+            if enrollments[0].pk == first.pk:
+                raise DatabaseError("ledger insert failed")
+            return create_enrollment_ledgers(enrollments)
+
+        with mock.patch("enrollment.views.create_enrollment_ledgers", side_effect=fail_first):
+            response = self.client.post(
+                "/api/enrollments/bulk-approve/", {"ids": [first.pk, second.pk]}, format="json"
+            )
+
+        self.assertEqual([r["status"] for r in response.data["results"]], ["failed", "approved"])
+        first.refresh_from_db()
+        second.refresh_from_db()
+        # The failed approval rolled back whole, and its student number was reused.
+        self.assertEqual((first.status, first.student_number), ("PENDING", None))
+        self.assertFalse(User.objects.filter(email="first@test.com").exists())
+        self.assertEqual(int(second.student_number) % 1000000, 1)
+        self.assertEqual(Transaction.objects.filter(enrollment=second).count(), 12)
+
+
+class ImportEnrollmentsTest(TestCase):
+    def _record(self, i, **extra):
+        record = {
+            "first_name": f"Student{i}", "last_name": "Import", "grade_level": "grade1",
+            "academic_year": "2025-2026", "birth_date": "2018-05-01", "email": f"import{i}@school.local",
+            "website": "", "parent_info": {"mother_name": f"Mother {i}"},
+        }
+        record.update(extra)
+        return record
+
+    def _write(self, records):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2)
+        self.addCleanup(lambda: [os.remove(p) for p in (path, f"{path}.checkpoint") if os.path.exists(p)])
+        return path
+
+    def test_stream_reader_handles_elements_split_across_reads(self):
+        records = [self._record(i) for i in range(5)] + [1.5, "x", None]
+        self.assertEqual(list(iter_json_array(io.StringIO(json.dumps(records)), read_size=7)), records)
+
+    def test_import_in_chunks_reports_bad_rows_and_reuses_students(self):
+        existing = User.objects.create_user(username="existing", email="import1@school.local", password="x")
+        path = self._write([
+            self._record(0),
+            self._record(1),
+            self._record(2, grade_level="grade9"),
+            self._record(3, website="spam"),
+            self._record(4, email="import0@school.local"),
+        ])
+
+        out = io.StringIO()
+        call_command("import_enrollments", path, "--chunk-size", "2", stdout=out)
+
+        self.assertIn("Completed: 3 created, 1 skipped, 1 errors", out.getvalue())
+        self.assertIn("Entry 3: grade_level", out.getvalue())
+        self.assertEqual(Enrollment.objects.filter(student=existing).count(), 1)
+        self.assertEqual(Enrollment.objects.filter(student__email="import0@school.local").count(), 2)
+        self.assertEqual(ParentInfo.objects.count(), 3)
+        self.assertFalse(os.path.exists(f"{path}.checkpoint"))
+
+    def test_resume_skips_committed_records(self):
+        path = self._write([self._record(i) for i in range(4)])
+        stat = os.stat(path)
+        with open(f"{path}.checkpoint", "w", encoding="utf-8") as f:
+            json.dump({"path": os.path.abspath(path), "size": stat.st_size, "mtime": stat.st_mtime, "done": 3}, f)
+
+        call_command("import_enrollments", path, "--resume", stdout=io.StringIO())
+
+        self.assertEqual(list(Enrollment.objects.values_list("first_name", flat=True)), ["Student3"])
+
@@ -1,15 +1,7 @@
-from decimal import Decimal
-from datetime import date
-
-from django.contrib.auth.tokens import default_token_generator
-from django.utils.http import urlsafe_base64_encode
-from django.utils.encoding import force_bytes
-from django.core.mail import send_mail
-from django.conf import settings
 from django.utils.text import slugify
 from django.utils import timezone
-from django.db import transaction
-from django.db.models import Max, Sum
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import DatabaseError, transaction
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
@@ -28,8 +20,18 @@ from .serializers import (
     EnrollmentCreateSerializer,
     OldStudentLookupSerializer,
 )
+from .services import (
+    allocate_student_numbers,
+    approval_error,
+    create_enrollment_ledgers,
+    enrollment_statistics,
+    first_section_by_grade,
+    outstanding_balances,
+    queue_enrollment_email,
+    users_by_email,
+)
 
-from finance.models import Transaction, TuitionConfig
+from finance.services import allocate_reference_numbers, outstanding_balance_for_parent
 
 
 class EnrollmentSettingsView(APIView):
@@ -391,16 +393,7 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         return mapping.get((current_grade or "").strip().lower())
 
     def _current_outstanding_balance_for_parent(self, parent_user):
-        totals = Transaction.objects.filter(parent=parent_user).aggregate(
-            total_debit=Sum("debit"),
-            total_credit=Sum("credit"),
-        )
-
-        total_debit = Decimal(str(totals.get("total_debit") or 0))
-        total_credit = Decimal(str(totals.get("total_credit") or 0))
-
-        balance = total_debit - total_credit
-        return balance if balance > 0 else Decimal("0.00")
+        return outstanding_balance_for_parent(parent_user)
 
     def _ensure_old_student_has_no_balance(self, parent_user):
         balance = self._current_outstanding_balance_for_parent(parent_user)
@@ -448,28 +441,10 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         self._save_optional_documents(enrollment, self.request.FILES)
 
     def generate_student_number(self):
-        year = timezone.now().year
-        prefix = str(year)
-
-        last = (
-            Enrollment.objects.filter(student_number__startswith=prefix)
-            .aggregate(max_sn=Max("student_number"))
-            .get("max_sn")
-        )
-
-        if last:
-            last_seq = int(last[len(prefix):])
-            next_seq = last_seq + 1
-        else:
-            next_seq = 1
-
-        return f"{prefix}{next_seq:06d}"
+        return allocate_student_numbers()[0]
 
     def generate_reference_number(self):
-        year = timezone.now().year
-        last = Transaction.objects.order_by("-id").first()
-        seq = (last.id + 1) if last else 1
-        return f"CESI-{year}-{seq:05d}"
+        return allocate_reference_numbers()[0]
 
     @staticmethod
     def _grade_code_to_section_level(grade_code: str):
@@ -484,255 +459,8 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         }
         return mapping.get((grade_code or "").strip().lower())
 
-    @staticmethod
-    def _semester_from_date(dt):
-        return "1st" if dt.month in [6, 7, 8, 9, 10] else "2nd"
-
-    def _student_full_name(self, enrollment):
-        return " ".join(
-            p for p in [
-                enrollment.first_name or "",
-                enrollment.middle_name or "",
-                enrollment.last_name or "",
-            ] if p
-        ).strip()
-
-    def _build_installment_schedule(self, tuition):
-        items = []
-
-        initial = Decimal(str(tuition.initial or 0))
-        monthly = Decimal(str(tuition.monthly or 0))
-        misc_aug = Decimal(str(tuition.misc_aug or 0))
-        misc_nov = Decimal(str(tuition.misc_nov or 0))
-
-        initial_due = date(2026, 5, 31)
-        if initial > 0:
-            items.append({
-                "item": "INITIAL",
-                "description": "Initial Tuition Billing",
-                "amount": initial,
-                "transaction_date": initial_due,
-                "due_date": initial_due,
-                "semester": self._semester_from_date(initial_due),
-            })
-
-        months = [
-            ("June", date(2026, 6, 30)),
-            ("July", date(2026, 7, 31)),
-            ("August", date(2026, 8, 31)),
-            ("September", date(2026, 9, 30)),
-            ("October", date(2026, 10, 31)),
-            ("November", date(2026, 11, 30)),
-            ("December", date(2026, 12, 31)),
-            ("January", date(2027, 1, 31)),
-            ("February", date(2027, 2, 28)),
-            ("March", date(2027, 3, 31)),
-        ]
-
-        if monthly > 0:
-            for label, due in months:
-                items.append({
-                    "item": "MONTHLY",
-                    "description": f"{label} Installment",
-                    "amount": monthly,
-                    "transaction_date": due,
-                    "due_date": due,
-                    "semester": self._semester_from_date(due),
-                })
-
-        if misc_aug > 0:
-            due = date(2026, 8, 31)
-            items.append({
-                "item": "MISC",
-                "description": "Miscellaneous (August)",
-                "amount": misc_aug,
-                "transaction_date": due,
-                "due_date": due,
-                "semester": self._semester_from_date(due),
-            })
-
-        if misc_nov > 0:
-            due = date(2026, 11, 30)
-            items.append({
-                "item": "MISC",
-                "description": "Miscellaneous (November)",
-                "amount": misc_nov,
-                "transaction_date": due,
-                "due_date": due,
-                "semester": self._semester_from_date(due),
-            })
-
-        return items
-
-    def _recompute_parent_ledger_balances(self, parent_user):
-        rows = Transaction.objects.filter(parent=parent_user).order_by(
-            "transaction_date", "date_posted", "id"
-        )
-
-        running = Decimal("0.00")
-        for row in rows:
-            running += Decimal(str(row.debit or 0)) - Decimal(str(row.credit or 0))
-            if row.balance != running:
-                row.balance = running
-                row.save(update_fields=["balance"])
-
-    def _ledger_exists_for_enrollment(self, enrollment):
-        if not enrollment.parent_user:
-            return False
-
-        return Transaction.objects.filter(
-            parent=enrollment.parent_user,
-            enrollment=enrollment,
-            transaction_type="TUITION",
-        ).exists()
-        
-    def _create_transaction(
-        self,
-        *,
-        enrollment,
-        parent_user,
-        student_name,
-        school_year,
-        semester,
-        transaction_type,
-        entry_type,
-        item,
-        amount,
-        description,
-        payment_method="CASH",
-        transaction_date=None,
-        due_date=None,
-        status_value="POSTED",
-    ):
-        effective_student_number = self._get_effective_student_number(enrollment)
-
-        return Transaction.objects.create(
-            parent=parent_user,
-            enrollment=enrollment,
-            student_name=student_name,
-            student_number_snapshot=effective_student_number,
-            grade_level_snapshot=enrollment.grade_level or "",
-            payment_mode_snapshot=enrollment.payment_mode or "",
-            student_type_snapshot=enrollment.student_type or "",
-            school_year=school_year,
-            semester=semester,
-            transaction_type=transaction_type,
-            entry_type=entry_type,
-            item=item,
-            amount=Decimal(str(amount or 0)),
-            description=description,
-            payment_method=payment_method,
-            reference_number=self.generate_reference_number(),
-            transaction_date=transaction_date or timezone.localdate(),
-            due_date=due_date,
-            status=status_value,
-        )
-
     def _create_finance_ledger_for_enrollment(self, enrollment):
-        if not enrollment.parent_user:
-            return
-
-        if self._ledger_exists_for_enrollment(enrollment):
-            return
-
-        grade_key = (enrollment.grade_level or "").strip().lower()
-        payment_mode = (enrollment.payment_mode or "").strip().lower()
-        school_year = enrollment.academic_year or ""
-        student_name = self._student_full_name(enrollment)
-
-        tuition = TuitionConfig.objects.filter(
-            grade_key=grade_key,
-            is_active=True,
-            status="active",
-        ).first()
-
-        if not tuition:
-            return
-
-        today = timezone.localdate()
-        semester = self._semester_from_date(today)
-
-        if payment_mode == "cash":
-            total_cash = Decimal(str(tuition.total_cash or 0))
-
-            self._create_transaction(
-                enrollment=enrollment,
-                parent_user=enrollment.parent_user,
-                student_name=student_name,
-                school_year=school_year,
-                semester=semester,
-                transaction_type="TUITION",
-                entry_type="DEBIT",
-                item="REGISTRATION",
-                amount=total_cash,
-                description="Cash Tuition Billing",
-                payment_method="CASH",
-                transaction_date=today,
-                due_date=None,
-                status_value="POSTED",
-            )
-
-            self._create_transaction(
-                enrollment=enrollment,
-                parent_user=enrollment.parent_user,
-                student_name=student_name,
-                school_year=school_year,
-                semester=semester,
-                transaction_type="TUITION",
-                entry_type="CREDIT",
-                item="PAYMENT",
-                amount=total_cash,
-                description="Cash Tuition Payment",
-                payment_method="CASH",
-                transaction_date=today,
-                due_date=None,
-                status_value="PAID",
-            )
-
-        elif payment_mode == "installment":
-            schedule = self._build_installment_schedule(tuition)
-
-            for sched in schedule:
-                debit_status = "POSTED" if sched["item"] == "INITIAL" else "PENDING"
-
-                self._create_transaction(
-                    enrollment=enrollment,
-                    parent_user=enrollment.parent_user,
-                    student_name=student_name,
-                    school_year=school_year,
-                    semester=sched["semester"],
-                    transaction_type="TUITION",
-                    entry_type="DEBIT",
-                    item=sched["item"],
-                    amount=sched["amount"],
-                    description=sched["description"],
-                    payment_method="CASH",
-                    transaction_date=sched["transaction_date"],
-                    due_date=sched["due_date"],
-                    status_value=debit_status,
-                )
-
-            initial = Decimal(str(tuition.initial or 0))
-            if initial > 0:
-                initial_due = date(2026, 5, 31)
-                self._create_transaction(
-                    enrollment=enrollment,
-                    parent_user=enrollment.parent_user,
-                    student_name=student_name,
-                    school_year=school_year,
-                    semester=self._semester_from_date(initial_due),
-                    transaction_type="TUITION",
-                    entry_type="CREDIT",
-                    item="INITIAL",
-                    amount=initial,
-                    description="Initial Tuition Payment",
-                    payment_method="CASH",
-                    transaction_date=today,
-                    due_date=initial_due,
-                    status_value="PAID",
-                )
-
-        self._recompute_parent_ledger_balances(enrollment.parent_user)
+        create_enrollment_ledgers([enrollment])
 
     @staticmethod
     def _sync_enrollment_to_profile(enrollment):
@@ -891,49 +619,6 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
 
         return ""
 
-    def _send_parent_portal_email(self, enrollment, parent_email):
-        if not enrollment.parent_user:
-            return
-
-        uidb64 = urlsafe_base64_encode(force_bytes(enrollment.parent_user.pk))
-        token = default_token_generator.make_token(enrollment.parent_user)
-
-        frontend_base = getattr(settings, "FRONTEND_URL", "http://localhost:5173")
-        reset_url = f"{frontend_base}/set-password/{uidb64}/{token}"
-
-        send_mail(
-            subject="Your Student Portal Account",
-            message=(
-                f"Student: {enrollment.first_name} {enrollment.last_name}\n\n"
-                f"Username: {enrollment.parent_user.username}\n"
-                f"Email:    {enrollment.parent_user.email}\n\n"
-                f"Student Number: {self._get_effective_student_number(enrollment)}\n\n"
-                f"Set your password here:\n{reset_url}\n\n"
-                "If you did not request this, ignore this email."
-            ),
-            from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@localhost"),
-            recipient_list=[parent_email],
-            fail_silently=False,
-        )
-
-    def _send_promotion_email(self, enrollment, parent_email, grade_code):
-        send_mail(
-            subject="Student Promotion Confirmed",
-            message=(
-                f"Dear Parent/Guardian,\n\n"
-                f"This is to confirm that {enrollment.first_name} {enrollment.last_name} "
-                f"has been successfully promoted.\n\n"
-                f"New Grade Level : {grade_code}\n"
-                f"Academic Year   : {enrollment.academic_year}\n"
-                f"Student No.     : {self._get_effective_student_number(enrollment)}\n\n"
-                f"You may log in to the Student Portal to view the updated enrollment.\n\n"
-                "If you have any questions, please contact the school."
-            ),
-            from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@localhost"),
-            recipient_list=[parent_email],
-            fail_silently=False,
-        )
-
     def perform_update(self, serializer):
         enrollment = serializer.save()
         uploaded_id_image = self.request.FILES.get("id_image")
@@ -1122,55 +807,9 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
                 return balance_block
 
         grade_code = (enrollment.grade_level or "").strip()
-        valid_grades = {
-            "prek", "kinder", "grade1", "grade2",
-            "grade3", "grade4", "grade5", "grade6",
-        }
-
-        if grade_code not in valid_grades:
-            return Response(
-                {"detail": f"Invalid grade_level on enrollment: {enrollment.grade_level}"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        required_missing = []
-
-        if not enrollment.first_name:
-            required_missing.append("first_name")
-        if not enrollment.last_name:
-            required_missing.append("last_name")
-        if not enrollment.birth_date:
-            required_missing.append("birth_date")
-        if not enrollment.education_level:
-            required_missing.append("education_level")
-        if not enrollment.grade_level:
-            required_missing.append("grade_level")
-        if not enrollment.student_type:
-            required_missing.append("student_type")
-        if not enrollment.academic_year:
-            required_missing.append("academic_year")
-        if not enrollment.payment_mode:
-            required_missing.append("payment_mode")
-        if not enrollment.parent_facebook:
-            required_missing.append("parent_facebook")
-
-        if not (enrollment.email or enrollment.mobile_number or enrollment.telephone_number):
-            required_missing.append("contact")
-
-        if grade_code in {"kinder", "grade1", "grade2", "grade3", "grade4", "grade5", "grade6"}:
-            if not enrollment.lrn:
-                required_missing.append("lrn")
-            elif len(str(enrollment.lrn).strip()) != 12:
-                return Response(
-                    {"detail": "LRN must be exactly 12 digits before approval."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-        if required_missing:
-            return Response(
-                {"detail": f"Cannot approve. Missing required fields: {', '.join(required_missing)}"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        error = approval_error(enrollment)
+        if error:
+            return Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
 
         is_promotion = (enrollment.student_type or "").strip().lower() == "old"
         parent_email = (enrollment.email or "").strip().lower()
@@ -1200,11 +839,7 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
                 if (enrollment.student_type or "").strip().lower() == "old":
                     enrollment.student_number = None
                 else:
-                    while True:
-                        candidate = self.generate_student_number()
-                        if not Enrollment.objects.filter(student_number=candidate).exists():
-                            enrollment.student_number = candidate
-                            break
+                    enrollment.student_number = self.generate_student_number()
 
             enrollment.status = "ACTIVE"
 
@@ -1243,9 +878,9 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
 
                 if enrollment.parent_user:
                     if is_promotion and had_existing_user:
-                        self._send_promotion_email(enrollment, parent_email, grade_code)
+                        queue_enrollment_email(enrollment, parent_email, promotion=True, grade_code=grade_code)
                     else:
-                        self._send_parent_portal_email(enrollment, parent_email)
+                        queue_enrollment_email(enrollment, parent_email)
 
             self._sync_enrollment_to_profile(enrollment)
 
@@ -1301,37 +936,11 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def statistics(self, request):
-        total_enrollments = Enrollment.objects.count()
-        active_enrollments = Enrollment.objects.filter(status="ACTIVE").count()
-        completed_enrollments = Enrollment.objects.filter(status="COMPLETED").count()
-        dropped_enrollments = Enrollment.objects.filter(status="DROPPED").count()
-        pending_enrollments = Enrollment.objects.filter(status="PENDING").count()
-
-        by_grade = {}
-        grade_map = {
-            "prek": "Pre-Kinder",
-            "kinder": "Kinder",
-            "grade1": "Grade 1",
-            "grade2": "Grade 2",
-            "grade3": "Grade 3",
-            "grade4": "Grade 4",
-            "grade5": "Grade 5",
-            "grade6": "Grade 6",
-        }
-
-        for code, label in grade_map.items():
-            by_grade[label] = Enrollment.objects.filter(grade_level=code).count()
-
-        return Response(
-            {
-                "total_enrollments": total_enrollments,
-                "active_enrollments": active_enrollments,
-                "completed_enrollments": completed_enrollments,
-                "dropped_enrollments": dropped_enrollments,
-                "pending_enrollments": pending_enrollments,
-                "by_grade": by_grade,
-            }
-        )
+        """
+        Enrollment counts for the admin dashboard, optionally for one ?academic_year=.
+        Served from a cached status × grade × year × student-type cube.
+        """
+        return Response(enrollment_statistics(request.query_params.get("academic_year")))
     queryset = Enrollment.objects.select_related(
         "student", "section", "parent_info", "parent_user"
     ).prefetch_related("documents").all()
@@ -1646,16 +1255,7 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
     # ------------------- Helpers -------------------
 
     def _current_outstanding_balance_for_parent(self, parent_user):
-        totals = Transaction.objects.filter(parent=parent_user).aggregate(
-            total_debit=Sum("debit"),
-            total_credit=Sum("credit"),
-        )
-
-        total_debit = Decimal(str(totals.get("total_debit") or 0))
-        total_credit = Decimal(str(totals.get("total_credit") or 0))
-
-        balance = total_debit - total_credit
-        return balance if balance > 0 else Decimal("0.00")
+        return outstanding_balance_for_parent(parent_user)
 
     def _ensure_old_student_has_no_balance(self, parent_user):
         balance = self._current_outstanding_balance_for_parent(parent_user)
@@ -1703,28 +1303,10 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         self._save_optional_documents(enrollment, self.request.FILES)
 
     def generate_student_number(self):
-        year = timezone.now().year
-        prefix = str(year)
-
-        last = (
-            Enrollment.objects.filter(student_number__startswith=prefix)
-            .aggregate(max_sn=Max("student_number"))
-            .get("max_sn")
-        )
-
-        if last:
-            last_seq = int(last[len(prefix):])
-            next_seq = last_seq + 1
-        else:
-            next_seq = 1
-
-        return f"{prefix}{next_seq:06d}"
+        return allocate_student_numbers()[0]
 
     def generate_reference_number(self):
-        year = timezone.now().year
-        last = Transaction.objects.order_by("-id").first()
-        seq = (last.id + 1) if last else 1
-        return f"CESI-{year}-{seq:05d}"
+        return allocate_reference_numbers()[0]
 
     @staticmethod
     def _grade_code_to_section_level(grade_code: str):
@@ -1739,250 +1321,8 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         }
         return mapping.get((grade_code or "").strip().lower())
 
-    @staticmethod
-    def _semester_from_date(dt):
-        return "1st" if dt.month in [6, 7, 8, 9, 10] else "2nd"
-
-    def _student_full_name(self, enrollment):
-        return " ".join(
-            p
-            for p in [
-                enrollment.first_name or "",
-                enrollment.middle_name or "",
-                enrollment.last_name or "",
-            ]
-            if p
-        ).strip()
-
-    def _build_installment_schedule(self, tuition):
-        items = []
-
-        initial = Decimal(str(tuition.initial or 0))
-        monthly = Decimal(str(tuition.monthly or 0))
-        misc_aug = Decimal(str(tuition.misc_aug or 0))
-        misc_nov = Decimal(str(tuition.misc_nov or 0))
-
-        initial_due = date(2026, 5, 31)
-        if initial > 0:
-            items.append({
-                "item": "INITIAL",
-                "description": "Initial Tuition Billing",
-                "amount": initial,
-                "transaction_date": initial_due,
-                "due_date": initial_due,
-                "semester": self._semester_from_date(initial_due),
-            })
-
-        months = [
-            ("June", date(2026, 6, 30)),
-            ("July", date(2026, 7, 31)),
-            ("August", date(2026, 8, 31)),
-            ("September", date(2026, 9, 30)),
-            ("October", date(2026, 10, 31)),
-            ("November", date(2026, 11, 30)),
-            ("December", date(2026, 12, 31)),
-            ("January", date(2027, 1, 31)),
-            ("February", date(2027, 2, 28)),
-            ("March", date(2027, 3, 31)),
-        ]
-
-        if monthly > 0:
-            for label, due in months:
-                items.append({
-                    "item": "MONTHLY",
-                    "description": f"{label} Installment",
-                    "amount": monthly,
-                    "transaction_date": due,
-                    "due_date": due,
-                    "semester": self._semester_from_date(due),
-                })
-
-        if misc_aug > 0:
-            due = date(2026, 8, 31)
-            items.append({
-                "item": "MISC",
-                "description": "Miscellaneous (August)",
-                "amount": misc_aug,
-                "transaction_date": due,
-                "due_date": due,
-                "semester": self._semester_from_date(due),
-            })
-
-        if misc_nov > 0:
-            due = date(2026, 11, 30)
-            items.append({
-                "item": "MISC",
-                "description": "Miscellaneous (November)",
-                "amount": misc_nov,
-                "transaction_date": due,
-                "due_date": due,
-                "semester": self._semester_from_date(due),
-            })
-
-        return items
-
-    def _recompute_parent_ledger_balances(self, parent_user):
-        rows = Transaction.objects.filter(parent=parent_user).order_by(
-            "transaction_date", "date_posted", "id"
-        )
-
-        running = Decimal("0.00")
-        for row in rows:
-            running += Decimal(str(row.debit or 0)) - Decimal(str(row.credit or 0))
-            if row.balance != running:
-                row.balance = running
-                row.save(update_fields=["balance"])
-
-    def _ledger_exists_for_enrollment(self, enrollment):
-        if not enrollment.parent_user:
-            return False
-
-        student_name = self._student_full_name(enrollment)
-        school_year = enrollment.academic_year or ""
-
-        return Transaction.objects.filter(
-            parent=enrollment.parent_user,
-            student_name=student_name,
-            school_year=school_year,
-            transaction_type="TUITION",
-            item__in=["REGISTRATION", "INITIAL"],
-        ).exists()
-
-    def _create_transaction(
-        self,
-        *,
-        parent_user,
-        student_name,
-        school_year,
-        semester,
-        transaction_type,
-        entry_type,
-        item,
-        amount,
-        description,
-        payment_method="CASH",
-        transaction_date=None,
-        due_date=None,
-        status_value="POSTED",
-    ):
-        return Transaction.objects.create(
-            parent=parent_user,
-            student_name=student_name,
-            school_year=school_year,
-            semester=semester,
-            transaction_type=transaction_type,
-            entry_type=entry_type,
-            item=item,
-            amount=Decimal(str(amount or 0)),
-            description=description,
-            payment_method=payment_method,
-            reference_number=self.generate_reference_number(),
-            transaction_date=transaction_date or timezone.localdate(),
-            due_date=due_date,
-            status=status_value,
-        )
-
     def _create_finance_ledger_for_enrollment(self, enrollment):
-        if not enrollment.parent_user:
-            return
-
-        if self._ledger_exists_for_enrollment(enrollment):
-            return
-
-        grade_key = (enrollment.grade_level or "").strip().lower()
-        payment_mode = (enrollment.payment_mode or "").strip().lower()
-        school_year = enrollment.academic_year or ""
-        student_name = self._student_full_name(enrollment)
-
-        tuition = TuitionConfig.objects.filter(
-            grade_key=grade_key,
-            is_active=True,
-            status="active",
-        ).first()
-
-        if not tuition:
-            return
-
-        today = timezone.localdate()
-        semester = self._semester_from_date(today)
-
-        if payment_mode == "cash":
-            total_cash = Decimal(str(tuition.total_cash or 0))
-
-            self._create_transaction(
-                parent_user=enrollment.parent_user,
-                student_name=student_name,
-                school_year=school_year,
-                semester=semester,
-                transaction_type="TUITION",
-                entry_type="DEBIT",
-                item="REGISTRATION",
-                amount=total_cash,
-                description="Cash Tuition Billing",
-                payment_method="CASH",
-                transaction_date=today,
-                due_date=None,
-                status_value="POSTED",
-            )
-
-            self._create_transaction(
-                parent_user=enrollment.parent_user,
-                student_name=student_name,
-                school_year=school_year,
-                semester=semester,
-                transaction_type="TUITION",
-                entry_type="CREDIT",
-                item="PAYMENT",
-                amount=total_cash,
-                description="Cash Tuition Payment",
-                payment_method="CASH",
-                transaction_date=today,
-                due_date=None,
-                status_value="PAID",
-            )
-
-        elif payment_mode == "installment":
-            schedule = self._build_installment_schedule(tuition)
-
-            for sched in schedule:
-                debit_status = "POSTED" if sched["item"] == "INITIAL" else "PENDING"
-
-                self._create_transaction(
-                    parent_user=enrollment.parent_user,
-                    student_name=student_name,
-                    school_year=school_year,
-                    semester=sched["semester"],
-                    transaction_type="TUITION",
-                    entry_type="DEBIT",
-                    item=sched["item"],
-                    amount=sched["amount"],
-                    description=sched["description"],
-                    payment_method="CASH",
-                    transaction_date=sched["transaction_date"],
-                    due_date=sched["due_date"],
-                    status_value=debit_status,
-                )
-
-            initial = Decimal(str(tuition.initial or 0))
-            if initial > 0:
-                initial_due = date(2026, 5, 31)
-                self._create_transaction(
-                    parent_user=enrollment.parent_user,
-                    student_name=student_name,
-                    school_year=school_year,
-                    semester=self._semester_from_date(initial_due),
-                    transaction_type="TUITION",
-                    entry_type="CREDIT",
-                    item="INITIAL",
-                    amount=initial,
-                    description="Initial Tuition Payment",
-                    payment_method="CASH",
-                    transaction_date=today,
-                    due_date=initial_due,
-                    status_value="PAID",
-                )
-
-        self._recompute_parent_ledger_balances(enrollment.parent_user)
+        create_enrollment_ledgers([enrollment])
 
     @staticmethod
     def _sync_enrollment_to_profile(enrollment):
@@ -2130,54 +1470,6 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
 
         profile.save()
 
-    def _send_parent_portal_email(self, enrollment, parent_email):
-        if not enrollment.parent_user:
-            return
-
-        uidb64 = urlsafe_base64_encode(force_bytes(enrollment.parent_user.pk))
-        token = default_token_generator.make_token(enrollment.parent_user)
-
-        frontend_base = getattr(settings, "FRONTEND_URL", "http://localhost:5173")
-        reset_url = f"{frontend_base}/set-password/{uidb64}/{token}"
-
-        send_mail(
-            subject="Your Student Portal Account",
-            message=(
-                f"Student: {enrollment.first_name} {enrollment.last_name}\n\n"
-                f"Username: {enrollment.parent_user.username}\n"
-                f"Email:    {enrollment.parent_user.email}\n\n"
-                f"Student Number: {enrollment.student_number or (UserProfile.objects.filter(user=enrollment.parent_user).first().student_number if UserProfile.objects.filter(user=enrollment.parent_user).exists() else '')}\n\n"
-                f"Set your password here:\n{reset_url}\n\n"
-                "If you did not request this, ignore this email."
-            ),
-            from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@localhost"),
-            recipient_list=[parent_email],
-            fail_silently=False,
-        )
-
-    def _send_promotion_email(self, enrollment, parent_email, grade_code):
-        existing_number = ""
-        if enrollment.parent_user:
-            profile = UserProfile.objects.filter(user=enrollment.parent_user).first()
-            existing_number = profile.student_number if profile else ""
-
-        send_mail(
-            subject="Student Promotion Confirmed",
-            message=(
-                f"Dear Parent/Guardian,\n\n"
-                f"This is to confirm that {enrollment.first_name} {enrollment.last_name} "
-                f"has been successfully promoted.\n\n"
-                f"New Grade Level : {grade_code}\n"
-                f"Academic Year   : {enrollment.academic_year}\n"
-                f"Student No.     : {existing_number or enrollment.student_number}\n\n"
-                f"You may log in to the Student Portal to view the updated enrollment.\n\n"
-                "If you have any questions, please contact the school."
-            ),
-            from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@localhost"),
-            recipient_list=[parent_email],
-            fail_silently=False,
-        )
-
     def perform_update(self, serializer):
         enrollment = serializer.save()
         uploaded_id_image = self.request.FILES.get("id_image")
@@ -2400,55 +1692,9 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
                 return balance_block
 
         grade_code = (enrollment.grade_level or "").strip()
-        valid_grades = {
-            "prek", "kinder", "grade1", "grade2",
-            "grade3", "grade4", "grade5", "grade6",
-        }
-
-        if grade_code not in valid_grades:
-            return Response(
-                {"detail": f"Invalid grade_level on enrollment: {enrollment.grade_level}"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        required_missing = []
-
-        if not enrollment.first_name:
-            required_missing.append("first_name")
-        if not enrollment.last_name:
-            required_missing.append("last_name")
-        if not enrollment.birth_date:
-            required_missing.append("birth_date")
-        if not enrollment.education_level:
-            required_missing.append("education_level")
-        if not enrollment.grade_level:
-            required_missing.append("grade_level")
-        if not enrollment.student_type:
-            required_missing.append("student_type")
-        if not enrollment.academic_year:
-            required_missing.append("academic_year")
-        if not enrollment.payment_mode:
-            required_missing.append("payment_mode")
-        if not enrollment.parent_facebook:
-            required_missing.append("parent_facebook")
-
-        if not (enrollment.email or enrollment.mobile_number or enrollment.telephone_number):
-            required_missing.append("contact")
-
-        if grade_code in {"kinder", "grade1", "grade2", "grade3", "grade4", "grade5", "grade6"}:
-            if not enrollment.lrn:
-                required_missing.append("lrn")
-            elif len(str(enrollment.lrn).strip()) != 12:
-                return Response(
-                    {"detail": "LRN must be exactly 12 digits before approval."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-        if required_missing:
-            return Response(
-                {"detail": f"Cannot approve. Missing required fields: {', '.join(required_missing)}"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        error = approval_error(enrollment)
+        if error:
+            return Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
 
         is_promotion = (enrollment.student_type or "").strip().lower() == "old"
         parent_email = (enrollment.email or "").strip().lower()
@@ -2478,11 +1724,7 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
                 if (enrollment.student_type or "").strip().lower() == "old":
                     enrollment.student_number = None
                 else:
-                    while True:
-                        candidate = self.generate_student_number()
-                        if not Enrollment.objects.filter(student_number=candidate).exists():
-                            enrollment.student_number = candidate
-                            break
+                    enrollment.student_number = self.generate_student_number()
 
             enrollment.status = "ACTIVE"
 
@@ -2521,9 +1763,9 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
 
                 if enrollment.parent_user:
                     if is_promotion and had_existing_user:
-                        self._send_promotion_email(enrollment, parent_email, grade_code)
+                        queue_enrollment_email(enrollment, parent_email, promotion=True, grade_code=grade_code)
                     else:
-                        self._send_parent_portal_email(enrollment, parent_email)
+                        queue_enrollment_email(enrollment, parent_email)
 
             self._sync_enrollment_to_profile(enrollment)
 
@@ -2541,37 +1783,11 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def statistics(self, request):
-        total_enrollments = Enrollment.objects.count()
-        active_enrollments = Enrollment.objects.filter(status="ACTIVE").count()
-        completed_enrollments = Enrollment.objects.filter(status="COMPLETED").count()
-        dropped_enrollments = Enrollment.objects.filter(status="DROPPED").count()
-        pending_enrollments = Enrollment.objects.filter(status="PENDING").count()
-
-        by_grade = {}
-        grade_map = {
-            "prek": "Pre-Kinder",
-            "kinder": "Kinder",
-            "grade1": "Grade 1",
-            "grade2": "Grade 2",
-            "grade3": "Grade 3",
-            "grade4": "Grade 4",
-            "grade5": "Grade 5",
-            "grade6": "Grade 6",
-        }
-
-        for code, label in grade_map.items():
-            by_grade[label] = Enrollment.objects.filter(grade_level=code).count()
-
-        return Response(
-            {
-                "total_enrollments": total_enrollments,
-                "active_enrollments": active_enrollments,
-                "completed_enrollments": completed_enrollments,
-                "dropped_enrollments": dropped_enrollments,
-                "pending_enrollments": pending_enrollments,
-                "by_grade": by_grade,
-            }
-        )
+        """
+        Enrollment counts for the admin dashboard, optionally for one ?academic_year=.
+        Served from a cached status × grade × year × student-type cube.
+        """
+        return Response(enrollment_statistics(request.query_params.get("academic_year")))
     queryset = Enrollment.objects.select_related(
         "student", "section", "parent_info", "parent_user"
     ).prefetch_related("documents").all()
@@ -2957,28 +2173,10 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
     # ------------------- Helpers -------------------
 
     def _outstanding_balance_for_parent(self, parent_user):
-        totals = Transaction.objects.filter(parent=parent_user).aggregate(
-            total_debit=Sum("debit"),
-            total_credit=Sum("credit"),
-        )
-
-        total_debit = Decimal(str(totals.get("total_debit") or 0))
-        total_credit = Decimal(str(totals.get("total_credit") or 0))
-
-        balance = total_debit - total_credit
-        return balance if balance > 0 else Decimal("0.00")
+        return outstanding_balance_for_parent(parent_user)
 
     def _current_outstanding_balance_for_parent(self, parent_user):
-        totals = Transaction.objects.filter(parent=parent_user).aggregate(
-            total_debit=Sum("debit"),
-            total_credit=Sum("credit"),
-        )
-
-        total_debit = Decimal(str(totals.get("total_debit") or 0))
-        total_credit = Decimal(str(totals.get("total_credit") or 0))
-
-        balance = total_debit - total_credit
-        return balance if balance > 0 else Decimal("0.00")
+        return outstanding_balance_for_parent(parent_user)
 
     def _ensure_old_student_has_no_balance(self, parent_user):
         balance = self._current_outstanding_balance_for_parent(parent_user)
@@ -3026,29 +2224,10 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         self._save_optional_documents(enrollment, self.request.FILES)
 
     def generate_student_number(self):
-        year = timezone.now().year
-        prefix = str(year)
-
-        last = (
-            Enrollment.objects
-            .filter(student_number__startswith=prefix)
-            .aggregate(max_sn=Max("student_number"))
-            .get("max_sn")
-        )
-
-        if last:
-            last_seq = int(last[len(prefix):])
-            next_seq = last_seq + 1
-        else:
-            next_seq = 1
-
-        return f"{prefix}{next_seq:06d}"
+        return allocate_student_numbers()[0]
 
     def generate_reference_number(self):
-        year = timezone.now().year
-        last = Transaction.objects.order_by("-id").first()
-        seq = (last.id + 1) if last else 1
-        return f"CESI-{year}-{seq:05d}"
+        return allocate_reference_numbers()[0]
 
     @staticmethod
     def _grade_code_to_section_level(grade_code: str):
@@ -3063,249 +2242,8 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         }
         return mapping.get((grade_code or "").strip().lower())
 
-    @staticmethod
-    def _semester_from_date(dt):
-        return "1st" if dt.month in [6, 7, 8, 9, 10] else "2nd"
-
-    def _student_full_name(self, enrollment):
-        return " ".join(
-            p for p in [
-                enrollment.first_name or "",
-                enrollment.middle_name or "",
-                enrollment.last_name or "",
-            ] if p
-        ).strip()
-
-    def _build_installment_schedule(self, tuition):
-        items = []
-
-        initial = Decimal(str(tuition.initial or 0))
-        monthly = Decimal(str(tuition.monthly or 0))
-        misc_aug = Decimal(str(tuition.misc_aug or 0))
-        misc_nov = Decimal(str(tuition.misc_nov or 0))
-
-        initial_due = date(2026, 5, 31)
-        if initial > 0:
-            items.append({
-                "item": "INITIAL",
-                "description": "Initial Tuition Billing",
-                "amount": initial,
-                "transaction_date": initial_due,
-                "due_date": initial_due,
-                "semester": self._semester_from_date(initial_due),
-            })
-
-        months = [
-            ("June", date(2026, 6, 30)),
-            ("July", date(2026, 7, 31)),
-            ("August", date(2026, 8, 31)),
-            ("September", date(2026, 9, 30)),
-            ("October", date(2026, 10, 31)),
-            ("November", date(2026, 11, 30)),
-            ("December", date(2026, 12, 31)),
-            ("January", date(2027, 1, 31)),
-            ("February", date(2027, 2, 28)),
-            ("March", date(2027, 3, 31)),
-        ]
-
-        if monthly > 0:
-            for label, due in months:
-                items.append({
-                    "item": "MONTHLY",
-                    "description": f"{label} Installment",
-                    "amount": monthly,
-                    "transaction_date": due,
-                    "due_date": due,
-                    "semester": self._semester_from_date(due),
-                })
-
-        if misc_aug > 0:
-            due = date(2026, 8, 31)
-            items.append({
-                "item": "MISC",
-                "description": "Miscellaneous (August)",
-                "amount": misc_aug,
-                "transaction_date": due,
-                "due_date": due,
-                "semester": self._semester_from_date(due),
-            })
-
-        if misc_nov > 0:
-            due = date(2026, 11, 30)
-            items.append({
-                "item": "MISC",
-                "description": "Miscellaneous (November)",
-                "amount": misc_nov,
-                "transaction_date": due,
-                "due_date": due,
-                "semester": self._semester_from_date(due),
-            })
-
-        return items
-
-    def _recompute_parent_ledger_balances(self, parent_user):
-        rows = Transaction.objects.filter(parent=parent_user).order_by(
-            "transaction_date", "date_posted", "id"
-        )
-
-        running = Decimal("0.00")
-        for row in rows:
-            running += Decimal(str(row.debit or 0)) - Decimal(str(row.credit or 0))
-            if row.balance != running:
-                row.balance = running
-                row.save(update_fields=["balance"])
-
-    def _ledger_exists_for_enrollment(self, enrollment):
-        if not enrollment.parent_user:
-            return False
-
-        student_name = self._student_full_name(enrollment)
-        school_year = enrollment.academic_year or ""
-
-        return Transaction.objects.filter(
-            parent=enrollment.parent_user,
-            student_name=student_name,
-            school_year=school_year,
-            transaction_type="TUITION",
-            item__in=["REGISTRATION", "INITIAL"],
-        ).exists()
-
-    def _create_transaction(
-        self,
-        *,
-        parent_user,
-        student_name,
-        school_year,
-        semester,
-        transaction_type,
-        entry_type,
-        item,
-        amount,
-        description,
-        payment_method="CASH",
-        transaction_date=None,
-        due_date=None,
-        status_value="POSTED",
-    ):
-        tx = Transaction.objects.create(
-            parent=parent_user,
-            student_name=student_name,
-            school_year=school_year,
-            semester=semester,
-            transaction_type=transaction_type,
-            entry_type=entry_type,
-            item=item,
-            amount=Decimal(str(amount or 0)),
-            description=description,
-            payment_method=payment_method,
-            reference_number=self.generate_reference_number(),
-            transaction_date=transaction_date or timezone.localdate(),
-            due_date=due_date,
-            status=status_value,
-        )
-        return tx
-
     def _create_finance_ledger_for_enrollment(self, enrollment):
-        if not enrollment.parent_user:
-            return
-
-        if self._ledger_exists_for_enrollment(enrollment):
-            return
-
-        grade_key = (enrollment.grade_level or "").strip().lower()
-        payment_mode = (enrollment.payment_mode or "").strip().lower()
-        school_year = enrollment.academic_year or ""
-        student_name = self._student_full_name(enrollment)
-
-        tuition = TuitionConfig.objects.filter(
-            grade_key=grade_key,
-            is_active=True,
-            status="active",
-        ).first()
-
-        if not tuition:
-            return
-
-        today = timezone.localdate()
-        semester = self._semester_from_date(today)
-
-        if payment_mode == "cash":
-            total_cash = Decimal(str(tuition.total_cash or 0))
-
-            self._create_transaction(
-                parent_user=enrollment.parent_user,
-                student_name=student_name,
-                school_year=school_year,
-                semester=semester,
-                transaction_type="TUITION",
-                entry_type="DEBIT",
-                item="REGISTRATION",
-                amount=total_cash,
-                description="Cash Tuition Billing",
-                payment_method="CASH",
-                transaction_date=today,
-                due_date=None,
-                status_value="POSTED",
-            )
-
-            self._create_transaction(
-                parent_user=enrollment.parent_user,
-                student_name=student_name,
-                school_year=school_year,
-                semester=semester,
-                transaction_type="TUITION",
-                entry_type="CREDIT",
-                item="PAYMENT",
-                amount=total_cash,
-                description="Cash Tuition Payment",
-                payment_method="CASH",
-                transaction_date=today,
-                due_date=None,
-                status_value="PAID",
-            )
-
-        elif payment_mode == "installment":
-            schedule = self._build_installment_schedule(tuition)
-
-            for sched in schedule:
-                debit_status = "POSTED" if sched["item"] == "INITIAL" else "PENDING"
-
-                self._create_transaction(
-                    parent_user=enrollment.parent_user,
-                    student_name=student_name,
-                    school_year=school_year,
-                    semester=sched["semester"],
-                    transaction_type="TUITION",
-                    entry_type="DEBIT",
-                    item=sched["item"],
-                    amount=sched["amount"],
-                    description=sched["description"],
-                    payment_method="CASH",
-                    transaction_date=sched["transaction_date"],
-                    due_date=sched["due_date"],
-                    status_value=debit_status,
-                )
-
-            initial = Decimal(str(tuition.initial or 0))
-            if initial > 0:
-                initial_due = date(2026, 5, 31)
-                self._create_transaction(
-                    parent_user=enrollment.parent_user,
-                    student_name=student_name,
-                    school_year=school_year,
-                    semester=self._semester_from_date(initial_due),
-                    transaction_type="TUITION",
-                    entry_type="CREDIT",
-                    item="INITIAL",
-                    amount=initial,
-                    description="Initial Tuition Payment",
-                    payment_method="CASH",
-                    transaction_date=today,
-                    due_date=initial_due,
-                    status_value="PAID",
-                )
-
-        self._recompute_parent_ledger_balances(enrollment.parent_user)
+        create_enrollment_ledgers([enrollment])
 
     @staticmethod
     def _sync_enrollment_to_profile(enrollment):
@@ -3445,49 +2383,6 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
 
         profile.save()
 
-    def _send_parent_portal_email(self, enrollment, parent_email):
-        if not enrollment.parent_user:
-            return
-
-        uidb64 = urlsafe_base64_encode(force_bytes(enrollment.parent_user.pk))
-        token = default_token_generator.make_token(enrollment.parent_user)
-
-        frontend_base = getattr(settings, "FRONTEND_URL", "http://localhost:5173")
-        reset_url = f"{frontend_base}/set-password/{uidb64}/{token}"
-
-        send_mail(
-            subject="Your Student Portal Account",
-            message=(
-                f"Student: {enrollment.first_name} {enrollment.last_name}\n\n"
-                f"Username: {enrollment.parent_user.username}\n"
-                f"Email:    {enrollment.parent_user.email}\n\n"
-                f"Student Number: {enrollment.student_number}\n\n"
-                f"Set your password here:\n{reset_url}\n\n"
-                "If you did not request this, ignore this email."
-            ),
-            from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@localhost"),
-            recipient_list=[parent_email],
-            fail_silently=False,
-        )
-
-    def _send_promotion_email(self, enrollment, parent_email, grade_code):
-        send_mail(
-            subject="Student Promotion Confirmed",
-            message=(
-                f"Dear Parent/Guardian,\n\n"
-                f"This is to confirm that {enrollment.first_name} {enrollment.last_name} "
-                f"has been successfully promoted.\n\n"
-                f"New Grade Level : {grade_code}\n"
-                f"Academic Year   : {enrollment.academic_year}\n"
-                f"Student No.     : {enrollment.student_number}\n\n"
-                f"You may log in to the Student Portal to view the updated enrollment.\n\n"
-                "If you have any questions, please contact the school."
-            ),
-            from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@localhost"),
-            recipient_list=[parent_email],
-            fail_silently=False,
-        )
-
     def perform_update(self, serializer):
         enrollment = serializer.save()
         uploaded_id_image = self.request.FILES.get("id_image")
@@ -3586,55 +2481,9 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
                 return balance_block
 
         grade_code = (enrollment.grade_level or "").strip()
-        valid_grades = {
-            "prek", "kinder", "grade1", "grade2",
-            "grade3", "grade4", "grade5", "grade6"
-        }
-
-        if grade_code not in valid_grades:
-            return Response(
-                {"detail": f"Invalid grade_level on enrollment: {enrollment.grade_level}"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        required_missing = []
-
-        if not enrollment.first_name:
-            required_missing.append("first_name")
-        if not enrollment.last_name:
-            required_missing.append("last_name")
-        if not enrollment.birth_date:
-            required_missing.append("birth_date")
-        if not enrollment.education_level:
-            required_missing.append("education_level")
-        if not enrollment.grade_level:
-            required_missing.append("grade_level")
-        if not enrollment.student_type:
-            required_missing.append("student_type")
-        if not enrollment.academic_year:
-            required_missing.append("academic_year")
-        if not enrollment.payment_mode:
-            required_missing.append("payment_mode")
-        if not enrollment.parent_facebook:
-            required_missing.append("parent_facebook")
-
-        if not (enrollment.email or enrollment.mobile_number or enrollment.telephone_number):
-            required_missing.append("contact")
-
-        if grade_code in {"kinder", "grade1", "grade2", "grade3", "grade4", "grade5", "grade6"}:
-            if not enrollment.lrn:
-                required_missing.append("lrn")
-            elif len(str(enrollment.lrn).strip()) != 12:
-                return Response(
-                    {"detail": "LRN must be exactly 12 digits before approval."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-        if required_missing:
-            return Response(
-                {"detail": f"Cannot approve. Missing required fields: {', '.join(required_missing)}"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        error = approval_error(enrollment)
+        if error:
+            return Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
 
         is_promotion = (enrollment.student_type or "").strip().lower() == "old"
         parent_email = (enrollment.email or "").strip().lower()
@@ -3668,11 +2517,7 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
                         enrollment.student_number = None
                     
                 else:
-                    while True:
-                        candidate = self.generate_student_number()
-                        if not Enrollment.objects.filter(student_number=candidate).exists():
-                            enrollment.student_number = candidate
-                            break
+                    enrollment.student_number = self.generate_student_number()
 
             enrollment.status = "ACTIVE"
 
@@ -3709,9 +2554,9 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
 
                 if enrollment.parent_user:
                     if is_promotion and had_existing_user:
-                        self._send_promotion_email(enrollment, parent_email, grade_code)
+                        queue_enrollment_email(enrollment, parent_email, promotion=True, grade_code=grade_code)
                     else:
-                        self._send_parent_portal_email(enrollment, parent_email)
+                        queue_enrollment_email(enrollment, parent_email)
 
             self._sync_enrollment_to_profile(enrollment)
 
@@ -3720,6 +2565,136 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
 
         serializer = self.get_serializer(enrollment)
         return Response(serializer.data)
+
+    BULK_APPROVE_LIMIT = 500
+
+    @action(detail=False, methods=["post"], url_path="bulk-approve")
+    def bulk_approve(self, request):
+        """
+        Approve many enrollments in one request: {"ids": [1, 2, ...]}.
+
+        Outstanding balances, sections and parent users are looked up once for the
+        whole batch. Each enrollment is approved in its own transaction, together
+        with its student number, tuition ledger and parent email job, so one
+        failure does not undo the rest and gives its student number back.
+        """
+        ids = request.data.get("ids")
+        if not isinstance(ids, list) or not ids:
+            return Response({"detail": "ids must be a non-empty list."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.BULK_APPROVE_LIMIT:
+            return Response(
+                {"detail": f"At most {self.BULK_APPROVE_LIMIT} enrollments can be approved per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            ids = list(dict.fromkeys(int(pk) for pk in ids))
+        except (TypeError, ValueError):
+            return Response({"detail": "ids must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        enrollments = Enrollment.objects.select_related("parent_user", "section", "parent_info").in_bulk(ids)
+
+        results = {}
+        candidates = []
+        for pk in ids:
+            enrollment = enrollments.get(pk)
+            if enrollment is None:
+                results[pk] = {"id": pk, "status": "failed", "detail": "Enrollment not found."}
+            elif enrollment.status == "ACTIVE":
+                results[pk] = {"id": pk, "status": "skipped", "detail": "Already active."}
+            elif error := approval_error(enrollment):
+                results[pk] = {"id": pk, "status": "failed", "detail": error}
+            else:
+                candidates.append(enrollment)
+
+        def is_old(enrollment):
+            return (enrollment.student_type or "").strip().lower() == "old"
+
+        balances = outstanding_balances({e.parent_user_id for e in candidates if is_old(e) and e.parent_user_id})
+        for enrollment in [e for e in candidates if e.parent_user_id in balances and is_old(e)]:
+            results[enrollment.pk] = {
+                "id": enrollment.pk,
+                "status": "failed",
+                "detail": "Outstanding balance. Please settle the previous balance first.",
+                "outstanding_balance": f"{balances[enrollment.parent_user_id]:.2f}",
+            }
+            candidates.remove(enrollment)
+
+        sections = first_section_by_grade({e.grade_level for e in candidates if e.section_id is None})
+        parents = users_by_email((e.email or "").strip().lower() for e in candidates)
+
+        for enrollment in candidates:
+            known_parents = dict(parents)
+            try:
+                with transaction.atomic():
+                    self._approve_in_batch(enrollment, sections, parents, is_old(enrollment))
+                    create_enrollment_ledgers([enrollment])
+            except (DatabaseError, DjangoValidationError) as exc:
+                # A parent account created by the rolled-back item no longer exists.
+                parents.clear()
+                parents.update(known_parents)
+                results[enrollment.pk] = {"id": enrollment.pk, "status": "failed", "detail": str(exc)}
+                continue
+            results[enrollment.pk] = {
+                "id": enrollment.pk,
+                "status": "approved",
+                "student_number": enrollment.student_number,
+                "section": enrollment.section_id,
+                "parent_user": enrollment.parent_user_id,
+            }
+
+        ordered = [results[pk] for pk in ids]
+        return Response({
+            "approved": sum(1 for r in ordered if r["status"] == "approved"),
+            "failed": sum(1 for r in ordered if r["status"] == "failed"),
+            "skipped": sum(1 for r in ordered if r["status"] == "skipped"),
+            "results": ordered,
+        })
+
+    def _approve_in_batch(self, enrollment, sections, parents, is_promotion):
+        """mark_active for one enrollment of a bulk batch, using the batch's shared lookups."""
+        grade_code = (enrollment.grade_level or "").strip()
+        parent_email = (enrollment.email or "").strip().lower()
+
+        if enrollment.section_id is None:
+            enrollment.section = sections.get(grade_code)
+        if not enrollment.student_number and not is_promotion:
+            # Allocated inside the item's transaction: a failed approval gives it back.
+            enrollment.student_number = allocate_student_numbers()[0]
+
+        enrollment.status = "ACTIVE"
+        note = "APPROVED BY ADMIN"
+        enrollment.remarks = (enrollment.remarks or "").strip()
+        if note not in enrollment.remarks:
+            enrollment.remarks = f"{enrollment.remarks} | {note}".strip(" |")
+
+        update_fields = ["status", "remarks", "updated_at", "student_number"]
+        if enrollment.section is not None:
+            update_fields.append("section")
+        enrollment.save(update_fields=update_fields)
+
+        had_existing_user = False
+        if parent_email:
+            existing_user = parents.get(parent_email)
+            had_existing_user = existing_user is not None
+
+            if existing_user and not enrollment.parent_user:
+                enrollment.parent_user = existing_user
+                enrollment.save(update_fields=["parent_user"])
+
+            self._sync_parent_user_and_profile(enrollment, create_if_missing=True)
+            # Siblings later in the batch reuse a freshly created parent account.
+            if enrollment.parent_user:
+                parents.setdefault(parent_email, enrollment.parent_user)
+
+                queue_enrollment_email(
+                    enrollment,
+                    parent_email,
+                    promotion=is_promotion and had_existing_user,
+                    grade_code=grade_code,
+                )
+
+        self._sync_enrollment_to_profile(enrollment)
+
     def _effective_student_number(self, enrollment):
         if enrollment.student_number:
             return enrollment.student_number
@@ -3738,32 +2713,8 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def statistics(self, request):
-        total_enrollments = Enrollment.objects.count()
-        active_enrollments = Enrollment.objects.filter(status="ACTIVE").count()
-        completed_enrollments = Enrollment.objects.filter(status="COMPLETED").count()
-        dropped_enrollments = Enrollment.objects.filter(status="DROPPED").count()
-        pending_enrollments = Enrollment.objects.filter(status="PENDING").count()
-
-        by_grade = {}
-        grade_map = {
-            "prek": "Pre-Kinder",
-            "kinder": "Kinder",
-            "grade1": "Grade 1",
-            "grade2": "Grade 2",
-            "grade3": "Grade 3",
-            "grade4": "Grade 4",
-            "grade5": "Grade 5",
-            "grade6": "Grade 6",
-        }
-
-        for code, label in grade_map.items():
-            by_grade[label] = Enrollment.objects.filter(grade_level=code).count()
-
-        return Response({
-            "total_enrollments": total_enrollments,
-            "active_enrollments": active_enrollments,
-            "completed_enrollments": completed_enrollments,
-            "dropped_enrollments": dropped_enrollments,
-            "pending_enrollments": pending_enrollments,
-            "by_grade": by_grade,
-        })
\ No newline at end of file
+        """
+        Enrollment counts for the admin dashboard, optionally for one ?academic_year=.
+        Served from a cached status × grade × year × student-type cube.
+        """
+        return Response(enrollment_statistics(request.query_params.get("academic_year")))
\ No newline at end of file
@@ -1,58 +1,106 @@
 """
-Export SQLite database to JSON backup file.
-No BOM, plain JSON format.
+Export SQLite database to NDJSON backup files, one per table.
+No BOM, one JSON object per line, optionally gzip/zstd compressed.
+
+Rows are streamed with fetchmany() and tables are exported in parallel, so memory
+use stays flat no matter how large attendance or messages grow.
+
+    python export_backup.py [--db db.sqlite3] [--out db_backup_raw]
+                            [--compress gzip|zstd|none] [--workers 4] [--chunk-size 5000]
 """
-import sqlite3
+import argparse
+import gzip
 import json
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 DB_PATH = "db.sqlite3"
-OUTPUT_PATH = "db_backup.json"
-
-def get_table_data(cursor, table_name):
-    """Get all rows from a table as list of dicts."""
-    cursor.execute(f"SELECT * FROM {table_name}")
-    columns = [desc[0] for desc in cursor.description]
-    rows = []
-    for row in cursor.fetchall():
-        row_dict = {}
-        for i, val in enumerate(row):
-            # Handle bytes (like images) - skip them or encode as base64
-            if isinstance(val, bytes):
-                row_dict[columns[i]] = None  # Skip binary data
-            else:
-                row_dict[columns[i]] = val
-        rows.append(row_dict)
-    return rows
+OUTPUT_DIR = "db_backup_raw"
+SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def open_output(path, compress):
+    if compress == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+    if compress == "zstd":
+        import zstandard  # optional: pip install zstandard
+        return zstandard.open(path, "wt", encoding="utf-8")
+    return open(path, "w", encoding="utf-8", newline="\n")
+
+
+def export_table(db_path, table_name, out_dir, compress, chunk_size):
+    """Stream one table to <table>.ndjson[.gz|.zst]. Returns (file name, row count)."""
+    file_name = f"{table_name}.ndjson{SUFFIXES[compress]}"
+    rows = 0
+    # Each worker uses its own read-only connection.
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f'SELECT * FROM "{table_name}"')
+        columns = [desc[0] for desc in cursor.description]
+        with open_output(os.path.join(out_dir, file_name), compress) as f:
+            while True:
+                chunk = cursor.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                for row in chunk:
+                    # Skip binary data (like images), as before
+                    row_dict = {
+                        col: (None if isinstance(val, bytes) else val)
+                        for col, val in zip(columns, row)
+                    }
+                    f.write(json.dumps(row_dict, ensure_ascii=False, default=str))
+                    f.write("\n")
+                rows += len(chunk)
+    finally:
+        conn.close()
+    return file_name, rows
+
 
 def main():
-    conn = sqlite3.connect(DB_PATH)
+    parser = argparse.ArgumentParser(description="Stream the SQLite database to per-table NDJSON files")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--out", default=OUTPUT_DIR)
+    parser.add_argument("--compress", choices=list(SUFFIXES), default="gzip")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
     cursor = conn.cursor()
-    
+
     # Get all table names (skip internal Django/SQLite tables)
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
-    tables = [t[0] for t in cursor.fetchall()]
-    
-    backup = {
+    tables = sorted(t[0] for t in cursor.fetchall())
+    conn.close()
+
+    os.makedirs(args.out, exist_ok=True)
+    manifest = {
         "exported_at": datetime.now().isoformat(),
-        "tables": {}
+        "format": "ndjson",
+        "tables": {},
     }
-    
-    for table in sorted(tables):
-        try:
-            data = get_table_data(cursor, table)
-            backup["tables"][table] = data
-            print(f"  {table}: {len(data)} rows")
-        except Exception as e:
-            print(f"  {table}: ERROR - {e}")
-    
-    conn.close()
-    
-    # Write JSON without BOM, with proper formatting
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(backup, f, indent=2, ensure_ascii=False, default=str)
-    
-    print(f"\nBackup saved to {OUTPUT_PATH}")
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {
+            table: pool.submit(export_table, args.db, table, args.out, args.compress, max(1, args.chunk_size))
+            for table in tables
+        }
+        for table, future in futures.items():
+            try:
+                file_name, rows = future.result()
+                manifest["tables"][table] = {"file": file_name, "rows": rows}
+                print(f"  {table}: {rows} rows")
+            except Exception as e:
+                print(f"  {table}: ERROR - {e}")
+
+    with open(os.path.join(args.out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"\nBackup saved to {args.out}/")
+
 
 if __name__ == "__main__":
     main()
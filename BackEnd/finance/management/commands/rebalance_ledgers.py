@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from finance.models import Transaction
+from finance.services import recompute_ledger_balances
+
+
+class Command(BaseCommand):
+    help = 'Recompute running balances for every parent ledger (year-end processing)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=200,
+            help='Number of parents rebalanced per query/transaction'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+
+        parent_ids = list(
+            Transaction.objects.order_by('parent_id')
+            .values_list('parent_id', flat=True)
+            .distinct()
+        )
+        total_parents = len(parent_ids)
+        updated = 0
+
+        for start in range(0, total_parents, chunk_size):
+            chunk = parent_ids[start:start + chunk_size]
+            updated += recompute_ledger_balances(chunk)
+            self.stdout.write(f'  Rebalanced {min(start + chunk_size, total_parents)}/{total_parents} parents')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebalance complete. Updated {updated} transaction balances.')
+        )
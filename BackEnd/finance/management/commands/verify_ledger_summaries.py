@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+
+from finance.models import ParentLedgerSummary, Transaction
+from finance.services import SUMMARY_FIELDS, ledger_summary_drift, refresh_ledger_summaries
+
+
+class Command(BaseCommand):
+    help = 'Compare every ParentLedgerSummary with the transactions it summarizes, and repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repair',
+            action='store_true',
+            help='Rewrite drifted or missing summary rows from the transactions'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of parents checked per query'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        repair = options['repair']
+
+        parent_ids = sorted(
+            set(Transaction.objects.values_list('parent_id', flat=True).distinct())
+            | set(ParentLedgerSummary.objects.values_list('parent_id', flat=True))
+        )
+        drifted = 0
+
+        for start in range(0, len(parent_ids), chunk_size):
+            chunk = parent_ids[start:start + chunk_size]
+            drift = refresh_ledger_summaries(chunk) if repair else ledger_summary_drift(chunk)
+            for parent_id, stored, expected in drift:
+                if stored is None:
+                    detail = 'missing summary row'
+                else:
+                    detail = ', '.join(
+                        f'{field} {stored[field]} != {expected[field]}'
+                        for field in SUMMARY_FIELDS
+                        if stored[field] != expected[field]
+                    )
+                self.stdout.write(self.style.WARNING(f'  Parent {parent_id}: {detail}'))
+            drifted += len(drift)
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS(f'All {len(parent_ids)} ledger summaries match their transactions.'))
+        elif repair:
+            self.stdout.write(self.style.SUCCESS(f'Repaired {drifted} of {len(parent_ids)} ledger summaries.'))
+        else:
+            self.stdout.write(
+                self.style.ERROR(f'{drifted} of {len(parent_ids)} ledger summaries drifted. Run with --repair to fix them.')
+            )
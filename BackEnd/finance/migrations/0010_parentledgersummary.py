@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:00
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q, Sum
+
+
+def build_summaries(apps, schema_editor):
+    Transaction = apps.get_model('finance', 'Transaction')
+    ParentLedgerSummary = apps.get_model('finance', 'ParentLedgerSummary')
+    rows = (
+        Transaction.objects.values('parent_id')
+        .annotate(
+            total_debit=Sum('debit'),
+            total_credit=Sum('credit'),
+            tuition_paid=Sum('credit', filter=Q(transaction_type='TUITION')),
+            transaction_count=Count('id'),
+            last_activity=Max('date_created'),
+        )
+        .order_by()
+    )
+    summaries = []
+    for row in rows:
+        total_debit = Decimal(str(row['total_debit'] or 0))
+        total_credit = Decimal(str(row['total_credit'] or 0))
+        summaries.append(ParentLedgerSummary(
+            parent_id=row['parent_id'],
+            total_debit=total_debit,
+            total_credit=total_credit,
+            tuition_paid=Decimal(str(row['tuition_paid'] or 0)),
+            balance=total_debit - total_credit,
+            transaction_count=row['transaction_count'],
+            last_activity=row['last_activity'],
+        ))
+    ParentLedgerSummary.objects.bulk_create(summaries, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0009_alter_proofofpayment_options_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParentLedgerSummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_debit', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('total_credit', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('tuition_paid', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('transaction_count', models.PositiveIntegerField(default=0)),
+                ('last_activity', models.DateTimeField(blank=True, null=True)),
+                ('parent', models.OneToOneField(limit_choices_to={'role': 'PARENT_STUDENT'}, on_delete=django.db.models.deletion.CASCADE, related_name='ledger_summary', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(build_summaries, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,6 @@
 # finance/models.py
 from decimal import Decimal
-from django.db import models
+from django.db import models, transaction
 from accounts.models import User
 from django.conf import settings
 from django.core.exceptions import ValidationError
@@ -126,12 +126,40 @@ class Transaction(models.Model):
             self.credit = amt
             self.debit = Decimal('0.00')
 
-        super().save(*args, **kwargs)
+        # finance.signals updates the parent's ledger summary inside this transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.student_name} - {self.item} - {self.entry_type} ({self.id})"
 
 
+class ParentLedgerSummary(models.Model):
+    """
+    Running totals of one parent's ledger, so balances are read from one row
+    instead of summing every transaction. Kept in step by finance.signals in
+    the same database transaction as each Transaction save/delete; bulk writes
+    call finance.services.refresh_ledger_summaries. Drift is reported and
+    repaired by `manage.py verify_ledger_summaries`.
+    """
+    parent = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='ledger_summary',
+        limit_choices_to={'role': 'PARENT_STUDENT'},
+    )
+    total_debit = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    total_credit = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    tuition_paid = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # total_debit - total_credit; negative when the parent has paid ahead.
+    balance = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    transaction_count = models.PositiveIntegerField(default=0)
+    last_activity = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.parent.username} - balance {self.balance}"
+
+
 class TuitionConfig(models.Model):
     GRADE_KEY_CHOICES = [
         ('prek', 'Pre-Kinder'),
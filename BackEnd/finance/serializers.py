@@ -5,6 +5,7 @@ from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
 from .models import Transaction, TuitionConfig, ProofOfPayment
+from .services import allocate_reference_numbers, recompute_parent_ledger_balances
 from accounts.models import User, UserProfile
 
 
@@ -253,11 +254,7 @@ class TransactionCreateSerializer(serializers.ModelSerializer):
         self._auto_fill_student_name(validated_data)
 
         if not validated_data.get('reference_number'):
-            from django.utils import timezone
-            year = timezone.now().year
-            last = Transaction.objects.order_by('-id').first()
-            seq = (last.id + 1) if last else 1
-            validated_data['reference_number'] = f"CESI-{year}-{seq:05d}"
+            validated_data['reference_number'] = allocate_reference_numbers()[0]
 
         if not validated_data.get('transaction_date'):
             from django.utils import timezone
@@ -274,16 +271,8 @@ class TransactionCreateSerializer(serializers.ModelSerializer):
         self._auto_fill_student_name(validated_data)
         tx = super().update(instance, validated_data)
 
-        totals = Transaction.objects.filter(parent=tx.parent).order_by(
-            'transaction_date', 'date_posted', 'id'
-        )
-
-        running = Decimal('0.00')
-        for row in totals:
-            running += Decimal(str(row.debit or 0)) - Decimal(str(row.credit or 0))
-            if row.balance != running:
-                row.balance = running
-                row.save(update_fields=['balance'])
+        recompute_parent_ledger_balances(tx.parent)
+        tx.refresh_from_db(fields=['balance'])
 
         return tx
 
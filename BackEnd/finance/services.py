@@ -0,0 +1,239 @@
+# finance/services.py
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, Q, Sum, Window
+from django.utils import timezone
+
+from accounts.models import SequenceCounter
+from .models import ParentLedgerSummary, Transaction
+
+
+# Same ordering the ledger has always used for running balances.
+LEDGER_ORDER = ('transaction_date', 'date_posted', 'id')
+
+
+def _running_balances(parent_ids):
+    """
+    Yield (transaction_id, stored_balance, running_balance) for every ledger row
+    of the given parents, in ledger order.
+    Uses a window function when the database supports it, otherwise one ordered
+    scan accumulated in Python. Either way it is a single query.
+    """
+    rows = Transaction.objects.filter(parent_id__in=parent_ids)
+
+    if connection.features.supports_over_clause:
+        rows = rows.annotate(
+            running=Window(
+                expression=Sum(F('debit') - F('credit')),
+                partition_by=[F('parent_id')],
+                order_by=[F(field).asc() for field in LEDGER_ORDER],
+            )
+        ).values_list('id', 'balance', 'running')
+        for tx_id, balance, running in rows:
+            yield tx_id, balance, Decimal(str(running or 0)).quantize(Decimal('0.01'))
+        return
+
+    current_parent = None
+    running = Decimal('0.00')
+    rows = rows.order_by('parent_id', *LEDGER_ORDER).values_list(
+        'id', 'parent_id', 'balance', 'debit', 'credit'
+    )
+    for tx_id, parent_id, balance, debit, credit in rows:
+        if parent_id != current_parent:
+            current_parent = parent_id
+            running = Decimal('0.00')
+        running += Decimal(str(debit or 0)) - Decimal(str(credit or 0))
+        yield tx_id, balance, running
+
+
+def recompute_ledger_balances(parent_ids, batch_size=500):
+    """
+    Recompute the running `balance` column for every transaction of the given
+    parents and write only the rows that changed with one bulk_update.
+    Bypasses Transaction.save(); debit/credit are already normalized on write.
+    Returns the number of rows updated.
+    """
+    parent_ids = [pid for pid in parent_ids if pid is not None]
+    if not parent_ids:
+        return 0
+
+    with transaction.atomic():
+        changed = [
+            Transaction(id=tx_id, balance=running)
+            for tx_id, balance, running in _running_balances(parent_ids)
+            if balance != running
+        ]
+        if changed:
+            Transaction.objects.bulk_update(changed, ['balance'], batch_size=batch_size)
+    return len(changed)
+
+
+def recompute_parent_ledger_balances(parent):
+    """Single-parent convenience wrapper around recompute_ledger_balances."""
+    if parent is None:
+        return 0
+    return recompute_ledger_balances([getattr(parent, 'pk', parent)])
+
+
+# ══════════════════════════════════════════════════════
+# REFERENCE NUMBERS  —  CESI-<year>-<seq>, allocated in blocks
+# ══════════════════════════════════════════════════════
+def allocate_reference_numbers(count=1):
+    """
+    Reserve `count` transaction reference numbers in one locked counter update.
+    A whole installment ledger takes its numbers with a single call.
+    """
+    year = timezone.now().year
+    # Reference numbers used to be derived from the last Transaction id, so the
+    # highest id is a safe starting point for a fresh counter.
+    numbers = SequenceCounter.allocate(
+        f'reference_number:{year}',
+        count,
+        seed=lambda: Transaction.objects.aggregate(last=Max('id'))['last'],
+    )
+    return [f'CESI-{year}-{seq:05d}' for seq in numbers]
+
+
+# ══════════════════════════════════════════════════════
+# LEDGER SUMMARY  —  one row of running totals per parent
+# ══════════════════════════════════════════════════════
+SUMMARY_FIELDS = ('total_debit', 'total_credit', 'tuition_paid', 'balance', 'transaction_count')
+
+
+def _zero_totals():
+    return {
+        'total_debit': Decimal('0.00'),
+        'total_credit': Decimal('0.00'),
+        'tuition_paid': Decimal('0.00'),
+        'balance': Decimal('0.00'),
+        'transaction_count': 0,
+    }
+
+
+def ledger_contribution(debit, credit, transaction_type):
+    """What one transaction adds to its parent's summary."""
+    debit = Decimal(str(debit or 0))
+    credit = Decimal(str(credit or 0))
+    return {
+        'total_debit': debit,
+        'total_credit': credit,
+        'tuition_paid': credit if transaction_type == 'TUITION' else Decimal('0.00'),
+        'balance': debit - credit,
+        'transaction_count': 1,
+    }
+
+
+def apply_ledger_contribution(parent_id, contribution, sign=1):
+    """
+    Add (sign=1) or remove (sign=-1) one transaction's contribution with a
+    single UPDATE of F() expressions, so concurrent writers never lose a change.
+    A parent without a summary row yet gets one built from the full ledger.
+    """
+    updated = ParentLedgerSummary.objects.filter(parent_id=parent_id).update(
+        **{field: F(field) + sign * value for field, value in contribution.items()},
+        last_activity=timezone.now(),
+    )
+    if not updated:
+        refresh_ledger_summaries([parent_id])
+
+
+def ledger_totals_by_parent(parent_ids):
+    """{parent_id: summary values} summed from the transactions in one grouped query."""
+    rows = (
+        Transaction.objects.filter(parent_id__in=parent_ids)
+        .values('parent_id')
+        .annotate(
+            total_debit=Sum('debit'),
+            total_credit=Sum('credit'),
+            tuition_paid=Sum('credit', filter=Q(transaction_type='TUITION')),
+            transaction_count=Count('id'),
+            last_activity=Max('date_created'),
+        )
+        .order_by()
+    )
+    totals = {}
+    for row in rows:
+        values = {
+            field: Decimal(str(row[field] or 0)).quantize(Decimal('0.01'))
+            for field in ('total_debit', 'total_credit', 'tuition_paid')
+        }
+        values['balance'] = values['total_debit'] - values['total_credit']
+        values['transaction_count'] = row['transaction_count']
+        values['last_activity'] = row['last_activity']
+        totals[row['parent_id']] = values
+    return totals
+
+
+def ledger_summary_drift(parent_ids):
+    """
+    [(parent_id, stored values or None, actual values)] for every parent whose
+    summary row disagrees with its transactions, or is missing.
+    """
+    parent_ids = {pid for pid in parent_ids if pid is not None}
+    actual = ledger_totals_by_parent(parent_ids)
+    stored = {
+        row['parent_id']: row
+        for row in ParentLedgerSummary.objects.filter(parent_id__in=parent_ids).values('parent_id', *SUMMARY_FIELDS)
+    }
+    drift = []
+    for parent_id in sorted(parent_ids):
+        if parent_id not in actual and parent_id not in stored:
+            continue
+        expected = actual.get(parent_id) or {**_zero_totals(), 'last_activity': None}
+        current = stored.get(parent_id)
+        if current is None or any(current[field] != expected[field] for field in SUMMARY_FIELDS):
+            drift.append((parent_id, current, expected))
+    return drift
+
+
+def refresh_ledger_summaries(parent_ids, batch_size=500):
+    """
+    Rebuild the summary rows of the given parents from their transactions,
+    writing only the rows that drifted. For writes that bypass Transaction
+    signals (bulk_create, imports). Returns the drift list that was repaired.
+    """
+    with transaction.atomic():
+        drift = ledger_summary_drift(parent_ids)
+        existing = ParentLedgerSummary.objects.select_for_update().in_bulk(
+            [parent_id for parent_id, current, _ in drift if current is not None], field_name='parent_id'
+        )
+        to_create, to_update = [], []
+        for parent_id, current, expected in drift:
+            values = {field: expected[field] for field in SUMMARY_FIELDS}
+            summary = existing.get(parent_id)
+            if summary is None:
+                to_create.append(ParentLedgerSummary(
+                    parent_id=parent_id, last_activity=expected['last_activity'], **values
+                ))
+                continue
+            for field, value in values.items():
+                setattr(summary, field, value)
+            to_update.append(summary)
+
+        if to_update:
+            ParentLedgerSummary.objects.bulk_update(to_update, SUMMARY_FIELDS, batch_size=batch_size)
+        if to_create:
+            ParentLedgerSummary.objects.bulk_create(to_create, batch_size=batch_size)
+    return drift
+
+
+def ledger_summary_for(parent):
+    """The parent's summary row; an unsaved all-zero one when they have no ledger yet."""
+    parent_id = getattr(parent, 'pk', parent)
+    summary = ParentLedgerSummary.objects.filter(parent_id=parent_id).first()
+    return summary or ParentLedgerSummary(parent_id=parent_id, **_zero_totals())
+
+
+def outstanding_balance_for_parent(parent):
+    """What the parent still owes; never negative."""
+    balance = ledger_summary_for(parent).balance
+    return balance if balance > 0 else Decimal('0.00')
+
+
+def outstanding_balances(parent_ids):
+    """{parent_id: positive outstanding balance} for the given parents, from their summary rows."""
+    return dict(
+        ParentLedgerSummary.objects.filter(parent_id__in=parent_ids, balance__gt=0)
+        .values_list('parent_id', 'balance')
+    )
@@ -0,0 +1,54 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.models import User
+from .models import Transaction
+from .services import apply_ledger_contribution, ledger_contribution
+
+
+# ══════════════════════════════════════════════════════
+# LEDGER SUMMARY  —  apply each transaction write as a delta
+# ══════════════════════════════════════════════════════
+@receiver(pre_save, sender=Transaction)
+def remember_previous_ledger_values(sender, instance, raw=False, **kwargs):
+    instance._previous_ledger = None
+    if raw or not instance.pk:
+        return
+    instance._previous_ledger = (
+        Transaction.objects.filter(pk=instance.pk)
+        .values('parent_id', 'debit', 'credit', 'transaction_type')
+        .first()
+    )
+
+
+@receiver(post_save, sender=Transaction)
+def update_ledger_summary_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_ledger', None)
+    current = ledger_contribution(instance.debit, instance.credit, instance.transaction_type)
+    if previous is None:
+        apply_ledger_contribution(instance.parent_id, current)
+        return
+
+    before = ledger_contribution(previous['debit'], previous['credit'], previous['transaction_type'])
+    if previous['parent_id'] == instance.parent_id:
+        # One UPDATE with the difference, transaction_count unchanged.
+        apply_ledger_contribution(instance.parent_id, {f: current[f] - before[f] for f in current})
+    else:
+        apply_ledger_contribution(previous['parent_id'], before, sign=-1)
+        apply_ledger_contribution(instance.parent_id, current)
+
+
+@receiver(post_delete, sender=Transaction)
+def update_ledger_summary_on_delete(sender, instance, origin=None, **kwargs):
+    # Deleting the parent account removes its summary row along with the ledger.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is User:
+        return
+    apply_ledger_contribution(
+        instance.parent_id,
+        ledger_contribution(instance.debit, instance.credit, instance.transaction_type),
+        sign=-1,
+    )
@@ -1,3 +1,205 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import User
+from .models import ParentLedgerSummary, Transaction
+from .services import (
+    allocate_reference_numbers,
+    outstanding_balance_for_parent,
+    recompute_ledger_balances,
+    recompute_parent_ledger_balances,
+)
+from .views import ledger_totals_for_parent, tuition_paid_for_parent
+
+
+class LedgerBalanceTest(TestCase):
+    def setUp(self):
+        self.parent = User.objects.create_user(
+            username="parent1", email="parent1@test.com", password="testpass123"
+        )
+        self.other = User.objects.create_user(
+            username="parent2", email="parent2@test.com", password="testpass123"
+        )
+        self._tx(self.parent, "DEBIT", "1000.00", date(2026, 6, 30))
+        self._tx(self.parent, "CREDIT", "250.50", date(2026, 6, 1))
+        self._tx(self.parent, "DEBIT", "500.00", date(2026, 7, 31))
+        self._tx(self.other, "DEBIT", "300.00", date(2026, 6, 30))
+
+    def _tx(self, parent, entry_type, amount, tx_date):
+        return Transaction.objects.create(
+            parent=parent,
+            student_name=parent.username,
+            entry_type=entry_type,
+            item="PAYMENT" if entry_type == "CREDIT" else "MONTHLY",
+            amount=Decimal(amount),
+            transaction_date=tx_date,
+        )
+
+    def _balances(self, parent):
+        return list(
+            Transaction.objects.filter(parent=parent)
+            .order_by("transaction_date", "date_posted", "id")
+            .values_list("balance", flat=True)
+        )
+
+    def test_running_balances_follow_ledger_order(self):
+        self.assertEqual(recompute_parent_ledger_balances(self.parent), 3)
+        self.assertEqual(
+            self._balances(self.parent),
+            [Decimal("-250.50"), Decimal("749.50"), Decimal("1249.50")],
+        )
+        # Other parents are untouched, and a second pass writes nothing.
+        self.assertEqual(self._balances(self.other), [Decimal("0.00")])
+        self.assertEqual(recompute_parent_ledger_balances(self.parent), 0)
+
+    def test_python_fallback_matches_window_function(self):
+        with mock.patch.object(connection.features, "supports_over_clause", False):
+            recompute_ledger_balances([self.parent.id, self.other.id])
+        fallback = self._balances(self.parent) + self._balances(self.other)
+
+        Transaction.objects.update(balance=0)
+        recompute_ledger_balances([self.parent.id, self.other.id])
+        self.assertEqual(self._balances(self.parent) + self._balances(self.other), fallback)
+
+    def test_rebalance_command(self):
+        call_command("rebalance_ledgers", "--chunk-size", "1", stdout=StringIO())
+        self.assertEqual(self._balances(self.parent)[-1], Decimal("1249.50"))
+        self.assertEqual(self._balances(self.other), [Decimal("300.00")])
+
+
+class ReferenceNumberTest(TestCase):
+    def test_counter_continues_after_existing_transactions(self):
+        parent = User.objects.create_user(username="parent1", email="parent1@test.com", password="testpass123")
+        last = Transaction.objects.create(parent=parent, entry_type="DEBIT", amount=Decimal("10"))
+        year = timezone.now().year
+
+        first_block = allocate_reference_numbers(3)
+        self.assertEqual(first_block, [f"CESI-{year}-{last.id + i:05d}" for i in (1, 2, 3)])
+        self.assertEqual(allocate_reference_numbers(), [f"CESI-{year}-{last.id + 4:05d}"])
+
+
+class StudentTuitionOverviewTest(TestCase):
+    def setUp(self):
+        from rest_framework.test import APIClient
+        from accounts.models import UserProfile
+        from .models import TuitionConfig
+
+        TuitionConfig.objects.create(
+            grade_key="grade1", grade_label="Grade 1", cash=Decimal("20000"),
+            installment=Decimal("22000"), initial=Decimal("2000"), monthly=Decimal("2000"),
+        )
+        for i, (mode, paid) in enumerate([("cash", "20000"), ("installment", "0"), ("installment", "6000")]):
+            user = User.objects.create_user(username=f"parent{i}", email=f"parent{i}@test.com", password="x")
+            UserProfile.objects.create(
+                user=user, student_first_name=f"Student{i}", student_last_name="Test",
+                grade_level="grade1", payment_mode=mode, parent_first_name="P", parent_last_name="T",
+                contact_number="0", address="-",
+            )
+            if paid != "0":
+                Transaction.objects.create(
+                    parent=user, student_name=user.username, transaction_type="TUITION",
+                    entry_type="CREDIT", item="PAYMENT", amount=Decimal(paid),
+                )
+
+        admin = User.objects.create_user(username="admin", email="admin@test.com", password="x", role="ADMIN")
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def test_sorted_paginated_overview(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                "/api/finance/student-tuition-overview/",
+                {"ordering": "-balance", "page": 1, "page_size": 2},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(
+            [(r["student_name"], r["remaining_balance"]) for r in response.data["results"]],
+            [("Student1 Test", 22000.0), ("Student2 Test", 16000.0)],
+        )
+
+    def test_unpaginated_response_is_a_list(self):
+        response = self.client.get("/api/finance/student-tuition-overview/")
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(response.data[0]["account_status"], "PAID")
+
+
+class ParentLedgerSummaryTest(TestCase):
+    def setUp(self):
+        self.parent = User.objects.create_user(
+            username="parent1", email="parent1@test.com", password="testpass123"
+        )
+        self.other = User.objects.create_user(
+            username="parent2", email="parent2@test.com", password="testpass123"
+        )
+
+    def _tx(self, parent, entry_type, amount, transaction_type="TUITION"):
+        return Transaction.objects.create(
+            parent=parent, student_name=parent.username, entry_type=entry_type,
+            transaction_type=transaction_type, amount=Decimal(amount),
+        )
+
+    def _summary(self, parent):
+        summary = ParentLedgerSummary.objects.get(parent=parent)
+        return (summary.total_debit, summary.total_credit, summary.tuition_paid, summary.balance,
+                summary.transaction_count)
+
+    def test_saves_and_deletes_keep_summary_in_step(self):
+        self._tx(self.parent, "DEBIT", "1000.00")
+        self._tx(self.parent, "CREDIT", "400.00")
+        misc = self._tx(self.parent, "CREDIT", "100.00", transaction_type="MISC")
+        self.assertEqual(
+            self._summary(self.parent),
+            (Decimal("1000.00"), Decimal("500.00"), Decimal("400.00"), Decimal("500.00"), 3),
+        )
+        self.assertEqual(ledger_totals_for_parent(self.parent)[2], Decimal("500.00"))
+        self.assertEqual(tuition_paid_for_parent(self.parent), Decimal("400.00"))
+
+        misc.amount = Decimal("150.00")
+        misc.transaction_type = "TUITION"
+        misc.save()
+        self.assertEqual(self._summary(self.parent)[1:4], (Decimal("550.00"), Decimal("550.00"), Decimal("450.00")))
+
+        misc.parent = self.other
+        misc.save()
+        self.assertEqual(self._summary(self.parent)[3:], (Decimal("600.00"), 2))
+        self.assertEqual(outstanding_balance_for_parent(self.other), Decimal("0.00"))
+        self.assertEqual(self._summary(self.other)[3], Decimal("-150.00"))
+
+        misc.delete()
+        self.assertEqual(self._summary(self.other)[3:], (Decimal("0.00"), 0))
+        # A parent without any ledger reads as all zeros.
+        self.assertEqual(ledger_totals_for_parent(User.objects.create_user(
+            username="parent3", email="parent3@test.com", password="testpass123",
+        )), (Decimal("0"), Decimal("0"), Decimal("0.00")))
+
+        # Deleting the account takes the summary with it.
+        self.parent.delete()
+        self.assertFalse(ParentLedgerSummary.objects.filter(parent_id=self.parent.id).exists())
+
+    def test_verify_command_detects_and_repairs_drift(self):
+        self._tx(self.parent, "DEBIT", "1000.00")
+        self._tx(self.other, "DEBIT", "300.00")
+        ParentLedgerSummary.objects.filter(parent=self.parent).update(total_debit=Decimal("1.00"))
+        ParentLedgerSummary.objects.filter(parent=self.other).delete()
+
+        out = StringIO()
+        call_command("verify_ledger_summaries", stdout=out)
+        self.assertIn("2 of 2 ledger summaries drifted", out.getvalue())
+        self.assertIn(f"Parent {self.other.id}: missing summary row", out.getvalue())
+        self.assertEqual(self._summary(self.parent)[0], Decimal("1.00"))
+
+        call_command("verify_ledger_summaries", "--repair", stdout=StringIO())
+        self.assertEqual(self._summary(self.parent)[0], Decimal("1000.00"))
+        self.assertEqual(self._summary(self.other)[3:], (Decimal("300.00"), 1))
 
-# Create your tests here.
+        out = StringIO()
+        call_command("verify_ledger_summaries", stdout=out)
+        self.assertIn("All 2 ledger summaries match", out.getvalue())
@@ -14,7 +14,7 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 
 from accounts.models import User, UserProfile
-from .models import Transaction, TuitionConfig, ProofOfPayment
+from .models import ParentLedgerSummary, Transaction, TuitionConfig, ProofOfPayment
 from .serializers import (
     TransactionSerializer,
     TransactionCreateSerializer,
@@ -23,6 +23,7 @@ from .serializers import (
     TuitionConfigCreateSerializer,
     ProofOfPaymentSerializer,
 )
+from .services import ledger_summary_for
 
 
 def build_installment_schedule(tuition):
@@ -88,12 +89,10 @@ def build_installment_schedule(tuition):
 
 
 def ledger_totals_for_parent(parent):
-    totals = Transaction.objects.filter(parent=parent).aggregate(
-        total_debit=Sum('debit'),
-        total_credit=Sum('credit'),
-    )
-    total_debit = Decimal(str(totals.get('total_debit') or 0))
-    total_credit = Decimal(str(totals.get('total_credit') or 0))
+    """(total debit, total credit, balance) from the parent's ledger summary row."""
+    summary = ledger_summary_for(parent)
+    total_debit = Decimal(str(summary.total_debit))
+    total_credit = Decimal(str(summary.total_credit))
     balance = total_debit - total_credit
     if balance < 0:
         balance = Decimal('0.00')
@@ -101,11 +100,21 @@ def ledger_totals_for_parent(parent):
 
 
 def tuition_paid_for_parent(parent):
-    totals = Transaction.objects.filter(
-        parent=parent,
-        transaction_type='TUITION'
-    ).aggregate(total_credit=Sum('credit'))
-    return Decimal(str(totals.get('total_credit') or 0))
+    return Decimal(str(ledger_summary_for(parent).tuition_paid))
+
+
+def tuition_paid_by_parent(parent_ids):
+    """
+    Tuition credits for many parents, read from their ledger summary rows.
+    `parent_ids` may be a list or a values() subquery.
+    Returns {parent_id: Decimal}; parents without tuition credits are omitted.
+    """
+    rows = (
+        ParentLedgerSummary.objects.filter(parent_id__in=parent_ids)
+        .exclude(tuition_paid=0)
+        .values_list('parent_id', 'tuition_paid')
+    )
+    return {parent_id: Decimal(str(paid)) for parent_id, paid in rows}
 
 
 def compute_cash_status(total_due, total_paid):
@@ -114,13 +123,14 @@ def compute_cash_status(total_due, total_paid):
     return 'PENDING'
 
 
-def compute_installment_status(total_due, total_paid, tuition):
+def compute_installment_status(total_due, total_paid, tuition, schedule=None):
     today = date.today()
 
     if total_due > 0 and total_paid >= total_due:
         return 'PAID'
 
-    schedule = build_installment_schedule(tuition)
+    if schedule is None:
+        schedule = build_installment_schedule(tuition)
 
     if total_paid <= 0:
         has_overdue = any(item['due_date'] < today for item in schedule if item['item'] != 'INITIAL')
@@ -222,9 +232,10 @@ def transaction_stats(request):
     if getattr(request.user, 'role', None) != 'ADMIN':
         return Response({'detail': 'Forbidden'}, status=403)
 
-    totals = Transaction.objects.aggregate(
-        total_debit=Sum('debit'),
-        total_credit=Sum('credit'),
+    # One row per parent instead of every transaction in the school.
+    totals = ParentLedgerSummary.objects.aggregate(
+        total_debit=Sum('total_debit'),
+        total_credit=Sum('total_credit'),
     )
     total_debit = Decimal(str(totals.get('total_debit') or 0))
     total_credit = Decimal(str(totals.get('total_credit') or 0))
@@ -420,14 +431,49 @@ def tuition_config_by_grade(request, grade_key):
     return Response(TuitionConfigSerializer(obj).data)
 
 
+TUITION_OVERVIEW_ORDERING = {
+    'balance': lambda row: (row['remaining_balance'], row['student_name'].lower()),
+    'status': lambda row: (row['account_status'], row['student_name'].lower()),
+    'name': lambda row: row['student_name'].lower(),
+}
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def student_tuition_overview(request):
+    """
+    Tuition standing for every student profile.
+    Query params: search, grade_level,
+    ordering=<balance|status|name> (prefix with '-' for descending),
+    page / page_size (when given, the response is paginated:
+    { count, page, page_size, results }).
+    Runs a constant number of queries regardless of roster size.
+    """
     if getattr(request.user, 'role', None) != 'ADMIN':
         return Response({'detail': 'Forbidden'}, status=403)
 
     search = request.query_params.get('search', '').strip()
     grade_level = request.query_params.get('grade_level', '').strip()
+    ordering = request.query_params.get('ordering', '').strip()
+    page_param = request.query_params.get('page')
+    page_size_param = request.query_params.get('page_size')
+
+    sort_key = TUITION_OVERVIEW_ORDERING.get(ordering.lstrip('-')) if ordering else None
+    if ordering and sort_key is None:
+        return Response(
+            {'detail': f"Invalid ordering. Allowed: {', '.join(TUITION_OVERVIEW_ORDERING)} (optionally prefixed with '-')."},
+            status=400,
+        )
+
+    paginate = page_param is not None or page_size_param is not None
+    if paginate:
+        try:
+            page = int(page_param or 1)
+            page_size = int(page_size_param or 50)
+            if page < 1 or not 1 <= page_size <= 500:
+                raise ValueError()
+        except (TypeError, ValueError):
+            return Response({'detail': 'page must be >= 1 and page_size between 1 and 500.'}, status=400)
 
     qs = UserProfile.objects.select_related('user', 'section').all()
 
@@ -449,6 +495,20 @@ def student_tuition_overview(request):
         for t in TuitionConfig.objects.filter(is_active=True, status='active')
     }
 
+    # Installment schedules only depend on the config, so build each one once.
+    schedule_cache = {}
+
+    def installment_schedule(tuition):
+        if tuition.pk not in schedule_cache:
+            schedule = build_installment_schedule(tuition)
+            schedule_cache[tuition.pk] = (
+                schedule,
+                sum((item['amount'] for item in schedule), Decimal('0.00')),
+            )
+        return schedule_cache[tuition.pk]
+
+    paid_by_parent = tuition_paid_by_parent(qs.values('user_id'))
+
     data = []
     for profile in qs:
         student_name = " ".join(
@@ -472,17 +532,16 @@ def student_tuition_overview(request):
         tuition = tuition_map.get(grade_key)
 
         total_due = Decimal('0.00')
-        total_paid = Decimal('0.00')
         account_status = 'PENDING'
+        schedule = None
 
         if tuition:
             if payment_mode == 'cash':
                 total_due = Decimal(str(tuition.total_cash or 0))
             elif payment_mode == 'installment':
-                total_due = sum((item['amount'] for item in build_installment_schedule(tuition)), Decimal('0.00'))
+                schedule, total_due = installment_schedule(tuition)
 
-        if profile.user_id:
-            total_paid = tuition_paid_for_parent(profile.user)
+        total_paid = paid_by_parent.get(profile.user_id, Decimal('0.00'))
 
         remaining_balance = total_due - total_paid
         if remaining_balance < 0:
@@ -491,7 +550,7 @@ def student_tuition_overview(request):
         if payment_mode == 'cash':
             account_status = compute_cash_status(total_due, total_paid)
         elif payment_mode == 'installment' and tuition:
-            account_status = compute_installment_status(total_due, total_paid, tuition)
+            account_status = compute_installment_status(total_due, total_paid, tuition, schedule=schedule)
 
         data.append({
             'id': profile.id,
@@ -509,7 +568,19 @@ def student_tuition_overview(request):
             'account_status': account_status,
         })
 
-    return Response(data)
+    if sort_key:
+        data.sort(key=sort_key, reverse=ordering.startswith('-'))
+
+    if not paginate:
+        return Response(data)
+
+    offset = (page - 1) * page_size
+    return Response({
+        'count': len(data),
+        'page': page,
+        'page_size': page_size,
+        'results': data[offset:offset + page_size],
+    })
 
 
 @api_view(['GET'])
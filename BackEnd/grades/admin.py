@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import GradeWeight, GradeItem, StudentScore, ClassStanding, AcademicRecord
+from .models import GradeWeight, GradeItem, StudentScore, ClassStanding, AcademicRecord, QuarterGradeSnapshot
 
 
 @admin.register(GradeWeight)
@@ -132,3 +132,12 @@ class AcademicRecordAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(QuarterGradeSnapshot)
+class QuarterGradeSnapshotAdmin(admin.ModelAdmin):
+    """Read-only view of materialized quarter grades (maintained by grades.signals)."""
+    list_display = ('student', 'subject', 'quarter', 'activity_avg', 'quiz_avg', 'exam_avg', 'class_standing', 'quarter_grade', 'updated_at')
+    list_filter = ('quarter', 'subject')
+    search_fields = ('student__username', 'subject__name')
+    readonly_fields = ('student', 'subject', 'quarter', 'activity_avg', 'quiz_avg', 'exam_avg', 'class_standing', 'quarter_grade', 'updated_at')
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class GradesConfig(AppConfig):
     name = 'grades'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,180 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import Subject, User, UserProfile
+from enrollment.models import Enrollment
+from finance.services import outstanding_balances
+from .models import ReenrollmentEligibility
+from .services import QUARTERS, final_grade_from_quarters, grade_level_label, snapshot_quarter_grades
+
+
+NEXT_GRADE = {
+    "prek": "kinder",
+    "kinder": "grade1",
+    "grade1": "grade2",
+    "grade2": "grade3",
+    "grade3": "grade4",
+    "grade4": "grade5",
+    "grade5": "grade6",
+    "grade6": None,
+}
+
+ELIGIBILITY_FIELDS = (
+    "current_grade", "next_grade", "outstanding_balance",
+    "total_subjects", "incomplete_subjects", "failed_subjects", "passed_subjects",
+    "has_balance", "has_incomplete_grades", "has_failing_grades", "grade6_completed", "eligible",
+)
+
+
+def _grade_code(value):
+    return str(value).strip().lower() if value else None
+
+
+# ══════════════════════════════════════════════════════
+# COMPUTE  —  a fixed number of queries for any number of students
+# ══════════════════════════════════════════════════════
+def current_grades(student_ids):
+    """student id -> grade code from the profile, falling back to the latest enrollment."""
+    grades = {
+        user_id: _grade_code(grade_level)
+        for user_id, grade_level in UserProfile.objects.filter(
+            user_id__in=student_ids,
+        ).exclude(grade_level="").values_list("user_id", "grade_level")
+    }
+    missing = set(student_ids) - set(grades)
+    if missing:
+        latest = (
+            Enrollment.objects.filter(parent_user_id__in=missing)
+            .order_by("parent_user_id", "-created_at", "-id")
+            .values_list("parent_user_id", "grade_level")
+        )
+        for parent_id, grade_level in latest:
+            grades.setdefault(parent_id, _grade_code(grade_level))
+    return grades
+
+
+def compute_eligibility(student_ids):
+    """student id -> ReenrollmentEligibility field values, read from quarter-grade snapshots."""
+    student_ids = set(
+        User.objects.filter(
+            pk__in={int(s) for s in student_ids if s is not None}, role="PARENT_STUDENT",
+        ).values_list("id", flat=True)
+    )
+    if not student_ids:
+        return {}
+
+    grades_by_student = current_grades(student_ids)
+    balances = outstanding_balances(student_ids)
+    subject_ids = list(Subject.objects.values_list("id", flat=True))
+    quarter_grades = snapshot_quarter_grades(student_ids, subject_ids)
+
+    result = {}
+    for student_id in student_ids:
+        incomplete = failed = passed = 0
+        for subject_id in subject_ids:
+            final = final_grade_from_quarters(
+                quarter_grades[(student_id, subject_id, q)]["quarter_grade"] for q in QUARTERS
+            )
+            if final is None:
+                incomplete += 1
+            elif final < 75:
+                failed += 1
+            else:
+                passed += 1
+
+        current_grade = grades_by_student.get(student_id)
+        balance = balances.get(student_id, Decimal("0.00"))
+        flags = {
+            "has_balance": balance > 0,
+            "has_incomplete_grades": incomplete > 0,
+            "has_failing_grades": failed > 0,
+            "grade6_completed": current_grade == "grade6",
+        }
+        result[student_id] = {
+            "current_grade": current_grade,
+            "next_grade": NEXT_GRADE.get(current_grade),
+            "outstanding_balance": balance,
+            "total_subjects": len(subject_ids),
+            "incomplete_subjects": incomplete,
+            "failed_subjects": failed,
+            "passed_subjects": passed,
+            **flags,
+            "eligible": not any(flags.values()),
+        }
+    return result
+
+
+# ══════════════════════════════════════════════════════
+# STORE  —  bulk upsert of the stored rows
+# ══════════════════════════════════════════════════════
+def refresh_eligibility(student_ids):
+    """Recompute and store eligibility for the given students. Returns the number of rows written."""
+    computed = compute_eligibility(student_ids)
+    if not computed:
+        return 0
+
+    with transaction.atomic():
+        existing = {
+            row.student_id: row
+            for row in ReenrollmentEligibility.objects.select_for_update().filter(student_id__in=computed)
+        }
+        to_create, to_update = [], []
+        now = timezone.now()
+        for student_id, values in computed.items():
+            row = existing.get(student_id)
+            if row is None:
+                to_create.append(ReenrollmentEligibility(student_id=student_id, **values))
+                continue
+            for field, value in values.items():
+                setattr(row, field, value)
+            # bulk_update skips auto_now, so stamp it explicitly.
+            row.updated_at = now
+            to_update.append(row)
+
+        if to_update:
+            ReenrollmentEligibility.objects.bulk_update(
+                to_update, [*ELIGIBILITY_FIELDS, "updated_at"], batch_size=500
+            )
+        if to_create:
+            ReenrollmentEligibility.objects.bulk_create(to_create, batch_size=500)
+    return len(computed)
+
+
+def refresh_eligibility_on_commit(student_ids):
+    """
+    Refresh once the surrounding transaction commits (immediately outside one),
+    so cascaded deletes and rolled-back writes never leave rows behind.
+    """
+    student_ids = {int(s) for s in student_ids if s is not None}
+    if student_ids:
+        transaction.on_commit(lambda: refresh_eligibility(student_ids))
+
+
+def invalidate_all_eligibility():
+    """Drop every stored row; they are recomputed on the next request or batch run."""
+    ReenrollmentEligibility.objects.all().delete()
+
+
+def eligibility_for(student):
+    """The stored row for a student, computed and saved on the first request."""
+    row = ReenrollmentEligibility.objects.filter(student=student).first()
+    if row is None:
+        refresh_eligibility([student.pk])
+        row = ReenrollmentEligibility.objects.get(student=student)
+    return row
+
+
+def eligibility_message(row):
+    if row.grade6_completed:
+        return "Congratulations! You already completed Grade 6. No further re-enrollment is needed."
+    if row.has_balance:
+        return f"You still have an outstanding balance of ₱{row.outstanding_balance:,.2f}."
+    if row.has_incomplete_grades:
+        return "You have incomplete grades. Please wait until all subjects have final grades."
+    if row.has_failing_grades:
+        return "You have failing grades. Please coordinate with the school before re-enrollment."
+    if row.next_grade:
+        return f"You are eligible to re-enroll for {grade_level_label(row.next_grade)}."
+    return "You are eligible to re-enroll."
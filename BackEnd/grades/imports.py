@@ -0,0 +1,246 @@
+import codecs
+import csv
+import re
+import zipfile
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from accounts.models import UserProfile
+from enrollment.models import Enrollment
+from .models import GradeItem
+from .services import apply_score_changes
+
+
+# ══════════════════════════════════════════════════════
+# SHEET READER  —  CSV or XLSX, one row at a time
+# ══════════════════════════════════════════════════════
+MAX_ROWS = 2000
+MAX_ITEM_COLUMNS = 100
+
+
+def iter_sheet_rows(upload):
+    """
+    Yield the rows of an uploaded .csv or .xlsx file as lists of cell values.
+    CSV is decoded as it is read; XLSX is opened read-only (first sheet).
+    Raises ValueError for other file types, unreadable files, or when openpyxl is missing.
+    """
+    name = (upload.name or "").lower()
+    if name.endswith(".csv"):
+        upload.seek(0)
+        try:
+            yield from csv.reader(codecs.iterdecode(upload, "utf-8-sig"))
+        except csv.Error as e:
+            raise ValueError(f"Not a valid CSV file ({e})")
+    elif name.endswith(".xlsx"):
+        try:
+            from openpyxl import load_workbook  # optional: pip install openpyxl
+            from openpyxl.utils.exceptions import InvalidFileException
+        except ImportError:
+            raise ValueError("XLSX import needs the 'openpyxl' package; upload a CSV instead")
+        try:
+            workbook = load_workbook(upload, read_only=True, data_only=True)
+        except (zipfile.BadZipFile, InvalidFileException, KeyError, OSError):
+            raise ValueError("Not a valid .xlsx file")
+        try:
+            for row in workbook.worksheets[0].iter_rows(values_only=True):
+                yield list(row)
+        finally:
+            workbook.close()
+    else:
+        raise ValueError("Upload a .csv or .xlsx file")
+
+
+# ══════════════════════════════════════════════════════
+# PLAN  —  map columns to items and rows to students, validate in memory
+# ══════════════════════════════════════════════════════
+IDENTIFIER_HEADERS = {"lrn", "student number", "student_number", "student no", "student no."}
+IGNORED_HEADERS = {"name", "student", "student name", "student_name", "full name"}
+
+# "Quiz 3", "QUIZ: Quiz 3 / 20" — category and total are required for new items.
+ITEM_HEADER_RE = re.compile(
+    r"^(?:(?P<category>activity|quiz|exam)\s*:\s*)?(?P<title>.+?)(?:\s*/\s*(?P<total>\d+))?$",
+    re.IGNORECASE,
+)
+
+
+def _text(value):
+    return "" if value is None else str(value).strip()
+
+
+def _identifier(value):
+    # Spreadsheets turn numeric LRNs into floats (123456789012.0).
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return _text(value).lower()
+
+
+def student_lookup(student_ids):
+    """LRN / student number (lower-cased) -> student id for the given students."""
+    lookup = {}
+    sources = [
+        UserProfile.objects.filter(user_id__in=student_ids).values_list("user_id", "lrn", "student_number"),
+        Enrollment.objects.filter(student_id__in=student_ids).values_list("student_id", "lrn", "student_number"),
+    ]
+    for rows in sources:
+        for student_id, lrn, number in rows:
+            for value in (lrn, number):
+                if value:
+                    lookup.setdefault(_identifier(value), student_id)
+    return lookup
+
+
+class ScoreImportPlan:
+    def __init__(self):
+        self.columns = []  # (column index, GradeItem — unsaved when new)
+        self.cells = []  # (row number, student id, GradeItem, score)
+        self.errors = []  # {row, column, detail}
+        self.rows = 0
+
+    def error(self, detail, row=None, column=None):
+        self.errors.append({"row": row, "column": column, "detail": detail})
+
+    def preview(self):
+        return {
+            "rows": self.rows,
+            "students": len({student_id for _, student_id, _, _ in self.cells}),
+            "cells": len(self.cells),
+            "items": [
+                {
+                    "column": item.title,
+                    "id": item.pk,
+                    "new": item.pk is None,
+                    "category": item.category,
+                    "total_score": item.total_score,
+                }
+                for _, item in self.columns
+            ],
+            "errors": self.errors,
+        }
+
+
+def _item_columns(plan, header, existing_items, subject_id, quarter, grade_level, teacher):
+    """Fill plan.columns from the header row; returns the identifier column index or None."""
+    by_title = {item.title.strip().lower(): item for item in existing_items}
+    identifier_col = None
+    seen = set()
+
+    for col, raw in enumerate(header):
+        label = _text(raw)
+        key = label.lower()
+        if not label or key in IGNORED_HEADERS:
+            continue
+        if key in IDENTIFIER_HEADERS:
+            if identifier_col is None:
+                identifier_col = col
+            continue
+
+        match = ITEM_HEADER_RE.match(label)
+        title = match.group("title").strip()
+        if title.lower() in seen:
+            plan.error(f"Duplicate item column: {title}", row=1, column=label)
+            continue
+        seen.add(title.lower())
+
+        item = by_title.get(title.lower())
+        if item is None:
+            category, total = match.group("category"), match.group("total")
+            if not (category and total):
+                plan.error(
+                    f"No grade item named '{title}'; write new items as 'QUIZ: {title} / 20'",
+                    row=1, column=label,
+                )
+                continue
+            if int(total) <= 0:
+                plan.error("Total score must be positive", row=1, column=label)
+                continue
+            item = GradeItem(
+                teacher=teacher, subject_id=subject_id, grade_level=grade_level, quarter=quarter,
+                category=category.upper(), title=title, total_score=int(total),
+                order=len(existing_items) + len(plan.columns),
+            )
+        plan.columns.append((col, item))
+
+    if len(plan.columns) > MAX_ITEM_COLUMNS:
+        plan.error(f"At most {MAX_ITEM_COLUMNS} item columns per import", row=1)
+    return identifier_col
+
+
+def _score(value, item):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    try:
+        score = Decimal(_text(value))
+    except InvalidOperation:
+        raise ValueError(f"'{_text(value)}' is not a number")
+    if not score.is_finite():
+        raise ValueError(f"'{_text(value)}' is not a number")
+    if score < 0:
+        raise ValueError("Score cannot be negative")
+    if score > item.total_score:
+        raise ValueError(f"Score cannot exceed {item.total_score}")
+    return score.quantize(Decimal("0.01"))
+
+
+def plan_score_import(rows, *, subject_id, quarter, grade_level, student_ids, teacher):
+    """
+    Read the sheet rows and validate every cell without touching the database
+    beyond the item and student lookups. Blank cells are left alone.
+    Returns a ScoreImportPlan; nothing is saved.
+    """
+    plan = ScoreImportPlan()
+    rows = iter(rows)
+    header = next(rows, None)
+    if not header:
+        plan.error("The file is empty")
+        return plan
+
+    existing_items = list(GradeItem.objects.filter(subject_id=subject_id, grade_level=grade_level, quarter=quarter))
+    identifier_col = _item_columns(plan, header, existing_items, subject_id, quarter, grade_level, teacher)
+    if identifier_col is None:
+        plan.error("Add an 'LRN' or 'Student Number' column", row=1)
+    if plan.errors:
+        return plan
+
+    lookup = student_lookup(student_ids)
+    seen_students = {}
+    for row_number, row in enumerate(rows, start=2):
+        if not any(_text(value) for value in row):
+            continue
+        plan.rows += 1
+        if plan.rows > MAX_ROWS:
+            plan.error(f"At most {MAX_ROWS} student rows per import", row=row_number)
+            break
+
+        identifier = _identifier(row[identifier_col]) if identifier_col < len(row) else ""
+        student_id = lookup.get(identifier)
+        if student_id is None:
+            plan.error(f"No student in this section with LRN / student number '{identifier}'", row=row_number)
+            continue
+        if student_id in seen_students:
+            plan.error(f"Student already listed on row {seen_students[student_id]}", row=row_number)
+            continue
+        seen_students[student_id] = row_number
+
+        for col, item in plan.columns:
+            value = row[col] if col < len(row) else None
+            if _text(value) == "":
+                continue
+            try:
+                plan.cells.append((row_number, student_id, item, _score(value, item)))
+            except ValueError as e:
+                plan.error(str(e), row=row_number, column=item.title)
+    return plan
+
+
+def commit_score_import(plan):
+    """Create the new grade items and apply every score in one transaction."""
+    with transaction.atomic():
+        new_items = [item for _, item in plan.columns if item.pk is None]
+        if new_items:
+            GradeItem.objects.bulk_create(new_items)
+        counts = apply_score_changes(
+            (student_id, item, score) for _, student_id, item, score in plan.cells
+        )
+    counts["items_created"] = len(new_items)
+    return counts
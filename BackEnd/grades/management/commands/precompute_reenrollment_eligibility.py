@@ -0,0 +1,39 @@
+"""
+Django management command to precompute ReenrollmentEligibility for every
+student before re-enrollment opens, so the eligibility endpoint only reads.
+"""
+from django.core.management.base import BaseCommand
+
+from accounts.models import User
+from grades.eligibility import refresh_eligibility
+from grades.models import ReenrollmentEligibility
+
+
+class Command(BaseCommand):
+    help = "Precompute re-enrollment eligibility (balance, grade and grade-6 flags) for all students"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=200,
+            help="Number of students computed per batch",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options["chunk_size"])
+        student_ids = list(
+            User.objects.filter(role="PARENT_STUDENT").order_by("id").values_list("id", flat=True)
+        )
+
+        written = 0
+        for start in range(0, len(student_ids), chunk_size):
+            written += refresh_eligibility(student_ids[start:start + chunk_size])
+            self.stdout.write(f"  Processed {min(start + chunk_size, len(student_ids))}/{len(student_ids)} students")
+
+        eligible = ReenrollmentEligibility.objects.filter(eligible=True).count()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Precompute complete. {written} students checked, {eligible} eligible to re-enroll."
+            )
+        )
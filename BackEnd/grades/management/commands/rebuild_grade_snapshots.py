@@ -0,0 +1,31 @@
+"""
+Django management command to rebuild every QuarterGradeSnapshot row from the
+raw scores, class standings and weights.
+"""
+from django.core.management.base import BaseCommand
+
+from grades.services import rebuild_quarter_snapshots
+
+
+class Command(BaseCommand):
+    help = "Rebuild all materialized quarter grades (QuarterGradeSnapshot) from scratch"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=200,
+            help="Number of students computed per batch",
+        )
+
+    def handle(self, *args, **options):
+        deleted, created = rebuild_quarter_snapshots(
+            chunk_size=max(1, options["chunk_size"]),
+            on_progress=lambda done, total: self.stdout.write(f"  Processed {done}/{total} students"),
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuild complete. Removed {deleted} old rows, created {created} snapshots."
+            )
+        )
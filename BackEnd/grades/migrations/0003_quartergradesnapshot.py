@@ -0,0 +1,124 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:00
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+# Frozen copy of grades.services.compute_quarter_grades at the time of this
+# migration, so later changes to the live code cannot alter the backfill.
+DEFAULT_WEIGHTS = {"ACTIVITY": 40, "QUIZ": 20, "EXAM": 20, "CLASS_STANDING": 20}
+
+
+def _round(value):
+    return round(float(value), 2) if value is not None else None
+
+
+def _category_average(earned, possible):
+    if possible == 0:
+        return Decimal("0")
+    return (Decimal(str(earned)) / Decimal(str(possible))) * 100
+
+
+def build_snapshots(apps, schema_editor):
+    GradeWeight = apps.get_model("grades", "GradeWeight")
+    StudentScore = apps.get_model("grades", "StudentScore")
+    ClassStanding = apps.get_model("grades", "ClassStanding")
+    QuarterGradeSnapshot = apps.get_model("grades", "QuarterGradeSnapshot")
+
+    weights = {
+        w.subject_id: {
+            "ACTIVITY": w.activity_weight,
+            "QUIZ": w.quiz_weight,
+            "EXAM": w.exam_weight,
+            "CLASS_STANDING": w.class_standing_weight,
+        }
+        for w in GradeWeight.objects.all()
+    }
+
+    category_avgs = {}
+    score_rows = (
+        StudentScore.objects.values(
+            "student_id", "grade_item__subject_id", "grade_item__quarter", "grade_item__category",
+        )
+        .annotate(earned=Sum("score"), possible=Sum("grade_item__total_score"))
+        .order_by()
+    )
+    for row in score_rows:
+        key = (row["student_id"], row["grade_item__subject_id"], row["grade_item__quarter"])
+        category_avgs.setdefault(key, {})[row["grade_item__category"]] = _category_average(
+            row["earned"] or 0, row["possible"] or 0
+        )
+
+    standings = {
+        (cs.student_id, cs.subject_id, cs.quarter): cs.score
+        for cs in ClassStanding.objects.all()
+    }
+
+    snapshots = []
+    for key in set(category_avgs) | set(standings):
+        student_id, subject_id, quarter = key
+        w = weights.get(subject_id, DEFAULT_WEIGHTS)
+        avgs = category_avgs.get(key, {})
+        cs_score = standings.get(key)
+
+        components = [
+            (avgs[category], w[category])
+            for category in ("ACTIVITY", "QUIZ", "EXAM")
+            if avgs.get(category) is not None
+        ]
+        if cs_score is not None:
+            components.append((Decimal(str(cs_score)), w["CLASS_STANDING"]))
+        total_weight = sum(c[1] for c in components)
+        quarter_grade = (
+            sum(val * wt for val, wt in components) / Decimal(str(total_weight))
+            if components and total_weight > 0 else None
+        )
+
+        values = {
+            "activity_avg": _round(avgs.get("ACTIVITY")),
+            "quiz_avg": _round(avgs.get("QUIZ")),
+            "exam_avg": _round(avgs.get("EXAM")),
+            "class_standing": _round(cs_score),
+            "quarter_grade": _round(quarter_grade),
+        }
+        snapshots.append(QuarterGradeSnapshot(
+            student_id=student_id, subject_id=subject_id, quarter=quarter,
+            **{field: Decimal(str(v)) if v is not None else None for field, v in values.items()},
+        ))
+    QuarterGradeSnapshot.objects.bulk_create(snapshots, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_passwordresetrequest'),
+        ('grades', '0002_academicrecord'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuarterGradeSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quarter', models.IntegerField(choices=[(1, 'Q1'), (2, 'Q2'), (3, 'Q3'), (4, 'Q4')])),
+                ('activity_avg', models.DecimalField(blank=True, decimal_places=2, max_digits=7, null=True)),
+                ('quiz_avg', models.DecimalField(blank=True, decimal_places=2, max_digits=7, null=True)),
+                ('exam_avg', models.DecimalField(blank=True, decimal_places=2, max_digits=7, null=True)),
+                ('class_standing', models.DecimalField(blank=True, decimal_places=2, max_digits=7, null=True)),
+                ('quarter_grade', models.DecimalField(blank=True, decimal_places=2, max_digits=7, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.ForeignKey(limit_choices_to={'role': 'PARENT_STUDENT'}, on_delete=django.db.models.deletion.CASCADE, related_name='quarter_grade_snapshots', to=settings.AUTH_USER_MODEL)),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quarter_grade_snapshots', to='accounts.subject')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['subject', 'quarter'], name='grades_snap_subj_q_idx')],
+                'unique_together': {('student', 'subject', 'quarter')},
+            },
+        ),
+        migrations.RunPython(build_snapshots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grades', '0003_quartergradesnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReenrollmentEligibility',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('current_grade', models.CharField(blank=True, max_length=20, null=True)),
+                ('next_grade', models.CharField(blank=True, max_length=20, null=True)),
+                ('outstanding_balance', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('total_subjects', models.PositiveIntegerField(default=0)),
+                ('incomplete_subjects', models.PositiveIntegerField(default=0)),
+                ('failed_subjects', models.PositiveIntegerField(default=0)),
+                ('passed_subjects', models.PositiveIntegerField(default=0)),
+                ('has_balance', models.BooleanField(default=False)),
+                ('has_incomplete_grades', models.BooleanField(default=False)),
+                ('has_failing_grades', models.BooleanField(default=False)),
+                ('grade6_completed', models.BooleanField(default=False)),
+                ('eligible', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.OneToOneField(limit_choices_to={'role': 'PARENT_STUDENT'}, on_delete=django.db.models.deletion.CASCADE, related_name='reenrollment_eligibility', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
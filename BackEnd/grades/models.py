@@ -71,6 +71,12 @@ class GradeItem(models.Model):
     def __str__(self):
         return f"{self.get_category_display()} — {self.title} (Q{self.quarter}, G{self.grade_level})"
 
+    def delete(self, *args, **kwargs):
+        # Imported here: grades.signals imports this module.
+        from .signals import deleting_grade_item
+        with deleting_grade_item(self.pk):
+            return super().delete(*args, **kwargs)
+
 
 # ═══════════════════════════════════════════════
 # Student Score  (one per student per GradeItem)
@@ -184,3 +190,79 @@ class AcademicRecord(models.Model):
 
     def __str__(self):
         return f"[{self.school_year}] {self.student.username} — {self.subject_name} ({self.final_grade})"
+
+
+# ═══════════════════════════════════════════════
+# Quarter Grade Snapshot  (materialized, kept current by signals)
+# ═══════════════════════════════════════════════
+class QuarterGradeSnapshot(models.Model):
+    """
+    Persisted result of the weighted quarter-grade computation for one
+    student / subject / quarter. Rows are refreshed by grades.signals whenever
+    a score, class standing, grade item or weight changes, and can be rebuilt
+    from scratch with `manage.py rebuild_grade_snapshots`.
+    Cells with no scores and no class standing have no row.
+    """
+    QUARTER_CHOICES = [(1, "Q1"), (2, "Q2"), (3, "Q3"), (4, "Q4")]
+
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="quarter_grade_snapshots",
+        limit_choices_to={"role": "PARENT_STUDENT"},
+    )
+    subject = models.ForeignKey(
+        "accounts.Subject",
+        on_delete=models.CASCADE,
+        related_name="quarter_grade_snapshots",
+    )
+    quarter = models.IntegerField(choices=QUARTER_CHOICES)
+    activity_avg = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
+    quiz_avg = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
+    exam_avg = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
+    class_standing = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
+    quarter_grade = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("student", "subject", "quarter")
+        indexes = [
+            models.Index(fields=["subject", "quarter"], name="grades_snap_subj_q_idx"),
+        ]
+
+    def __str__(self):
+        return f"Snapshot: {self.student.username} Q{self.quarter} {self.subject}: {self.quarter_grade}"
+
+
+# ═══════════════════════════════════════════════
+# Re-enrollment Eligibility  (precomputed, kept current by signals)
+# ═══════════════════════════════════════════════
+class ReenrollmentEligibility(models.Model):
+    """
+    Stored re-enrollment check for one student: outstanding balance, subject
+    counts and the flags derived from them. Refreshed by grades.signals when a
+    quarter grade, transaction or profile changes, and precomputed for the whole
+    school with `manage.py precompute_reenrollment_eligibility`.
+    """
+    student = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="reenrollment_eligibility",
+        limit_choices_to={"role": "PARENT_STUDENT"},
+    )
+    current_grade = models.CharField(max_length=20, null=True, blank=True)
+    next_grade = models.CharField(max_length=20, null=True, blank=True)
+    outstanding_balance = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    total_subjects = models.PositiveIntegerField(default=0)
+    incomplete_subjects = models.PositiveIntegerField(default=0)
+    failed_subjects = models.PositiveIntegerField(default=0)
+    passed_subjects = models.PositiveIntegerField(default=0)
+    has_balance = models.BooleanField(default=False)
+    has_incomplete_grades = models.BooleanField(default=False)
+    has_failing_grades = models.BooleanField(default=False)
+    grade6_completed = models.BooleanField(default=False)
+    eligible = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Eligibility: {self.student.username} ({'eligible' if self.eligible else 'not eligible'})"
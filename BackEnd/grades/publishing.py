@@ -0,0 +1,191 @@
+import secrets
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from accounts.models import Section, Subject, User
+from classmanagement.models import Schedule
+from enrollment.models import Enrollment
+from jobs.services import report_progress
+from .models import AcademicRecord, QuarterGradeSnapshot
+from .services import QUARTERS, compute_quarter_grades, normalize_grade_level, overall_record
+
+
+PREVIEW_CACHE_PREFIX = "grades:publish-preview:"
+PREVIEW_CACHE_TTL = 15 * 60
+PUBLISH_ALL_TASK = "grades.publishing.publish_school_history"
+
+
+# ══════════════════════════════════════════════════════
+# PREVIEW  —  one batch computation for every subject of a section
+# ══════════════════════════════════════════════════════
+def active_enrollments(section_id):
+    return list(
+        Enrollment.objects.filter(section_id=section_id, status="ACTIVE", student__isnull=False)
+        .select_related("student")
+    )
+
+
+def preview_rows(enrollments, subject_ids):
+    """{subject_id: [preview row per student]} from a single compute_quarter_grades() call."""
+    subject_ids = list(subject_ids)
+    grades = compute_quarter_grades([e.student_id for e in enrollments], subject_ids)
+    rows = {subject_id: [] for subject_id in subject_ids}
+    for enrollment in enrollments:
+        student = enrollment.student
+        name = f"{enrollment.first_name or ''} {enrollment.last_name or ''}".strip() or student.username
+        for subject_id in subject_ids:
+            scores_by_q = [grades[(student.id, subject_id, q)]["quarter_grade"] for q in QUARTERS]
+            final_grade, remarks = overall_record(scores_by_q)
+            rows[subject_id].append({
+                "student_id": student.id,
+                "student_name": name,
+                "grade_level": enrollment.grade_level,
+                "q1": scores_by_q[0],
+                "q2": scores_by_q[1],
+                "q3": scores_by_q[2],
+                "q4": scores_by_q[3],
+                "final_grade": final_grade,
+                "remarks": remarks,
+                "complete": all(score is not None for score in scores_by_q),
+            })
+    return rows
+
+
+def grades_fingerprint(student_ids, subject_id):
+    """
+    Changes whenever a quarter grade of these students in this subject changes:
+    snapshot rows are only written when their values change.
+    """
+    agg = QuarterGradeSnapshot.objects.filter(
+        student_id__in=student_ids, subject_id=subject_id,
+    ).aggregate(count=Count("id"), latest=Max("updated_at"))
+    latest = agg["latest"].isoformat() if agg["latest"] else None
+    return [sorted(student_ids), agg["count"], latest]
+
+
+def save_preview(rows, fingerprint, **scope):
+    """Cache a preview so the publish that follows can reuse it. Returns the token."""
+    token = secrets.token_urlsafe(16)
+    cache.set(
+        PREVIEW_CACHE_PREFIX + token,
+        {"scope": scope, "rows": rows, "fingerprint": fingerprint},
+        PREVIEW_CACHE_TTL,
+    )
+    return token
+
+
+def cached_preview_rows(token, fingerprint, **scope):
+    """The cached rows for `token`, or None if missing, for another scope, or stale."""
+    if not token:
+        return None
+    entry = cache.get(PREVIEW_CACHE_PREFIX + str(token))
+    if not entry or entry["scope"] != scope or entry["fingerprint"] != fingerprint:
+        return None
+    return entry["rows"]
+
+
+# ══════════════════════════════════════════════════════
+# PUBLISH  —  bulk write of academic records
+# ══════════════════════════════════════════════════════
+def publish_records(rows, *, school_year, subject, section, recorded_by):
+    """
+    Create or update one AcademicRecord per preview row with one lookup and a
+    bulk_update / bulk_create. Returns (published, updated).
+    """
+    existing = {
+        record.student_id: record
+        for record in AcademicRecord.objects.filter(
+            school_year=school_year,
+            subject_name=subject.name,
+            student_id__in=[row["student_id"] for row in rows],
+        )
+    }
+    now = timezone.now()
+    to_create, to_update = [], []
+    for row in rows:
+        grade_level = normalize_grade_level(
+            section.grade_level if section.grade_level is not None else row.get("grade_level")
+        )
+        values = {
+            "section_name": section.name or "",
+            "subject_code": subject.code,
+            "grade_level": grade_level if grade_level is not None else 0,
+            "q1": row["q1"],
+            "q2": row["q2"],
+            "q3": row["q3"],
+            "q4": row["q4"],
+            "final_grade": row["final_grade"],
+            "remarks": row["remarks"],
+            "teacher_name": recorded_by.username if recorded_by else "",
+            "recorded_by": recorded_by,
+        }
+        record = existing.get(row["student_id"])
+        if record is None:
+            to_create.append(AcademicRecord(
+                student_id=row["student_id"], school_year=school_year, subject_name=subject.name, **values
+            ))
+        else:
+            for field, value in values.items():
+                setattr(record, field, value)
+            # bulk_update skips auto_now, so stamp it explicitly.
+            record.updated_at = now
+            to_update.append(record)
+
+    with transaction.atomic():
+        if to_update:
+            AcademicRecord.objects.bulk_update(to_update, [*values, "updated_at"], batch_size=500)
+        if to_create:
+            AcademicRecord.objects.bulk_create(to_create, batch_size=500)
+    return len(to_create), len(to_update)
+
+
+def publish_school_history(school_year, recorded_by_id):
+    """
+    Background job: publish every scheduled subject of every section.
+    A section/subject pair with incomplete quarter grades is skipped and listed
+    in the progress report; everything else is written. Safe to re-run.
+    """
+    recorded_by = User.objects.filter(pk=recorded_by_id).first()
+    subjects_by_section = defaultdict(set)
+    for section_id, subject_id in (
+        Schedule.objects.filter(subject__isnull=False)
+        .values_list("section_id", "subject_id").distinct()
+    ):
+        subjects_by_section[section_id].add(subject_id)
+
+    sections = Section.objects.in_bulk(list(subjects_by_section))
+    subjects = Subject.objects.in_bulk({s for ids in subjects_by_section.values() for s in ids})
+    progress = {
+        "school_year": school_year,
+        "sections_total": len(sections),
+        "sections_done": 0,
+        "published": 0,
+        "updated": 0,
+        "skipped": [],
+    }
+    report_progress(**progress)
+
+    for section_id in sorted(sections):
+        section = sections[section_id]
+        enrollments = active_enrollments(section_id)
+        if enrollments:
+            for subject_id, rows in preview_rows(enrollments, sorted(subjects_by_section[section_id])).items():
+                subject = subjects[subject_id]
+                incomplete = sum(1 for row in rows if not row["complete"])
+                if incomplete:
+                    progress["skipped"].append(
+                        {"section": section.name, "subject": subject.name, "incomplete": incomplete}
+                    )
+                    continue
+                published, updated = publish_records(
+                    rows, school_year=school_year, subject=subject, section=section, recorded_by=recorded_by,
+                )
+                progress["published"] += published
+                progress["updated"] += updated
+        progress["sections_done"] += 1
+        report_progress(**progress)
+    return progress
@@ -54,6 +54,14 @@ class StudentScoreSerializer(serializers.ModelSerializer):
             return obj.student.username
 
 
+# ─── Gradebook cell change (bulk endpoint) ───
+class ScoreChangeSerializer(serializers.Serializer):
+    student = serializers.IntegerField()
+    grade_item = serializers.IntegerField()
+    # null clears the cell
+    score = serializers.DecimalField(max_digits=6, decimal_places=2, min_value=0, allow_null=True)
+
+
 # ─── Class Standing ───
 class ClassStandingSerializer(serializers.ModelSerializer):
     student_name = serializers.SerializerMethodField()
@@ -0,0 +1,444 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from accounts.models import Subject
+from .models import GradeWeight, StudentScore, ClassStanding, QuarterGradeSnapshot
+
+
+QUARTERS = (1, 2, 3, 4)
+
+SNAPSHOT_FIELDS = ("activity_avg", "quiz_avg", "exam_avg", "class_standing", "quarter_grade")
+
+DEFAULT_WEIGHTS = {
+    "ACTIVITY": 40,
+    "QUIZ": 20,
+    "EXAM": 20,
+    "CLASS_STANDING": 20,
+}
+
+
+def normalize_grade_level(value):
+    if value is None:
+        return None
+
+    normalized = str(value).strip().lower()
+
+    grade_map = {
+        "prek": -1,
+        "pre-kinder": -1,
+        "kinder": 0,
+        "grade1": 1,
+        "grade2": 2,
+        "grade3": 3,
+        "grade4": 4,
+        "grade5": 5,
+        "grade6": 6,
+        "grade 1": 1,
+        "grade 2": 2,
+        "grade 3": 3,
+        "grade 4": 4,
+        "grade 5": 5,
+        "grade 6": 6,
+        "0": 0,
+        "1": 1,
+        "2": 2,
+        "3": 3,
+        "4": 4,
+        "5": 5,
+        "6": 6,
+    }
+
+    if normalized in grade_map:
+        return grade_map[normalized]
+
+    try:
+        return int(normalized)
+    except (ValueError, TypeError):
+        return None
+
+
+def grade_level_label(value):
+    normalized = normalize_grade_level(value)
+    if normalized == -1:
+        return "Pre-Kinder"
+    if normalized == 0:
+        return "Kinder"
+    if normalized is not None and normalized > 0:
+        return f"Grade {normalized}"
+    return str(value or "—")
+
+
+def _empty_quarter_grade():
+    return {
+        "activity_avg": None,
+        "quiz_avg": None,
+        "exam_avg": None,
+        "class_standing": None,
+        "quarter_grade": None,
+    }
+
+
+def _round(value):
+    return round(float(value), 2) if value is not None else None
+
+
+def _category_average(earned, possible):
+    if possible == 0:
+        return Decimal("0")
+    return (Decimal(str(earned)) / Decimal(str(possible))) * 100
+
+
+def _weighted_total(components):
+    if not components:
+        return None
+    total_weight = sum(c[1] for c in components)
+    if total_weight <= 0:
+        return None
+    return sum(val * wt for val, wt in components) / Decimal(str(total_weight)) * 100 / 100
+
+
+def compute_quarter_grades(student_ids, subject_ids, quarters=QUARTERS):
+    """
+    Batch version of the weighted quarter-grade computation.
+
+    Computes every (student, subject, quarter) cell of the given sets with three
+    queries in total (weights, aggregated scores, class standings) instead of
+    ~10 queries per cell.
+
+    Returns { (student_id, subject_id, quarter): {activity_avg, quiz_avg,
+    exam_avg, class_standing, quarter_grade} } with an entry for every cell,
+    using the same rounding as the per-student computation.
+    """
+    student_ids = {int(s) for s in student_ids if s is not None}
+    subject_ids = {int(s) for s in subject_ids if s is not None}
+    quarters = {int(q) for q in quarters}
+
+    result = {
+        (stu, subj, q): _empty_quarter_grade()
+        for stu in student_ids
+        for subj in subject_ids
+        for q in quarters
+    }
+    if not result:
+        return result
+
+    weights = {
+        w.subject_id: {
+            "ACTIVITY": w.activity_weight,
+            "QUIZ": w.quiz_weight,
+            "EXAM": w.exam_weight,
+            "CLASS_STANDING": w.class_standing_weight,
+        }
+        for w in GradeWeight.objects.filter(subject_id__in=subject_ids)
+    }
+
+    # A category only contributes when the student has at least one score in it,
+    # so grouping the student's scores is enough — no separate item lookup needed.
+    category_avgs = {}
+    score_rows = (
+        StudentScore.objects.filter(
+            student_id__in=student_ids,
+            grade_item__subject_id__in=subject_ids,
+            grade_item__quarter__in=quarters,
+        )
+        .values(
+            "student_id",
+            "grade_item__subject_id",
+            "grade_item__quarter",
+            "grade_item__category",
+        )
+        .annotate(earned=Sum("score"), possible=Sum("grade_item__total_score"))
+        .order_by()
+    )
+    for row in score_rows:
+        key = (row["student_id"], row["grade_item__subject_id"], row["grade_item__quarter"])
+        category_avgs.setdefault(key, {})[row["grade_item__category"]] = _category_average(
+            row["earned"] or 0, row["possible"] or 0
+        )
+
+    standings = {
+        (cs.student_id, cs.subject_id, cs.quarter): cs.score
+        for cs in ClassStanding.objects.filter(
+            student_id__in=student_ids,
+            subject_id__in=subject_ids,
+            quarter__in=quarters,
+        ).only("student_id", "subject_id", "quarter", "score")
+    }
+
+    for key in set(category_avgs) | set(standings):
+        if key not in result:
+            continue
+        _, subject_id, _ = key
+        w = weights.get(subject_id, DEFAULT_WEIGHTS)
+        avgs = category_avgs.get(key, {})
+        act_avg = avgs.get("ACTIVITY")
+        quiz_avg = avgs.get("QUIZ")
+        exam_avg = avgs.get("EXAM")
+        cs_score = standings.get(key)
+
+        components = []
+        if act_avg is not None:
+            components.append((act_avg, w["ACTIVITY"]))
+        if quiz_avg is not None:
+            components.append((quiz_avg, w["QUIZ"]))
+        if exam_avg is not None:
+            components.append((exam_avg, w["EXAM"]))
+        if cs_score is not None:
+            components.append((Decimal(str(cs_score)), w["CLASS_STANDING"]))
+
+        result[key] = {
+            "activity_avg": _round(act_avg),
+            "quiz_avg": _round(quiz_avg),
+            "exam_avg": _round(exam_avg),
+            "class_standing": _round(cs_score),
+            "quarter_grade": _round(_weighted_total(components)),
+        }
+
+    return result
+
+
+def final_grade_from_quarters(quarter_grades):
+    """Average of the available quarter grades, or None when nothing is graded yet."""
+    parts = [g for g in quarter_grades if g is not None]
+    return round(sum(parts) / len(parts), 2) if parts else None
+
+
+def overall_record(quarter_grades):
+    """(final grade, remarks) for an academic record; INCOMPLETE when nothing is graded."""
+    valid_scores = [q for q in quarter_grades if q is not None]
+    if not valid_scores:
+        return None, "INCOMPLETE"
+    final_grade = round(sum(valid_scores) / len(valid_scores), 2)
+    if final_grade >= 75:
+        return final_grade, "PASSED"
+    return final_grade, "FAILED"
+
+
+# ══════════════════════════════════════════════════════
+# SNAPSHOTS  —  materialized quarter grades
+# ══════════════════════════════════════════════════════
+def snapshot_values(data):
+    """
+    Model field values for a computed quarter-grade dict,
+    or None when the cell has nothing graded and should have no row.
+    """
+    if all(data[field] is None for field in SNAPSHOT_FIELDS):
+        return None
+    return {
+        field: Decimal(str(data[field])) if data[field] is not None else None
+        for field in SNAPSHOT_FIELDS
+    }
+
+
+def refresh_quarter_snapshots(cells):
+    """
+    Recompute and persist the snapshot rows for the given
+    (student_id, subject_id, quarter) cells only.
+    Empty cells lose their row; everything else is created or updated in bulk.
+    Students whose rows changed get their re-enrollment eligibility refreshed.
+    """
+    cells = {(int(stu), int(subj), int(q)) for stu, subj, q in cells}
+    if not cells:
+        return
+
+    grades = compute_quarter_grades(
+        {c[0] for c in cells}, {c[1] for c in cells}, {c[2] for c in cells}
+    )
+
+    with transaction.atomic():
+        existing = {
+            (snap.student_id, snap.subject_id, snap.quarter): snap
+            for snap in QuarterGradeSnapshot.objects.select_for_update().filter(
+                student_id__in={c[0] for c in cells},
+                subject_id__in={c[1] for c in cells},
+                quarter__in={c[2] for c in cells},
+            )
+        }
+
+        to_create, to_update, to_delete = [], [], []
+        for cell in cells:
+            values = snapshot_values(grades[cell])
+            snap = existing.get(cell)
+            if values is None:
+                if snap is not None:
+                    to_delete.append(snap)
+                continue
+            if snap is None:
+                to_create.append(QuarterGradeSnapshot(
+                    student_id=cell[0], subject_id=cell[1], quarter=cell[2], **values
+                ))
+            elif any(getattr(snap, f) != v for f, v in values.items()):
+                for field, value in values.items():
+                    setattr(snap, field, value)
+                to_update.append(snap)
+
+        if to_delete:
+            QuarterGradeSnapshot.objects.filter(pk__in=[snap.pk for snap in to_delete]).delete()
+        if to_update:
+            # bulk_update skips auto_now, so stamp it explicitly.
+            now = timezone.now()
+            for snap in to_update:
+                snap.updated_at = now
+            QuarterGradeSnapshot.objects.bulk_update(to_update, [*SNAPSHOT_FIELDS, "updated_at"])
+        if to_create:
+            QuarterGradeSnapshot.objects.bulk_create(to_create)
+
+    changed_students = {snap.student_id for snap in (*to_delete, *to_update, *to_create)}
+    if changed_students:
+        # Imported here: grades.eligibility builds on this module.
+        from .eligibility import refresh_eligibility_on_commit
+        refresh_eligibility_on_commit(changed_students)
+
+
+def rebuild_quarter_snapshots(chunk_size=200, on_progress=None):
+    """
+    Replace every snapshot row with one computed from the raw scores, class
+    standings and weights, `chunk_size` students at a time. For writes that
+    bypass the grade signals (imports, repairs). Stored re-enrollment
+    eligibility is dropped with the old rows and recomputed on demand.
+    `on_progress(done, total)` is called after each chunk.
+    Returns (rows removed, rows created).
+    """
+    from .eligibility import invalidate_all_eligibility
+    subject_ids = list(Subject.objects.values_list("id", flat=True))
+    student_ids = sorted(
+        set(StudentScore.objects.values_list("student_id", flat=True).distinct())
+        | set(ClassStanding.objects.values_list("student_id", flat=True).distinct())
+    )
+
+    created = 0
+    with transaction.atomic():
+        deleted, _ = QuarterGradeSnapshot.objects.all().delete()
+        for start in range(0, len(student_ids), chunk_size):
+            chunk = student_ids[start:start + chunk_size]
+            rows = []
+            for (stu, subj, q), data in compute_quarter_grades(chunk, subject_ids, QUARTERS).items():
+                values = snapshot_values(data)
+                if values is not None:
+                    rows.append(QuarterGradeSnapshot(student_id=stu, subject_id=subj, quarter=q, **values))
+            QuarterGradeSnapshot.objects.bulk_create(rows, batch_size=500)
+            created += len(rows)
+            if on_progress:
+                on_progress(min(start + chunk_size, len(student_ids)), len(student_ids))
+        invalidate_all_eligibility()
+    return deleted, created
+
+
+def graded_cells_for_subject(subject_id, quarter=None):
+    """Every (student, subject, quarter) cell that has a score or class standing for a subject."""
+    scores = StudentScore.objects.filter(grade_item__subject_id=subject_id)
+    standings = ClassStanding.objects.filter(subject_id=subject_id)
+    if quarter is not None:
+        scores = scores.filter(grade_item__quarter=quarter)
+        standings = standings.filter(quarter=quarter)
+    cells = {
+        (stu, subject_id, q)
+        for stu, q in scores.values_list("student_id", "grade_item__quarter").distinct()
+    }
+    cells.update(
+        (stu, subject_id, q) for stu, q in standings.values_list("student_id", "quarter")
+    )
+    # Include existing rows so cells that just became empty get cleared.
+    snaps = QuarterGradeSnapshot.objects.filter(subject_id=subject_id)
+    if quarter is not None:
+        snaps = snaps.filter(quarter=quarter)
+    cells.update(
+        (stu, subject_id, q) for stu, q in snaps.values_list("student_id", "quarter")
+    )
+    return cells
+
+
+def snapshot_quarter_grades(student_ids, subject_ids, quarters=QUARTERS):
+    """
+    Read materialized quarter grades in one indexed query.
+    Same return shape as compute_quarter_grades().
+    """
+    student_ids = {int(s) for s in student_ids if s is not None}
+    subject_ids = {int(s) for s in subject_ids if s is not None}
+    quarters = {int(q) for q in quarters}
+
+    result = {
+        (stu, subj, q): _empty_quarter_grade()
+        for stu in student_ids
+        for subj in subject_ids
+        for q in quarters
+    }
+    if not result:
+        return result
+
+    rows = QuarterGradeSnapshot.objects.filter(
+        student_id__in=student_ids,
+        subject_id__in=subject_ids,
+        quarter__in=quarters,
+    ).values("student_id", "subject_id", "quarter", *SNAPSHOT_FIELDS)
+    for row in rows:
+        key = (row["student_id"], row["subject_id"], row["quarter"])
+        result[key] = {field: _round(row[field]) for field in SNAPSHOT_FIELDS}
+    return result
+
+
+# ══════════════════════════════════════════════════════
+# GRADEBOOK  —  bulk score changes
+# ══════════════════════════════════════════════════════
+def apply_score_changes(changes):
+    """
+    Apply a gradebook diff in one transaction.
+
+    `changes` is an iterable of (student_id, grade_item, score) where grade_item
+    is a GradeItem and score a Decimal, or None to clear the cell. New cells are
+    bulk-created, changed ones bulk-updated and cleared ones raw-deleted. None of
+    these send the StudentScore signals, so the touched snapshot cells are
+    refreshed here, once. Returns counts of created / updated / deleted / unchanged.
+    """
+    # Later entries for the same cell win.
+    wanted = {(int(student_id), item.pk): (item, score) for student_id, item, score in changes}
+    counts = {"created": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    if not wanted:
+        return counts
+
+    with transaction.atomic():
+        existing = {
+            (s.student_id, s.grade_item_id): s
+            for s in StudentScore.objects.select_for_update().filter(
+                student_id__in={key[0] for key in wanted},
+                grade_item_id__in={key[1] for key in wanted},
+            )
+        }
+
+        to_create, to_update, to_delete = [], [], []
+        cells = set()
+        now = timezone.now()
+        for (student_id, item_id), (item, score) in wanted.items():
+            current = existing.get((student_id, item_id))
+            if score is None:
+                if current is None:
+                    counts["unchanged"] += 1
+                    continue
+                to_delete.append(current.pk)
+            elif current is None:
+                to_create.append(StudentScore(student_id=student_id, grade_item_id=item_id, score=score))
+            elif current.score != score:
+                current.score = score
+                # bulk_update skips auto_now, so stamp it explicitly.
+                current.updated_at = now
+                to_update.append(current)
+            else:
+                counts["unchanged"] += 1
+                continue
+            cells.add((student_id, item.subject_id, item.quarter))
+
+        if to_delete:
+            # Nothing references a score, so skip the collector and its per-row
+            # post_delete signals; the cells are refreshed once below.
+            StudentScore.objects.filter(pk__in=to_delete)._raw_delete(StudentScore.objects.db)
+        if to_update:
+            StudentScore.objects.bulk_update(to_update, ["score", "updated_at"], batch_size=500)
+        if to_create:
+            StudentScore.objects.bulk_create(to_create, batch_size=500)
+        refresh_quarter_snapshots(cells)
+
+    counts.update(created=len(to_create), updated=len(to_update), deleted=len(to_delete))
+    return counts
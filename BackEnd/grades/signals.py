@@ -0,0 +1,146 @@
+"""
+Keep QuarterGradeSnapshot and ReenrollmentEligibility rows current.
+Every receiver works out which (student, subject, quarter) cells the change
+touches and refreshes only those; eligibility follows the snapshots, and is
+also refreshed on ledger and profile changes.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from accounts.models import Subject, UserProfile
+from enrollment.models import Enrollment
+from finance.models import Transaction
+from .eligibility import invalidate_all_eligibility, refresh_eligibility_on_commit
+from .models import GradeWeight, GradeItem, StudentScore, ClassStanding
+from .services import graded_cells_for_subject, refresh_quarter_snapshots
+
+
+# Grade items this thread is deleting through GradeItem.delete(); their cascaded
+# scores are refreshed once by the item's post_delete instead of one at a time.
+_deleting = threading.local()
+
+
+@contextmanager
+def deleting_grade_item(item_id):
+    """Skip per-score refreshes for the item's cascade; cleared even when the DELETE fails."""
+    item_ids = _deleting.__dict__.setdefault("item_ids", set())
+    item_ids.add(item_id)
+    try:
+        yield
+    finally:
+        item_ids.discard(item_id)
+
+
+# ─── Student Score ───
+def _score_cell(score):
+    if score.grade_item_id in getattr(_deleting, "item_ids", ()):
+        return None
+    item = (
+        GradeItem.objects.filter(pk=score.grade_item_id)
+        .values("subject_id", "quarter")
+        .first()
+    )
+    if item is None:
+        return None
+    return (score.student_id, item["subject_id"], item["quarter"])
+
+
+@receiver(post_save, sender=StudentScore)
+@receiver(post_delete, sender=StudentScore)
+def refresh_snapshot_for_score(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    cell = _score_cell(instance)
+    if cell:
+        refresh_quarter_snapshots([cell])
+
+
+# ─── Class Standing ───
+@receiver(post_save, sender=ClassStanding)
+@receiver(post_delete, sender=ClassStanding)
+def refresh_snapshot_for_class_standing(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    refresh_quarter_snapshots([(instance.student_id, instance.subject_id, instance.quarter)])
+
+
+# ─── Grade Item ───
+@receiver(pre_save, sender=GradeItem)
+def remember_previous_grade_item_cell(sender, instance, raw=False, **kwargs):
+    instance._previous_cell = None
+    if raw or not instance.pk:
+        return
+    instance._previous_cell = (
+        GradeItem.objects.filter(pk=instance.pk).values_list("subject_id", "quarter").first()
+    )
+
+
+@receiver(post_save, sender=GradeItem)
+def refresh_snapshots_for_grade_item(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        # A brand-new item has no scores yet.
+        return
+    student_ids = list(instance.scores.values_list("student_id", flat=True))
+    cells = {(stu, instance.subject_id, instance.quarter) for stu in student_ids}
+    previous = getattr(instance, "_previous_cell", None)
+    if previous and previous != (instance.subject_id, instance.quarter):
+        cells.update((stu, previous[0], previous[1]) for stu in student_ids)
+    refresh_quarter_snapshots(cells)
+
+
+@receiver(pre_delete, sender=GradeItem)
+def remember_grade_item_students(sender, instance, **kwargs):
+    instance._scored_student_ids = list(instance.scores.values_list("student_id", flat=True))
+
+
+@receiver(post_delete, sender=GradeItem)
+def refresh_snapshots_for_deleted_grade_item(sender, instance, **kwargs):
+    student_ids = getattr(instance, "_scored_student_ids", [])
+    refresh_quarter_snapshots(
+        (stu, instance.subject_id, instance.quarter) for stu in student_ids
+    )
+
+
+# ─── Grade Weight ───
+@receiver(post_save, sender=GradeWeight)
+@receiver(post_delete, sender=GradeWeight)
+def refresh_snapshots_for_weight(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    refresh_quarter_snapshots(graded_cells_for_subject(instance.subject_id))
+
+
+# ─── Re-enrollment eligibility ───
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def refresh_eligibility_for_transaction(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    refresh_eligibility_on_commit([instance.parent_id])
+
+
+@receiver(post_save, sender=UserProfile)
+def refresh_eligibility_for_profile(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    refresh_eligibility_on_commit([instance.user_id])
+
+
+@receiver(post_save, sender=Enrollment)
+def refresh_eligibility_for_enrollment(sender, instance, raw=False, **kwargs):
+    # The latest enrollment's grade level is the fallback when the profile has none.
+    if raw:
+        return
+    refresh_eligibility_on_commit([instance.parent_user_id])
+
+
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def invalidate_eligibility_for_subject(sender, instance, raw=False, created=True, **kwargs):
+    # Every student's subject count changes; a renamed subject changes nothing.
+    if raw or not created:
+        return
+    invalidate_all_eligibility()
@@ -1,3 +1,531 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.db.models.signals import post_delete
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import User, Section, Subject, UserProfile
+from classmanagement.models import Schedule
+from enrollment.models import Enrollment
+from finance.models import Transaction
+from jobs.models import Job
+from .models import (
+    AcademicRecord, GradeWeight, GradeItem, StudentScore, ClassStanding, QuarterGradeSnapshot,
+    ReenrollmentEligibility,
+)
+from .services import QUARTERS, compute_quarter_grades, refresh_quarter_snapshots, snapshot_quarter_grades
+
+
+class QuarterGradeEngineTest(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(
+            username="teacher1", email="teacher1@test.com", password="testpass123", role="TEACHER"
+        )
+        self.math = Subject.objects.create(name="Math", code="MATH")
+        self.science = Subject.objects.create(name="Science", code="SCI")
+        GradeWeight.objects.create(
+            subject=self.math, activity_weight=50, quiz_weight=20, exam_weight=20, class_standing_weight=10
+        )
+        self.students = [
+            User.objects.create_user(
+                username=f"student{i}", email=f"student{i}@test.com", password="testpass123"
+            )
+            for i in range(3)
+        ]
+
+    def _item(self, subject, category, total, quarter=1):
+        return GradeItem.objects.create(
+            teacher=self.teacher, subject=subject, grade_level=1,
+            quarter=quarter, category=category, title=category, total_score=total,
+        )
+
+    def test_weighted_grade_and_missing_categories(self):
+        act = self._item(self.math, "ACTIVITY", 50)
+        quiz = self._item(self.math, "QUIZ", 20)
+        s0, s1, s2 = self.students
+        StudentScore.objects.create(student=s0, grade_item=act, score=Decimal("40"))
+        StudentScore.objects.create(student=s0, grade_item=quiz, score=Decimal("10"))
+        ClassStanding.objects.create(student=s0, subject=self.math, quarter=1, score=Decimal("90"))
+        StudentScore.objects.create(student=s1, grade_item=act, score=Decimal("25"))
+
+        grades = compute_quarter_grades([s.id for s in self.students], [self.math.id, self.science.id])
+
+        self.assertEqual(grades[(s0.id, self.math.id, 1)], {
+            "activity_avg": 80.0,
+            "quiz_avg": 50.0,
+            "exam_avg": None,
+            "class_standing": 90.0,
+            # (80*50 + 50*20 + 90*10) / 80
+            "quarter_grade": 73.75,
+        })
+        self.assertEqual(grades[(s1.id, self.math.id, 1)]["quarter_grade"], 50.0)
+        self.assertIsNone(grades[(s2.id, self.math.id, 1)]["quarter_grade"])
+        self.assertIsNone(grades[(s0.id, self.math.id, 2)]["quarter_grade"])
+        self.assertIsNone(grades[(s0.id, self.science.id, 1)]["quarter_grade"])
+
+    def test_query_count_does_not_grow_with_roster(self):
+        act = self._item(self.math, "ACTIVITY", 10)
+        for student in self.students:
+            StudentScore.objects.create(student=student, grade_item=act, score=Decimal("7"))
+
+        with self.assertNumQueries(3):
+            grades = compute_quarter_grades([s.id for s in self.students], [self.math.id, self.science.id])
+        self.assertEqual(len(grades), 3 * 2 * 4)
+        self.assertEqual(grades[(self.students[2].id, self.math.id, 1)]["quarter_grade"], 70.0)
+
+
+class QuarterGradeSnapshotTest(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(
+            username="teacher1", email="teacher1@test.com", password="testpass123", role="TEACHER"
+        )
+        self.student = User.objects.create_user(
+            username="student1", email="student1@test.com", password="testpass123"
+        )
+        self.subject = Subject.objects.create(name="Math", code="MATH")
+        self.item = GradeItem.objects.create(
+            teacher=self.teacher, subject=self.subject, grade_level=1,
+            quarter=1, category="QUIZ", title="Quiz 1", total_score=20,
+        )
+
+    def _snapshot(self):
+        return snapshot_quarter_grades([self.student.id], [self.subject.id], [1])[
+            (self.student.id, self.subject.id, 1)
+        ]
+
+    def _live(self):
+        return compute_quarter_grades([self.student.id], [self.subject.id], [1])[
+            (self.student.id, self.subject.id, 1)
+        ]
+
+    def test_signals_keep_snapshot_in_sync(self):
+        score = StudentScore.objects.create(student=self.student, grade_item=self.item, score=Decimal("15"))
+        self.assertEqual(self._snapshot()["quiz_avg"], 75.0)
+
+        ClassStanding.objects.create(student=self.student, subject=self.subject, quarter=1, score=Decimal("95"))
+        self.assertEqual(self._snapshot(), self._live())
+
+        self.item.total_score = 30
+        self.item.save()
+        self.assertEqual(self._snapshot()["quiz_avg"], 50.0)
+
+        GradeWeight.objects.create(subject=self.subject, quiz_weight=30, class_standing_weight=10)
+        self.assertEqual(self._snapshot(), self._live())
+
+        self.item.quarter = 2
+        self.item.save()
+        self.assertIsNone(self._snapshot()["quiz_avg"])
+
+        score.delete()
+        ClassStanding.objects.all().delete()
+        self.assertFalse(QuarterGradeSnapshot.objects.exists())
+
+    def test_failed_item_delete_does_not_mute_score_refreshes(self):
+        score = StudentScore.objects.create(student=self.student, grade_item=self.item, score=Decimal("10"))
+
+        def fail(sender, **kwargs):
+            raise DatabaseError("disk I/O error")
+
+        post_delete.connect(fail, sender=StudentScore)
+        self.addCleanup(post_delete.disconnect, fail, sender=StudentScore)
+        with self.assertRaises(DatabaseError), transaction.atomic():
+            self.item.delete()
+        post_delete.disconnect(fail, sender=StudentScore)
+
+        score.score = Decimal("20")
+        score.save()
+        self.assertEqual(self._snapshot()["quiz_avg"], 100.0)
+
+        self.item.delete()
+        self.assertFalse(QuarterGradeSnapshot.objects.exists())
+
+    def test_rebuild_command(self):
+        StudentScore.objects.create(student=self.student, grade_item=self.item, score=Decimal("10"))
+        QuarterGradeSnapshot.objects.all().delete()
+
+        call_command("rebuild_grade_snapshots", stdout=StringIO())
+
+        self.assertEqual(QuarterGradeSnapshot.objects.count(), 1)
+        self.assertEqual(self._snapshot(), self._live())
+
+
+class GradebookApiTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        admin = User.objects.create_user(
+            username="admin", email="admin@test.com", password="testpass123", role="ADMIN"
+        )
+        self.client.force_authenticate(admin)
+        self.subject = Subject.objects.create(name="Math", code="MATH")
+        self.section = Section.objects.create(name="Rizal", grade_level="grade1")
+        self.students = []
+        for i in range(3):
+            student = User.objects.create_user(
+                username=f"student{i}", email=f"student{i}@test.com", password="testpass123"
+            )
+            UserProfile.objects.create(
+                user=student, section=self.section, student_first_name="Kid", student_last_name=str(i),
+                grade_level="grade1", parent_first_name="P", parent_last_name="Q",
+                contact_number="0917", address="Manila",
+            )
+            self.students.append(student)
+        self.quiz = GradeItem.objects.create(
+            teacher=admin, subject=self.subject, grade_level=1,
+            quarter=1, category="QUIZ", title="Quiz 1", total_score=20,
+        )
+        self.exam = GradeItem.objects.create(
+            teacher=admin, subject=self.subject, grade_level=1,
+            quarter=1, category="EXAM", title="Exam 1", total_score=50,
+        )
+
+    def _matrix(self):
+        response = self.client.get(
+            f"/api/grades/gradebook/?section={self.section.id}&subject={self.subject.id}&quarter=1"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def _bulk(self, changes):
+        return self.client.post("/api/grades/gradebook/bulk/", {"changes": changes}, format="json")
+
+    def test_matrix_and_bulk_diff(self):
+        s0, s1, s2 = self.students
+        StudentScore.objects.create(student=s0, grade_item=self.quiz, score=Decimal("10"))
+        StudentScore.objects.create(student=s1, grade_item=self.quiz, score=Decimal("12"))
+
+        response = self._bulk([
+            {"student": s0.id, "grade_item": self.quiz.id, "score": "15"},
+            {"student": s1.id, "grade_item": self.quiz.id, "score": None},
+            {"student": s2.id, "grade_item": self.quiz.id, "score": "20"},
+            {"student": s2.id, "grade_item": self.exam.id, "score": "40"},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"created": 2, "updated": 1, "deleted": 1, "unchanged": 0})
+
+        data = self._matrix()
+        self.assertEqual([item["id"] for item in data["items"]], [self.exam.id, self.quiz.id])
+        rows = {row["id"]: row for row in data["students"]}
+        self.assertEqual(rows[s0.id]["scores"], {str(self.quiz.id): 15.0})
+        self.assertEqual(rows[s1.id]["scores"], {})
+        self.assertEqual(rows[s2.id]["scores"], {str(self.quiz.id): 20.0, str(self.exam.id): 40.0})
+        # Bulk writes skip the score signals; the snapshots must still be current.
+        self.assertEqual(rows[s0.id]["quarter_grade"], 75.0)
+        self.assertIsNone(rows[s1.id]["quarter_grade"])
+        self.assertEqual(
+            snapshot_quarter_grades([s2.id], [self.subject.id], [1])[(s2.id, self.subject.id, 1)],
+            compute_quarter_grades([s2.id], [self.subject.id], [1])[(s2.id, self.subject.id, 1)],
+        )
+
+    def test_clearing_cells_does_not_cost_queries_per_cell(self):
+        def clear(students):
+            for student in students:
+                StudentScore.objects.create(student=student, grade_item=self.quiz, score=Decimal("10"))
+            with CaptureQueriesContext(connection) as ctx:
+                self._bulk([{"student": s.id, "grade_item": self.quiz.id, "score": None} for s in students])
+            return len(ctx.captured_queries)
+
+        self.assertEqual(clear(self.students[:1]), clear(self.students))
+        self.assertFalse(QuarterGradeSnapshot.objects.exists())
+
+    def test_invalid_cell_rejects_whole_diff(self):
+        s0, s1, _ = self.students
+        response = self._bulk([
+            {"student": s0.id, "grade_item": self.quiz.id, "score": "15"},
+            {"student": s1.id, "grade_item": self.quiz.id, "score": "25"},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["errors"], [{"index": 1, "detail": "Score cannot exceed 20"}])
+        self.assertFalse(StudentScore.objects.exists())
+
+
+class ScoreImportTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username="admin", email="admin@test.com", password="testpass123", role="ADMIN"
+        )
+        self.client.force_authenticate(self.admin)
+        self.subject = Subject.objects.create(name="Math", code="MATH")
+        self.section = Section.objects.create(name="Rizal", grade_level="grade1")
+        self.quiz = GradeItem.objects.create(
+            teacher=self.admin, subject=self.subject, grade_level=1,
+            quarter=1, category="QUIZ", title="Quiz 1", total_score=20,
+        )
+
+    def _students(self, count):
+        students = []
+        for i in range(count):
+            student = User.objects.create_user(
+                username=f"student{i}", email=f"student{i}@test.com", password="testpass123"
+            )
+            UserProfile.objects.create(
+                user=student, section=self.section, student_first_name="Kid", student_last_name=str(i),
+                grade_level="grade1", parent_first_name="P", parent_last_name="Q",
+                contact_number="0917", address="Manila", lrn=f"1000{i:02d}",
+            )
+            students.append(student)
+        return students
+
+    def _upload(self, lines, dry_run=False):
+        data = {
+            "file": SimpleUploadedFile("scores.csv", "\n".join(lines).encode("utf-8"), content_type="text/csv"),
+            "section": self.section.id,
+            "subject": self.subject.id,
+            "quarter": 1,
+        }
+        if dry_run:
+            data["dry_run"] = "1"
+        return self.client.post("/api/grades/gradebook/import/", data, format="multipart")
+
+    def test_dry_run_then_commit(self):
+        s0, s1 = self._students(2)
+        StudentScore.objects.create(student=s0, grade_item=self.quiz, score=Decimal("5"))
+        lines = [
+            "LRN,Name,Quiz 1,EXAM: Exam 1 / 50",
+            "100000,Kid 0,18,45",
+            "100001,Kid 1,,30.5",
+        ]
+
+        preview = self._upload(lines, dry_run=True).json()
+        self.assertTrue(preview["dry_run"])
+        self.assertEqual(preview["cells"], 3)
+        self.assertEqual([(i["column"], i["new"]) for i in preview["items"]], [("Quiz 1", False), ("Exam 1", True)])
+        self.assertEqual(GradeItem.objects.count(), 1)
+        self.assertEqual(StudentScore.objects.get(student=s0).score, Decimal("5"))
+
+        result = self._upload(lines).json()
+        self.assertEqual((result["items_created"], result["created"], result["updated"]), (1, 2, 1))
+        exam = GradeItem.objects.get(title="Exam 1")
+        self.assertEqual((exam.category, exam.total_score), ("EXAM", 50))
+        self.assertEqual(StudentScore.objects.get(student=s1, grade_item=exam).score, Decimal("30.50"))
+        self.assertFalse(StudentScore.objects.filter(student=s1, grade_item=self.quiz).exists())
+        self.assertEqual(
+            snapshot_quarter_grades([s0.id], [self.subject.id], [1])[(s0.id, self.subject.id, 1)],
+            compute_quarter_grades([s0.id], [self.subject.id], [1])[(s0.id, self.subject.id, 1)],
+        )
+
+    def test_errors_are_reported_and_nothing_is_saved(self):
+        self._students(1)
+        response = self._upload([
+            "LRN,Quiz 1,Quiz 9",
+            "100000,25,",
+            "999999,10,",
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["errors"][0]["column"], "Quiz 9")
+
+        response = self._upload(["LRN,Quiz 1", "100000,25", "999999,10"])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([e["row"] for e in response.json()["errors"]], [2, 3])
+        self.assertFalse(StudentScore.objects.exists())
+
+    def test_unreadable_files_are_rejected(self):
+        self._students(1)
+        uploads = [
+            SimpleUploadedFile("scores.csv", b'LRN,Quiz 1\n"' + b"x" * 200000 + b'"\n', content_type="text/csv"),
+            SimpleUploadedFile("scores.xlsx", b"not a zip archive", content_type="application/octet-stream"),
+        ]
+        for upload in uploads:
+            response = self.client.post(
+                "/api/grades/gradebook/import/",
+                {"file": upload, "section": self.section.id, "subject": self.subject.id, "quarter": 1},
+                format="multipart",
+            )
+            self.assertEqual(response.status_code, 400, upload.name)
+            self.assertIn("Could not read the file", response.json()["detail"])
+        self.assertFalse(StudentScore.objects.exists())
+
+    def test_full_sheet_in_one_request(self):
+        students = self._students(40)
+        header = "LRN," + ",".join(f"ACTIVITY: Activity {c} / 10" for c in range(30))
+        lines = [header] + [f"1000{i:02d}," + ",".join(str(c % 11) for c in range(30)) for i in range(40)]
+
+        result = self._upload(lines).json()
+
+        self.assertEqual((result["items_created"], result["created"]), (30, 1200))
+        self.assertEqual(StudentScore.objects.count(), 1200)
+        self.assertEqual(
+            QuarterGradeSnapshot.objects.filter(student__in=students, subject=self.subject, quarter=1).count(), 40
+        )
+
+
+class PublishAcademicHistoryTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username="admin", email="admin@test.com", password="testpass123", role="ADMIN"
+        )
+        self.client.force_authenticate(self.admin)
+        self.subject = Subject.objects.create(name="Math", code="MATH")
+        self.section = Section.objects.create(name="Rizal", grade_level="grade1")
+        Schedule.objects.create(
+            teacher=self.admin, subject=self.subject, section=self.section,
+            day_of_week="MON", start_time="08:00", end_time="09:00",
+        )
+        self.students = []
+        self.items = [
+            GradeItem.objects.create(
+                teacher=self.admin, subject=self.subject, grade_level=1,
+                quarter=q, category="EXAM", title=f"Exam Q{q}", total_score=100,
+            )
+            for q in QUARTERS
+        ]
+        for i in range(2):
+            student = User.objects.create_user(
+                username=f"student{i}", email=f"student{i}@test.com", password="testpass123"
+            )
+            Enrollment.objects.create(student=student, section=self.section, grade_level=1, status="ACTIVE")
+            for item in self.items:
+                StudentScore.objects.create(student=student, grade_item=item, score=Decimal("80"))
+            self.students.append(student)
+        self.params = {"section_id": self.section.id, "subject_id": self.subject.id, "school_year": "2025-2026"}
+
+    def test_publish_reuses_preview_until_grades_change(self):
+        preview = self.client.get("/api/grades/publish-history/", self.params).json()
+        self.assertTrue(preview["can_publish"])
+        token = preview["preview_token"]
+
+        response = self.client.post(
+            "/api/grades/publish-history/", {**self.params, "preview_token": token}, format="json"
+        )
+        self.assertEqual((response.json()["published"], response.json()["updated"]), (2, 0))
+        self.assertEqual(AcademicRecord.objects.get(student=self.students[0]).final_grade, Decimal("80"))
+
+        # A grade changed after the preview: the stale rows are recomputed, not reused.
+        score = StudentScore.objects.get(student=self.students[0], grade_item=self.items[0])
+        score.score = Decimal("40")
+        score.save()
+        response = self.client.post(
+            "/api/grades/publish-history/", {**self.params, "preview_token": token}, format="json"
+        )
+        self.assertEqual((response.json()["published"], response.json()["updated"]), (0, 2))
+        self.assertEqual(AcademicRecord.objects.get(student=self.students[0]).final_grade, Decimal("70"))
+
+    def test_publish_all_runs_in_background_with_progress(self):
+        StudentScore.objects.filter(student=self.students[1], grade_item=self.items[3]).delete()
+        science = Subject.objects.create(name="Science", code="SCI")
+        Schedule.objects.create(
+            teacher=self.admin, subject=science, section=self.section,
+            day_of_week="TUE", start_time="08:00", end_time="09:00",
+        )
+        for q in QUARTERS:
+            item = GradeItem.objects.create(
+                teacher=self.admin, subject=science, grade_level=1,
+                quarter=q, category="EXAM", title=f"Sci Q{q}", total_score=50,
+            )
+            for student in self.students:
+                StudentScore.objects.create(student=student, grade_item=item, score=Decimal("45"))
+
+        response = self.client.post("/api/grades/publish-history/all/", {"school_year": "2025-2026"}, format="json")
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["job_id"]
+        again = self.client.post("/api/grades/publish-history/all/", {"school_year": "2025-2026"}, format="json")
+        self.assertEqual(again.json()["job_id"], job_id)
+
+        call_command("run_worker", "--once", "--concurrency", "1", stdout=StringIO())
+
+        status = self.client.get(f"/api/grades/publish-history/jobs/{job_id}/").json()
+        self.assertEqual(status["status"], "DONE")
+        self.assertEqual(status["progress"]["sections_done"], 1)
+        self.assertEqual(status["progress"]["published"], 2)
+        self.assertEqual(
+            status["progress"]["skipped"], [{"section": "Rizal", "subject": "Math", "incomplete": 1}]
+        )
+        self.assertEqual(
+            set(AcademicRecord.objects.values_list("subject_name", flat=True)), {"Science"}
+        )
+
+
+class ReenrollmentEligibilityTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        teacher = User.objects.create_user(
+            username="teacher", email="teacher@test.com", password="testpass123", role="TEACHER"
+        )
+        self.student = User.objects.create_user(
+            username="student", email="student@test.com", password="testpass123"
+        )
+        self.client.force_authenticate(self.student)
+        self.math = Subject.objects.create(name="Math", code="MATH")
+        self.items = [
+            GradeItem.objects.create(
+                teacher=teacher, subject=self.math, grade_level=1,
+                quarter=q, category="EXAM", title=f"Exam Q{q}", total_score=100,
+            )
+            for q in QUARTERS
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            UserProfile.objects.create(
+                user=self.student, student_first_name="Juan", student_last_name="Cruz",
+                grade_level="grade1", parent_first_name="Maria", parent_last_name="Cruz",
+                contact_number="09170000000", address="Manila",
+            )
+
+    def _eligibility(self):
+        response = self.client.get("/api/grades/my-reenrollment-eligibility/")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_signals_keep_stored_eligibility_current(self):
+        data = self._eligibility()
+        self.assertFalse(data["eligible"])
+        self.assertTrue(data["has_incomplete_grades"])
+        self.assertEqual((data["current_grade"], data["next_grade"]), ("grade1", "grade2"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for item in self.items:
+                StudentScore.objects.create(student=self.student, grade_item=item, score=Decimal("60"))
+        self.assertTrue(self._eligibility()["has_failing_grades"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            StudentScore.objects.filter(student=self.student).update(score=Decimal("90"))
+            refresh_quarter_snapshots((self.student.id, self.math.id, q) for q in QUARTERS)
+            Transaction.objects.create(parent=self.student, entry_type="DEBIT", amount=Decimal("1500"))
+        data = self._eligibility()
+        self.assertFalse(data["has_failing_grades"])
+        self.assertEqual(data["outstanding_balance"], 1500.0)
+        self.assertIn("₱1,500.00", data["message"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Transaction.objects.create(parent=self.student, entry_type="CREDIT", amount=Decimal("1500"))
+        data = self._eligibility()
+        self.assertTrue(data["eligible"])
+        self.assertEqual(data["message"], "You are eligible to re-enroll for Grade 2.")
+        self.assertEqual(data["grade_summary"]["passed_subjects"], 1)
+
+        # Served from the stored row: no grade or ledger computation per request.
+        with CaptureQueriesContext(connection) as ctx:
+            self._eligibility()
+        self.assertFalse(any("finance_transaction" in q["sql"] for q in ctx.captured_queries))
+
+        # A new subject leaves every student with an incomplete subject.
+        Subject.objects.create(name="Science", code="SCI")
+        self.assertTrue(self._eligibility()["has_incomplete_grades"])
+
+    def test_precompute_command_covers_every_student(self):
+        other = User.objects.create_user(username="other", email="other@test.com", password="testpass123")
+        ReenrollmentEligibility.objects.all().delete()
+
+        out = StringIO()
+        call_command("precompute_reenrollment_eligibility", "--chunk-size", "1", stdout=out)
+        self.assertIn("2 students checked", out.getvalue())
+        self.assertEqual(
+            set(ReenrollmentEligibility.objects.values_list("student_id", flat=True)),
+            {self.student.id, other.id},
+        )
+
+    def test_rebuild_command_drops_stale_eligibility(self):
+        self.assertTrue(self._eligibility()["has_incomplete_grades"])
+        # Written behind the signals' back, as a repair or import would.
+        StudentScore.objects.bulk_create(
+            StudentScore(student=self.student, grade_item=item, score=Decimal("90")) for item in self.items
+        )
 
-# Create your tests here.
+        call_command("rebuild_grade_snapshots", stdout=StringIO())
+        self.assertFalse(ReenrollmentEligibility.objects.exists())
+        self.assertTrue(self._eligibility()["eligible"])
@@ -23,6 +23,11 @@ urlpatterns = [
     path("scores/", views.StudentScoreListCreate.as_view(), name="score-list"),
     path("scores/upsert/", views.upsert_score, name="score-upsert"),
 
+    # Gradebook matrix + bulk cell changes
+    path("gradebook/", views.gradebook, name="gradebook"),
+    path("gradebook/bulk/", views.gradebook_bulk, name="gradebook-bulk"),
+    path("gradebook/import/", views.import_scores, name="gradebook-import"),
+
     # Class standing
     path("class-standing/", views.list_class_standings, name="class-standing-list"),
     path("class-standing/upsert/", views.upsert_class_standing, name="class-standing-upsert"),
@@ -42,6 +47,8 @@ urlpatterns = [
     path("academic-history/", views.AcademicRecordListCreate.as_view(), name="academic-history-list"),
     path("academic-history/<int:pk>/", views.AcademicRecordDetail.as_view(), name="academic-history-detail"),
     path("publish-history/", views.publish_academic_history, name="publish-academic-history"),
+    path("publish-history/all/", views.publish_all_academic_history, name="publish-all-academic-history"),
+    path("publish-history/jobs/<int:job_id>/", views.publish_job_status, name="publish-history-job"),
 
     # Admin — re-enrollment eligibility check for students
     path("my-reenrollment-eligibility/", views.my_reenrollment_eligibility, name="my-reenrollment-eligibility"),
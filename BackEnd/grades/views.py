@@ -4,74 +4,42 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
 
-from django.db.models import Count, Max, Q, Sum
-
-from decimal import Decimal
+from django.db.models import Count, Max, Q
 
 from .models import GradeWeight, GradeItem, StudentScore, ClassStanding, AcademicRecord
 from .serializers import (
     GradeWeightSerializer,
     GradeItemSerializer,
+    ScoreChangeSerializer,
     StudentScoreSerializer,
     ClassStandingSerializer,
     AcademicRecordSerializer,
 )
-from accounts.models import User, UserProfile, Subject
+from .eligibility import eligibility_for, eligibility_message
+from .imports import commit_score_import, iter_sheet_rows, plan_score_import
+from .publishing import (
+    PUBLISH_ALL_TASK,
+    active_enrollments,
+    cached_preview_rows,
+    grades_fingerprint,
+    preview_rows,
+    publish_records,
+    save_preview,
+)
+from .services import (
+    QUARTERS,
+    apply_score_changes,
+    compute_quarter_grades,
+    final_grade_from_quarters,
+    grade_level_label,
+    normalize_grade_level,
+    snapshot_quarter_grades,
+)
+from accounts.models import User, UserProfile, Section, Subject
 from classmanagement.models import Schedule
 from enrollment.models import Enrollment
-
-from finance.models import Transaction
-
-
-def normalize_grade_level(value):
-    if value is None:
-        return None
-
-    normalized = str(value).strip().lower()
-
-    grade_map = {
-        "prek": -1,
-        "pre-kinder": -1,
-        "kinder": 0,
-        "grade1": 1,
-        "grade2": 2,
-        "grade3": 3,
-        "grade4": 4,
-        "grade5": 5,
-        "grade6": 6,
-        "grade 1": 1,
-        "grade 2": 2,
-        "grade 3": 3,
-        "grade 4": 4,
-        "grade 5": 5,
-        "grade 6": 6,
-        "0": 0,
-        "1": 1,
-        "2": 2,
-        "3": 3,
-        "4": 4,
-        "5": 5,
-        "6": 6,
-    }
-
-    if normalized in grade_map:
-        return grade_map[normalized]
-
-    try:
-        return int(normalized)
-    except (ValueError, TypeError):
-        return None
-
-
-def grade_level_label(value):
-    normalized = normalize_grade_level(value)
-    if normalized == -1:
-        return "Pre-Kinder"
-    if normalized == 0:
-        return "Kinder"
-    if normalized is not None and normalized > 0:
-        return f"Grade {normalized}"
-    return str(value or "—")
+from jobs.models import Job
+from jobs.services import enqueue
 
 
 # ══════════════════════════════════════════════════════
@@ -210,6 +178,185 @@ def upsert_score(request):
     return Response(StudentScoreSerializer(obj).data, status=status.HTTP_200_OK)
 
 
+# ══════════════════════════════════════════════════════
+# GRADEBOOK  —  students × items matrix + bulk cell changes
+# ══════════════════════════════════════════════════════
+GRADEBOOK_BULK_LIMIT = 2000
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def gradebook(request):
+    """
+    Full score matrix for one section / subject / quarter.
+    Query: ?section=<id>&subject=<id>&quarter=<1-4>
+    Scores are keyed by grade item id; missing cells are absent.
+    """
+    user = request.user
+    if user.role not in ("TEACHER", "ADMIN"):
+        return Response({"detail": "Forbidden"}, status=403)
+
+    section_id = request.query_params.get("section")
+    subject_id = request.query_params.get("subject")
+    quarter = request.query_params.get("quarter")
+    if not (section_id and subject_id and quarter):
+        return Response({"detail": "section, subject, quarter required"}, status=400)
+    try:
+        section_id, subject_id, quarter = int(section_id), int(subject_id), int(quarter)
+    except ValueError:
+        return Response({"detail": "section, subject, quarter must be integers"}, status=400)
+    if quarter not in QUARTERS:
+        return Response({"detail": "quarter must be 1-4"}, status=400)
+
+    if user.role == "TEACHER":
+        allowed = Schedule.objects.filter(teacher=user, section_id=section_id, subject_id=subject_id).exists()
+        if not allowed:
+            return Response({"detail": "Forbidden"}, status=403)
+
+    section = Section.objects.filter(pk=section_id).first()
+    if section is None:
+        return Response({"detail": "Section not found"}, status=404)
+    grade_level = normalize_grade_level(section.grade_level)
+
+    items = list(GradeItem.objects.filter(subject_id=subject_id, grade_level=grade_level, quarter=quarter))
+    roster = _section_roster(section_id)
+    student_ids = [s["id"] for s in roster]
+
+    scores = {}
+    for student_id, item_id, score in StudentScore.objects.filter(
+        student_id__in=student_ids, grade_item__in=items,
+    ).values_list("student_id", "grade_item_id", "score"):
+        scores.setdefault(student_id, {})[item_id] = float(score)
+
+    grades = snapshot_quarter_grades(student_ids, [subject_id], [quarter])
+    students = []
+    for student in roster:
+        grade = grades[(student["id"], subject_id, quarter)]
+        students.append({
+            **student,
+            "scores": scores.get(student["id"], {}),
+            "class_standing": grade["class_standing"],
+            "quarter_grade": grade["quarter_grade"],
+        })
+
+    return Response({
+        "section": section.id,
+        "subject": subject_id,
+        "quarter": quarter,
+        "grade_level": grade_level,
+        "items": GradeItemSerializer(items, many=True).data,
+        "students": students,
+    })
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def gradebook_bulk(request):
+    """
+    Apply the changed gradebook cells in one transaction.
+    Body: { changes: [{ student, grade_item, score }, ...] }  (score null clears the cell)
+    Nothing is saved unless every change is valid.
+    """
+    user = request.user
+    if user.role not in ("TEACHER", "ADMIN"):
+        return Response({"detail": "Forbidden"}, status=403)
+
+    changes = request.data.get("changes")
+    if not isinstance(changes, list) or not changes:
+        return Response({"detail": "changes must be a non-empty list"}, status=400)
+    if len(changes) > GRADEBOOK_BULK_LIMIT:
+        return Response({"detail": f"At most {GRADEBOOK_BULK_LIMIT} changes per request"}, status=400)
+
+    serializer = ScoreChangeSerializer(data=changes, many=True)
+    if not serializer.is_valid():
+        return Response({"detail": "Invalid changes", "errors": serializer.errors}, status=400)
+    rows = serializer.validated_data
+
+    items = GradeItem.objects.in_bulk({row["grade_item"] for row in rows})
+    students = set(
+        User.objects.filter(id__in={row["student"] for row in rows}, role="PARENT_STUDENT")
+        .values_list("id", flat=True)
+    )
+    allowed_subjects = None
+    if user.role == "TEACHER":
+        allowed_subjects = set(Schedule.objects.filter(teacher=user).values_list("subject_id", flat=True))
+
+    errors = []
+    for index, row in enumerate(rows):
+        item = items.get(row["grade_item"])
+        if item is None:
+            errors.append({"index": index, "detail": "Grade item not found"})
+        elif allowed_subjects is not None and item.subject_id not in allowed_subjects:
+            errors.append({"index": index, "detail": "You do not teach this subject"})
+        elif row["student"] not in students:
+            errors.append({"index": index, "detail": "Student not found"})
+        elif row["score"] is not None and row["score"] > item.total_score:
+            errors.append({"index": index, "detail": f"Score cannot exceed {item.total_score}"})
+    if errors:
+        return Response({"detail": "Invalid changes", "errors": errors}, status=400)
+
+    result = apply_score_changes(
+        (row["student"], items[row["grade_item"]], row["score"]) for row in rows
+    )
+    return Response(result)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def import_scores(request):
+    """
+    Import a CSV / XLSX score sheet for one section / subject / quarter.
+    Form data: file, section, subject, quarter, dry_run ("1" = preview only)
+    Rows are matched to students by LRN or student number; every other column is
+    an existing grade item title or a new item written as "QUIZ: Quiz 3 / 20".
+    Nothing is saved unless the whole sheet is valid.
+    """
+    user = request.user
+    if user.role not in ("TEACHER", "ADMIN"):
+        return Response({"detail": "Forbidden"}, status=403)
+
+    upload = request.FILES.get("file")
+    if upload is None:
+        return Response({"detail": "file required"}, status=400)
+    try:
+        section_id = int(request.data.get("section"))
+        subject_id = int(request.data.get("subject"))
+        quarter = int(request.data.get("quarter"))
+    except (TypeError, ValueError):
+        return Response({"detail": "section, subject, quarter required"}, status=400)
+    if quarter not in QUARTERS:
+        return Response({"detail": "quarter must be 1-4"}, status=400)
+
+    if user.role == "TEACHER":
+        allowed = Schedule.objects.filter(teacher=user, section_id=section_id, subject_id=subject_id).exists()
+        if not allowed:
+            return Response({"detail": "Forbidden"}, status=403)
+
+    section = Section.objects.filter(pk=section_id).first()
+    if section is None:
+        return Response({"detail": "Section not found"}, status=404)
+
+    try:
+        plan = plan_score_import(
+            iter_sheet_rows(upload),
+            subject_id=subject_id,
+            quarter=quarter,
+            grade_level=normalize_grade_level(section.grade_level),
+            student_ids=[s["id"] for s in _section_roster(section_id)],
+            teacher=user,
+        )
+    except (ValueError, UnicodeDecodeError) as e:
+        return Response({"detail": f"Could not read the file: {e}"}, status=400)
+
+    preview = plan.preview()
+    if plan.errors:
+        return Response({"detail": "The file has errors; nothing was saved", **preview}, status=400)
+    if request.data.get("dry_run") == "1":
+        return Response({"dry_run": True, **preview})
+
+    return Response({"dry_run": False, **preview, **commit_score_import(plan)})
+
+
 # ══════════════════════════════════════════════════════
 # CLASS STANDING  —  upsert
 # ══════════════════════════════════════════════════════
@@ -282,71 +429,10 @@ def _compute_quarter_grade(student_id, subject_id, quarter):
     """
     Compute the weighted quarter grade for one student.
     Returns dict with category averages + weighted total.
+    Prefer compute_quarter_grades() when grading more than one cell.
     """
-    try:
-        w = GradeWeight.objects.get(subject_id=subject_id)
-    except GradeWeight.DoesNotExist:
-        w = None
-    aw = w.activity_weight if w else 40
-    qw = w.quiz_weight if w else 20
-    ew = w.exam_weight if w else 20
-    cw = w.class_standing_weight if w else 20
-
-    def _avg(category):
-        items = GradeItem.objects.filter(
-            subject_id=subject_id, quarter=quarter, category=category
-        )
-        if not items.exists():
-            return None
-        scores = StudentScore.objects.filter(
-            student_id=student_id, grade_item__in=items
-        )
-        if not scores.exists():
-            return None
-        total_earned = sum(s.score for s in scores)
-        total_possible = sum(s.grade_item.total_score for s in scores.select_related("grade_item"))
-        if total_possible == 0:
-            return Decimal("0")
-        return (Decimal(str(total_earned)) / Decimal(str(total_possible))) * 100
-
-    act_avg = _avg("ACTIVITY")
-    quiz_avg = _avg("QUIZ")
-    exam_avg = _avg("EXAM")
-
-    try:
-        cs = ClassStanding.objects.get(
-            student_id=student_id, subject_id=subject_id, quarter=quarter
-        )
-        cs_score = cs.score
-    except ClassStanding.DoesNotExist:
-        cs_score = None
-
-    components = []
-    if act_avg is not None:
-        components.append((act_avg, aw))
-    if quiz_avg is not None:
-        components.append((quiz_avg, qw))
-    if exam_avg is not None:
-        components.append((exam_avg, ew))
-    if cs_score is not None:
-        components.append((Decimal(str(cs_score)), cw))
-
-    if not components:
-        weighted_total = None
-    else:
-        total_weight = sum(c[1] for c in components)
-        if total_weight > 0:
-            weighted_total = sum(val * wt for val, wt in components) / Decimal(str(total_weight)) * 100 / 100
-        else:
-            weighted_total = None
-
-    return {
-        "activity_avg": round(float(act_avg), 2) if act_avg is not None else None,
-        "quiz_avg": round(float(quiz_avg), 2) if quiz_avg is not None else None,
-        "exam_avg": round(float(exam_avg), 2) if exam_avg is not None else None,
-        "class_standing": round(float(cs_score), 2) if cs_score is not None else None,
-        "quarter_grade": round(float(weighted_total), 2) if weighted_total is not None else None,
-    }
+    key = (int(student_id), int(subject_id), int(quarter))
+    return compute_quarter_grades([key[0]], [key[1]], [key[2]])[key]
 
 
 @api_view(["GET"])
@@ -356,15 +442,9 @@ def student_quarter_grades(request, student_id, subject_id):
     Return computed grades for all 4 quarters + final average for one student.
     Used by both teacher and parent views.
     """
-    quarters = {}
-    final_parts = []
-    for q in range(1, 5):
-        data = _compute_quarter_grade(student_id, subject_id, q)
-        quarters[f"q{q}"] = data
-        if data["quarter_grade"] is not None:
-            final_parts.append(data["quarter_grade"])
-
-    final_grade = round(sum(final_parts) / len(final_parts), 2) if final_parts else None
+    grades = compute_quarter_grades([student_id], [subject_id])
+    quarters = {f"q{q}": grades[(student_id, subject_id, q)] for q in QUARTERS}
+    final_grade = final_grade_from_quarters(d["quarter_grade"] for d in quarters.values())
 
     return Response({
         "student_id": student_id,
@@ -375,16 +455,6 @@ def student_quarter_grades(request, student_id, subject_id):
     })
 
 
-def _compute_overall_record(quarter_scores):
-    valid_scores = [q for q in quarter_scores if q is not None]
-    if not valid_scores:
-        return None, "INCOMPLETE"
-    final_grade = round(sum(valid_scores) / len(valid_scores), 2)
-    if final_grade >= 75:
-        return final_grade, "PASSED"
-    return final_grade, "FAILED"
-
-
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def grades_root(request):
@@ -439,41 +509,19 @@ def publish_academic_history(request):
         if not Schedule.objects.filter(teacher=user, section_id=section_obj.id, subject_id=subject.id).exists():
             return Response({"detail": "Forbidden"}, status=403)
 
-    enrollments = Enrollment.objects.filter(section=section_obj, status="ACTIVE").select_related("student")
+    enrollments = active_enrollments(section_obj.id)
 
-    if not enrollments.exists():
+    if not enrollments:
         return Response({"detail": "No active students found for section"}, status=400)
 
-    has_incomplete = False
-    preview_rows = []
-
-    for enrollment in enrollments:
-        student = enrollment.student
-        if not student:
-            continue
-
-        scores_by_q = []
-        for q in range(1, 5):
-            scores_by_q.append(_compute_quarter_grade(student.id, subject.id, q)["quarter_grade"])
-
-        final_grade, remarks = _compute_overall_record(scores_by_q)
-
-        is_complete = all(score is not None for score in scores_by_q)
-        if not is_complete:
-            has_incomplete = True
-
-        preview_rows.append({
-            "student_id": student.id,
-            "student_name": f"{enrollment.first_name or ''} {enrollment.last_name or ''}".strip() or student.username,
-            "grade_level": enrollment.grade_level,
-            "q1": scores_by_q[0],
-            "q2": scores_by_q[1],
-            "q3": scores_by_q[2],
-            "q4": scores_by_q[3],
-            "final_grade": final_grade,
-            "remarks": remarks,
-            "complete": is_complete,
-        })
+    # A preview token lets the POST reuse the GET's rows when no grade changed since.
+    scope = {"user": user.id, "section": section_obj.id, "subject": subject.id, "school_year": school_year}
+    fingerprint = grades_fingerprint([e.student_id for e in enrollments], subject.id)
+    preview_token = request.data.get("preview_token") if request.method == "POST" else None
+    rows = cached_preview_rows(preview_token, fingerprint, **scope)
+    if rows is None:
+        rows = preview_rows(enrollments, [subject.id])[subject.id]
+    incomplete_count = sum(1 for r in rows if not r["complete"])
 
     if request.method == "GET":
 
@@ -481,54 +529,22 @@ def publish_academic_history(request):
             "section": section_obj.name,
             "subject": subject.name,
             "school_year": school_year,
-            "rows": preview_rows,
-            "can_publish": not has_incomplete,
-            "incomplete_count": sum(1 for r in preview_rows if not r["complete"]),
+            "rows": rows,
+            "can_publish": not incomplete_count,
+            "incomplete_count": incomplete_count,
+            "preview_token": save_preview(rows, fingerprint, **scope),
         })
 
     # POST path: actually persist records (only if complete)
-    if has_incomplete:
+    if incomplete_count:
         return Response({
             "detail": "Cannot publish while some students have incomplete quarter grades.",
-            "incomplete_count": sum(1 for r in preview_rows if not r["complete"]),
+            "incomplete_count": incomplete_count,
         }, status=400)
 
-    published = 0
-    updated = 0
-
-    for row in preview_rows:
-        student = User.objects.filter(pk=row["student_id"]).first()
-        if not student:
-            continue
-
-        grade_level = normalize_grade_level(section_obj.grade_level if section_obj.grade_level is not None else row.get("grade_level"))
-
-        defaults = {
-            "section_name": section_obj.name or "",
-            "subject_name": subject.name,
-            "subject_code": subject.code,
-            "grade_level": grade_level if grade_level is not None else 0,
-            "q1": row["q1"],
-            "q2": row["q2"],
-            "q3": row["q3"],
-            "q4": row["q4"],
-            "final_grade": row["final_grade"],
-            "remarks": row["remarks"],
-            "teacher_name": user.username,
-            "recorded_by": user,
-        }
-
-        _, created = AcademicRecord.objects.update_or_create(
-            student=student,
-            school_year=school_year,
-            subject_name=subject.name,
-            defaults=defaults,
-        )
-
-        if created:
-            published += 1
-        else:
-            updated += 1
+    published, updated = publish_records(
+        rows, school_year=school_year, subject=subject, section=section_obj, recorded_by=user,
+    )
 
     return Response({
         "success": True,
@@ -537,7 +553,49 @@ def publish_academic_history(request):
         "school_year": school_year,
         "published": published,
         "updated": updated,
-        "total": len(preview_rows),
+        "total": len(rows),
+    })
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def publish_all_academic_history(request):
+    """
+    Admin: publish every scheduled subject for every section in a background job.
+    Body: { school_year }. Returns the job id; poll publish-history/jobs/<id>/.
+    """
+    if request.user.role != "ADMIN":
+        return Response({"detail": "Forbidden"}, status=403)
+    school_year = request.data.get("school_year")
+    if not school_year:
+        return Response({"detail": "school_year is required"}, status=400)
+
+    running = Job.objects.filter(
+        task=PUBLISH_ALL_TASK, status__in=["PENDING", "RUNNING"], payload__school_year=school_year,
+    ).first()
+    if running:
+        return Response({"job_id": running.id, "status": running.status, "already_queued": True})
+
+    job = enqueue(PUBLISH_ALL_TASK, {"school_year": school_year, "recorded_by_id": request.user.id})
+    return Response({"job_id": job.id, "status": job.status}, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def publish_job_status(request, job_id):
+    if request.user.role != "ADMIN":
+        return Response({"detail": "Forbidden"}, status=403)
+    job = Job.objects.filter(pk=job_id, task=PUBLISH_ALL_TASK).first()
+    if job is None:
+        return Response({"detail": "Job not found"}, status=404)
+    return Response({
+        "job_id": job.id,
+        "status": job.status,
+        "progress": job.progress,
+        "attempts": job.attempts,
+        "error": job.last_error.strip().splitlines()[-1] if job.last_error else None,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
     })
 
 
@@ -555,17 +613,12 @@ def my_grades(request):
     if user.role != "PARENT_STUDENT":
         return Response({"detail": "Forbidden"}, status=403)
 
-    subjects = Subject.objects.all()
+    subjects = list(Subject.objects.all())
+    grades = snapshot_quarter_grades([user.id], [s.id for s in subjects])
     result = []
     for subj in subjects:
-        quarters = {}
-        parts = []
-        for q in range(1, 5):
-            data = _compute_quarter_grade(user.id, subj.id, q)
-            quarters[f"q{q}"] = data["quarter_grade"]
-            if data["quarter_grade"] is not None:
-                parts.append(data["quarter_grade"])
-        final = round(sum(parts) / len(parts), 2) if parts else None
+        quarters = {f"q{q}": grades[(user.id, subj.id, q)]["quarter_grade"] for q in QUARTERS}
+        final = final_grade_from_quarters(quarters.values())
         result.append({
             "subject_id": subj.id,
             "subject_name": subj.name,
@@ -612,11 +665,16 @@ def admin_grade_records_monitoring(request):
         )
     }
 
-    enrollments = (
+    enrollments = list(
         Enrollment.objects.filter(status="ACTIVE")
         .select_related("student", "student__profile", "section")
         .order_by("grade_level", "section__name", "last_name", "first_name")
     )
+    grades = snapshot_quarter_grades(
+        [e.student_id for e in enrollments if e.student_id],
+        [s.id for s in subjects],
+        [quarter],
+    )
 
     students = []
     student_averages = []
@@ -650,8 +708,7 @@ def admin_grade_records_monitoring(request):
         graded_values = []
 
         for subject in subjects:
-            grade_data = _compute_quarter_grade(student.id, subject.id, quarter)
-            quarter_grade = grade_data["quarter_grade"]
+            quarter_grade = grades[(student.id, subject.id, quarter)]["quarter_grade"]
             if quarter_grade is not None:
                 graded_values.append(quarter_grade)
             subject_breakdown.append({
@@ -837,24 +894,28 @@ def section_performance(request):
                 pt for pt in [p.student_first_name or "", p.student_last_name or ""] if pt
             ).strip() or p.user.username
 
-    results = []
-    for student_id, student_name in students_map.items():
-        grade_data = _compute_quarter_grade(student_id, subject_id, quarter)
-        att = AttendanceRecord.get_student_attendance_stats(
-            student_id,
+    grades = compute_quarter_grades(students_map.keys(), [subject_id], [quarter])
+    attendance = AttendanceRecord.get_roster_attendance_stats(
+        students_map.keys(),
+        q_start,
+        q_end,
+        schedule_ids=schedule_ids,
+        section_id=section_id,
+    )
+    # Fall back to legacy section-level attendance records when subject-linked rows do not exist.
+    missing = [sid for sid, att in attendance.items() if att["percentage"] is None]
+    if missing:
+        attendance.update(AttendanceRecord.get_roster_attendance_stats(
+            missing,
             q_start,
             q_end,
-            schedule_ids=schedule_ids,
             section_id=section_id,
-        )
-        if att["percentage"] is None:
-            # Fall back to legacy section-level attendance records when subject-linked rows do not exist.
-            att = AttendanceRecord.get_student_attendance_stats(
-                student_id,
-                q_start,
-                q_end,
-                section_id=section_id,
-            )
+        ))
+
+    results = []
+    for student_id, student_name in students_map.items():
+        grade_data = grades[(student_id, subject_id, quarter)]
+        att = attendance[student_id]
         results.append({
             "student_id": student_id,
             "student_name": student_name,
@@ -913,22 +974,11 @@ def teacher_sections(request):
     return Response(result)
 
 
-@api_view(["GET"])
-@permission_classes([IsAuthenticated])
-def students_by_section(request, section_id):
+def _section_roster(section_id):
     """
-    Return students for one section using active enrollments as source of truth,
-    with profile-section fallback for legacy records.
+    Students of one section, sorted by name: active enrollments first,
+    then profile-section links for legacy records.
     """
-    user = request.user
-    if user.role not in ("TEACHER", "ADMIN"):
-        return Response({"detail": "Forbidden"}, status=403)
-
-    if user.role == "TEACHER":
-        allowed = Schedule.objects.filter(teacher=user, section_id=section_id).exists()
-        if not allowed:
-            return Response({"detail": "Forbidden"}, status=403)
-
     students_map = {}
 
     enrollments = Enrollment.objects.filter(
@@ -975,8 +1025,26 @@ def students_by_section(request, section_id):
             "student_name": full_name,
         }
 
-    result = sorted(students_map.values(), key=lambda s: (s["student_name"].lower(), s["id"]))
-    return Response(result)
+    return sorted(students_map.values(), key=lambda s: (s["student_name"].lower(), s["id"]))
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def students_by_section(request, section_id):
+    """
+    Return students for one section using active enrollments as source of truth,
+    with profile-section fallback for legacy records.
+    """
+    user = request.user
+    if user.role not in ("TEACHER", "ADMIN"):
+        return Response({"detail": "Forbidden"}, status=403)
+
+    if user.role == "TEACHER":
+        allowed = Schedule.objects.filter(teacher=user, section_id=section_id).exists()
+        if not allowed:
+            return Response({"detail": "Forbidden"}, status=403)
+
+    return Response(_section_roster(section_id))
 
 
 # ══════════════════════════════════════════════════════
@@ -1070,105 +1138,30 @@ class AcademicRecordDetail(generics.RetrieveUpdateDestroyAPIView):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def my_reenrollment_eligibility(request):
+    """
+    Served from the stored ReenrollmentEligibility row, which signals keep
+    current; computed and saved on the first request for a student.
+    """
     user = request.user
     if user.role != "PARENT_STUDENT":
         return Response({"detail": "Forbidden"}, status=403)
 
-    profile = getattr(user, "profile", None)
-
-    current_grade = None
-    if profile and profile.grade_level:
-        current_grade = str(profile.grade_level).strip().lower()
-    else:
-        latest_enrollment = (
-            Enrollment.objects.filter(parent_user=user)
-            .order_by("-created_at", "-id")
-            .first()
-        )
-        if latest_enrollment and latest_enrollment.grade_level:
-            current_grade = str(latest_enrollment.grade_level).strip().lower()
-
-    next_grade_map = {
-        "prek": "kinder",
-        "kinder": "grade1",
-        "grade1": "grade2",
-        "grade2": "grade3",
-        "grade3": "grade4",
-        "grade4": "grade5",
-        "grade5": "grade6",
-        "grade6": None,
-    }
-    next_grade = next_grade_map.get(current_grade)
-
-    totals = Transaction.objects.filter(parent=user).aggregate(
-        total_debit=Sum("debit"),
-        total_credit=Sum("credit"),
-    )
-    total_debit = Decimal(str(totals.get("total_debit") or 0))
-    total_credit = Decimal(str(totals.get("total_credit") or 0))
-    outstanding_balance = total_debit - total_credit
-    if outstanding_balance < 0:
-        outstanding_balance = Decimal("0.00")
-
-    grades = my_grades(request).data
-    grades = grades if isinstance(grades, list) else []
-
-    total_subjects = len(grades)
-    incomplete_subjects = 0
-    failed_subjects = 0
-    passed_subjects = 0
-
-    for row in grades:
-        final_grade = row.get("final_grade")
-        if final_grade is None:
-            incomplete_subjects += 1
-        elif float(final_grade) < 75:
-            failed_subjects += 1
-        else:
-            passed_subjects += 1
-
-    completed_subjects = total_subjects - incomplete_subjects
-
-    grade6_completed = current_grade == "grade6"
-    has_balance = outstanding_balance > 0
-    has_incomplete_grades = incomplete_subjects > 0
-    has_failing_grades = failed_subjects > 0
-
-    eligible = not (
-        has_balance
-        or has_incomplete_grades
-        or has_failing_grades
-        or grade6_completed
-    )
-
-    if grade6_completed:
-        message = "Congratulations! You already completed Grade 6. No further re-enrollment is needed."
-    elif has_balance:
-        message = f"You still have an outstanding balance of ₱{outstanding_balance:,.2f}."
-    elif has_incomplete_grades:
-        message = "You have incomplete grades. Please wait until all subjects have final grades."
-    elif has_failing_grades:
-        message = "You have failing grades. Please coordinate with the school before re-enrollment."
-    elif next_grade:
-        message = f"You are eligible to re-enroll for {grade_level_label(normalize_grade_level(next_grade))}."
-    else:
-        message = "You are eligible to re-enroll."
-
+    row = eligibility_for(user)
     return Response({
-        "eligible": eligible,
-        "current_grade": current_grade,
-        "next_grade": next_grade,
-        "outstanding_balance": float(outstanding_balance),
-        "has_balance": has_balance,
-        "has_incomplete_grades": has_incomplete_grades,
-        "has_failing_grades": has_failing_grades,
-        "grade6_completed": grade6_completed,
-        "message": message,
+        "eligible": row.eligible,
+        "current_grade": row.current_grade,
+        "next_grade": row.next_grade,
+        "outstanding_balance": float(row.outstanding_balance),
+        "has_balance": row.has_balance,
+        "has_incomplete_grades": row.has_incomplete_grades,
+        "has_failing_grades": row.has_failing_grades,
+        "grade6_completed": row.grade6_completed,
+        "message": eligibility_message(row),
         "grade_summary": {
-            "total_subjects": total_subjects,
-            "completed_subjects": completed_subjects,
-            "incomplete_subjects": incomplete_subjects,
-            "failed_subjects": failed_subjects,
-            "passed_subjects": passed_subjects,
+            "total_subjects": row.total_subjects,
+            "completed_subjects": row.total_subjects - row.incomplete_subjects,
+            "incomplete_subjects": row.incomplete_subjects,
+            "failed_subjects": row.failed_subjects,
+            "passed_subjects": row.passed_subjects,
         },
     })
\ No newline at end of file
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "task",
+        "status",
+        "attempts",
+        "max_attempts",
+        "run_at",
+        "finished_at",
+    )
+    list_filter = ("status", "task")
+    search_fields = ("task", "last_error")
+    readonly_fields = ("created_at", "locked_by", "locked_at")
@@ -0,0 +1,74 @@
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from jobs.services import requeue_stale_jobs, run_pending
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (emails, reminders) with retries and backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=2,
+            help='Maximum number of jobs run at the same time'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=20,
+            help='Number of due jobs claimed per poll'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5.0,
+            help='Seconds to sleep when the queue is empty'
+        )
+        parser.add_argument(
+            '--lock-timeout',
+            type=int,
+            default=600,
+            help='Seconds without a progress report after which a RUNNING job is assumed orphaned and re-queued'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the jobs that are due now, then exit'
+        )
+
+    def handle(self, *args, **options):
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        concurrency = max(1, options['concurrency'])
+        batch_size = max(1, options['batch_size'])
+        lock_timeout = timedelta(seconds=options['lock_timeout'])
+        total_ok = total_failed = 0
+
+        self.stdout.write(f'  Worker {worker_id} started (concurrency {concurrency})')
+        try:
+            while True:
+                requeued = requeue_stale_jobs(lock_timeout)
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f'  Re-queued {requeued} orphaned jobs'))
+
+                ok, failed = run_pending(worker_id, limit=batch_size, concurrency=concurrency)
+                total_ok += ok
+                total_failed += failed
+                if ok or failed:
+                    self.stdout.write(f'  Ran {ok + failed} jobs ({failed} failed)')
+                    continue
+
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Worker stopped. {total_ok} jobs succeeded, {total_failed} attempts failed.')
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='progress',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
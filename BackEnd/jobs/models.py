@@ -0,0 +1,44 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A unit of background work (emails, bulk side effects) run by `manage.py run_worker`.
+
+    `task` is the dotted path of a function that takes the job's payload as
+    keyword arguments. Rows are written inside the caller's transaction, so a
+    job only becomes visible to workers once the work that queued it commits.
+    """
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    task = models.CharField(max_length=200)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    # Free-form status a long-running task reports with jobs.services.report_progress().
+    progress = models.JSONField(default=dict, blank=True)
+
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['run_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task} ({self.status}, attempt {self.attempts}/{self.max_attempts})"
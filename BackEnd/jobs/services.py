@@ -0,0 +1,153 @@
+import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+
+logger = logging.getLogger(__name__)
+
+# Retry delays grow 30s, 60s, 120s, ... capped at one hour.
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+
+# The job the current worker thread is running, for report_progress().
+_current = threading.local()
+
+
+# ═══════════════════════════════════════════════════════════
+# ENQUEUE  —  called from request code, inside its transaction
+# ═══════════════════════════════════════════════════════════
+def enqueue(task, payload=None, *, run_at=None, max_attempts=None):
+    """
+    Queue `task` (dotted path to a function) to run with **payload in a worker.
+    Payload must be JSON-serializable; pass ids rather than model instances.
+    """
+    fields = {'task': task, 'payload': payload or {}}
+    if run_at is not None:
+        fields['run_at'] = run_at
+    if max_attempts is not None:
+        fields['max_attempts'] = max_attempts
+    return Job.objects.create(**fields)
+
+
+# ═══════════════════════════════════════════════════════════
+# WORKER  —  claim, run, retry with backoff
+# ═══════════════════════════════════════════════════════════
+def backoff_delay(attempts):
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS))
+
+
+def claim_jobs(worker_id, limit):
+    """
+    Claim up to `limit` due jobs for this worker.
+    Each claim is a conditional UPDATE on status, so two workers polling the
+    same rows never both win one, on SQLite as well as on row-locking databases.
+    """
+    now = timezone.now()
+    candidates = list(
+        Job.objects.filter(status='PENDING', run_at__lte=now)
+        .order_by('run_at', 'id')
+        .values_list('id', flat=True)[:limit]
+    )
+    claimed = [
+        job_id for job_id in candidates
+        if Job.objects.filter(pk=job_id, status='PENDING').update(
+            status='RUNNING', locked_by=worker_id, locked_at=now
+        )
+    ]
+    return list(Job.objects.filter(pk__in=claimed).order_by('run_at', 'id'))
+
+
+def requeue_stale_jobs(timeout):
+    """
+    Put RUNNING jobs whose worker died (lock older than `timeout`) back in the queue.
+    report_progress() refreshes the lock, so long tasks that report stay claimed.
+    """
+    cutoff = timezone.now() - timeout
+    return Job.objects.filter(status='RUNNING', locked_at__lt=cutoff).update(
+        status='PENDING', locked_by='', locked_at=None
+    )
+
+
+def report_progress(**progress):
+    """
+    Record progress for the job running in this thread, e.g.
+    report_progress(done=3, total=10), and refresh its lock as a heartbeat.
+    Does nothing outside a worker.
+    """
+    job = getattr(_current, 'job', None)
+    if job is not None:
+        Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+            progress=progress, locked_at=timezone.now()
+        )
+
+
+def run_job(job):
+    """
+    Run one claimed job and record the outcome. Returns True on success.
+    The outcome is only written while this worker still holds the lock; a job
+    re-queued as stale in the meantime belongs to whoever claimed it next.
+    """
+    job.attempts += 1
+    _current.job = job
+    try:
+        import_string(job.task)(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = 'FAILED'
+            job.finished_at = timezone.now()
+            logger.error('Job %s (%s) failed permanently', job.pk, job.task)
+        else:
+            job.status = 'PENDING'
+            job.run_at = timezone.now() + backoff_delay(job.attempts)
+        succeeded = False
+    else:
+        job.status = 'DONE'
+        job.finished_at = timezone.now()
+        succeeded = True
+    finally:
+        _current.job = None
+
+    recorded = Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+        attempts=job.attempts, status=job.status, run_at=job.run_at, last_error=job.last_error,
+        finished_at=job.finished_at, locked_by='', locked_at=None,
+    )
+    if not recorded:
+        logger.warning('Job %s (%s) lost its lock; outcome of this run discarded', job.pk, job.task)
+    job.locked_by = ''
+    job.locked_at = None
+    return succeeded
+
+
+def _run_in_thread(job):
+    try:
+        return run_job(job)
+    finally:
+        close_old_connections()
+
+
+def run_pending(worker_id, limit=20, concurrency=1):
+    """
+    Claim and run one batch of due jobs, at most `concurrency` at a time.
+    Returns (succeeded, failed) counts for the batch.
+    """
+    jobs = claim_jobs(worker_id, limit)
+    if not jobs:
+        return 0, 0
+
+    if concurrency <= 1:
+        results = [run_job(job) for job in jobs]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(_run_in_thread, jobs))
+
+    succeeded = sum(1 for ok in results if ok)
+    return succeeded, len(results) - succeeded
@@ -0,0 +1,102 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import PasswordResetRequest, User
+from .models import Job
+from .services import enqueue, report_progress, requeue_stale_jobs, run_pending
+
+
+ATTEMPTS = []
+
+
+def flaky_task(fail_times):
+    ATTEMPTS.append(1)
+    if len(ATTEMPTS) <= fail_times:
+        raise RuntimeError("mail server unavailable")
+
+
+def slow_task(job_id):
+    # Runs long enough for the lock to look stale, but reports progress.
+    Job.objects.filter(pk=job_id).update(locked_at=timezone.now() - timedelta(hours=1))
+    report_progress(done=1, total=2)
+    ATTEMPTS.append(requeue_stale_jobs(timedelta(minutes=10)))
+
+
+def overtaken_task(job_id):
+    # Another worker re-queues and claims the job while this run is still going.
+    requeue_stale_jobs(timedelta(0))
+    Job.objects.filter(pk=job_id).update(status="RUNNING", locked_by="w2", locked_at=timezone.now())
+
+
+class JobQueueTest(TestCase):
+    def setUp(self):
+        ATTEMPTS.clear()
+
+    def test_failed_job_is_retried_with_backoff_then_marked_failed(self):
+        job = enqueue("jobs.tests.flaky_task", {"fail_times": 5}, max_attempts=2)
+
+        self.assertEqual(run_pending("w1"), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("PENDING", 1))
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("mail server unavailable", job.last_error)
+
+        # Not due yet, so the next poll skips it.
+        self.assertEqual(run_pending("w1"), (0, 0))
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        self.assertEqual(run_pending("w1"), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("FAILED", 2))
+
+    def test_stale_running_job_is_requeued(self):
+        job = enqueue("jobs.tests.flaky_task", {"fail_times": 0})
+        Job.objects.filter(pk=job.pk).update(
+            status="RUNNING", locked_by="dead", locked_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(requeue_stale_jobs(timedelta(minutes=10)), 1)
+        self.assertEqual(run_pending("w1"), (1, 0))
+        self.assertEqual(Job.objects.get(pk=job.pk).status, "DONE")
+
+    def test_progress_report_refreshes_the_lock(self):
+        job = enqueue("jobs.tests.slow_task")
+        Job.objects.filter(pk=job.pk).update(payload={"job_id": job.pk})
+        self.assertEqual(run_pending("w1"), (1, 0))
+        self.assertEqual(ATTEMPTS, [0])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress), ("DONE", {"done": 1, "total": 2}))
+
+    def test_overtaken_run_does_not_overwrite_the_new_claim(self):
+        job = enqueue("jobs.tests.overtaken_task")
+        Job.objects.filter(pk=job.pk).update(payload={"job_id": job.pk})
+        run_pending("w1")
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, job.attempts), ("RUNNING", "w2", 0))
+
+    def test_password_reset_link_is_sent_by_worker(self):
+        admin = User.objects.create_user(
+            username="admin1", email="admin1@test.com", password="x", role="ADMIN", is_staff=True
+        )
+        user = User.objects.create_user(username="parent1", email="parent1@test.com", password="x")
+        reset_request = PasswordResetRequest.objects.create(user=user, email=user.email)
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        response = client.post(f"/api/accounts/admin/password-reset-requests/{reset_request.pk}/send-link/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(PasswordResetRequest.objects.get(pk=reset_request.pk).status, "LINK_SENT")
+        self.assertEqual(len(mail.outbox), 0)
+
+        out = StringIO()
+        call_command("run_worker", "--once", "--concurrency", "1", stdout=out)
+        self.assertIn("1 jobs succeeded", out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["parent1@test.com"])
+        self.assertIn("/reset-password/", mail.outbox[0].body)
@@ -0,0 +1,81 @@
+import random
+import re
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from messaging.services import ProfanityMatcher
+
+
+def legacy_check_profanity(text, active_words):
+    """The previous per-word implementation, kept here only as the benchmark baseline."""
+    if not text:
+        return False, [], text
+
+    flagged = []
+    censored = text
+
+    for word in active_words:
+        pattern = rf'\b{re.escape(word)}\b'
+        for match in re.finditer(pattern, censored, re.IGNORECASE):
+            if word.lower() not in [w.lower() for w in flagged]:
+                flagged.append(match.group())
+        censored = re.sub(pattern, '*' * len(word), censored, flags=re.IGNORECASE)
+
+    return len(flagged) > 0, flagged, censored
+
+
+class Command(BaseCommand):
+    help = 'Compare the compiled profanity matcher against the legacy per-word scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--words', type=int, default=1000, help='Size of the synthetic word list')
+        parser.add_argument('--messages', type=int, default=200, help='Number of messages scanned per run')
+        parser.add_argument('--length', type=int, default=40, help='Words per message')
+        parser.add_argument('--seed', type=int, default=1234)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+
+        def token():
+            return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+
+        words = sorted({token() for _ in range(options['words'])})
+        vocabulary = [token() for _ in range(2000)]
+        messages = []
+        for _ in range(options['messages']):
+            parts = [rng.choice(vocabulary) for _ in range(options['length'])]
+            # Roughly one message in four contains a listed word.
+            if rng.random() < 0.25:
+                parts[rng.randrange(len(parts))] = rng.choice(words).upper()
+            messages.append(' '.join(parts))
+
+        start = time.perf_counter()
+        legacy = [legacy_check_profanity(m, words) for m in messages]
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher = ProfanityMatcher(words)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compiled = [matcher.check(m) for m in messages]
+        compiled_time = time.perf_counter() - start
+
+        mismatches = sum(
+            1 for old, new in zip(legacy, compiled)
+            if old[0] != new[0] or old[2] != new[2]
+        )
+
+        n = len(messages)
+        self.stdout.write(f'  Word list:  {len(words)} words, {n} messages')
+        self.stdout.write(f'  Legacy:     {legacy_time * 1000:.1f} ms total, {legacy_time / n * 1000:.3f} ms/message')
+        self.stdout.write(f'  Compiled:   {compiled_time * 1000:.1f} ms total, {compiled_time / n * 1000:.3f} ms/message '
+                          f'(+{build_time * 1000:.1f} ms one-off build)')
+        if compiled_time:
+            self.stdout.write(f'  Speed-up:   {legacy_time / compiled_time:.1f}x')
+        if mismatches:
+            self.stdout.write(self.style.WARNING(f'  {mismatches} messages differ from the legacy result'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Benchmark complete. Results identical to the legacy scan.'))
@@ -0,0 +1,116 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:00
+
+import os
+
+import django.db.models.deletion
+from cryptography.fernet import Fernet, MultiFernet
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Frozen copies of the messaging crypto and preview helpers as of this
+# migration, so later changes to the app code cannot change what it writes.
+PREVIEW_LENGTH = 50
+KEY_FILE_PATH = os.path.join(getattr(settings, 'BASE_DIR', '.'), '.env', 'messaging_encryption.key')
+
+
+def _current_key():
+    key_env = os.getenv('MESSAGING_ENCRYPTION_KEY')
+    if key_env:
+        return key_env.encode()
+    if os.path.exists(KEY_FILE_PATH):
+        with open(KEY_FILE_PATH, 'rb') as f:
+            key = f.read().strip()
+            if key:
+                return key
+    os.makedirs(os.path.dirname(KEY_FILE_PATH) or '.', exist_ok=True)
+    key = Fernet.generate_key()
+    with open(KEY_FILE_PATH, 'wb') as f:
+        f.write(key)
+    return key
+
+
+def _cipher():
+    raw = os.getenv('MESSAGING_ENCRYPTION_OLD_KEYS', '')
+    keys = [_current_key(), *(k.strip().encode() for k in raw.split(',') if k.strip())]
+    return MultiFernet([Fernet(k) for k in keys])
+
+
+def _decrypt(cipher, encrypted_text):
+    if not encrypted_text:
+        return ''
+    try:
+        return cipher.decrypt(encrypted_text.encode()).decode()
+    except Exception:
+        # Stored unencrypted (encryption failed when the message was sent).
+        return encrypted_text
+
+
+def _preview(content):
+    content = content or ''
+    return content[:PREVIEW_LENGTH] + '...' if len(content) > PREVIEW_LENGTH else content
+
+
+def backfill_last_message(apps, schema_editor):
+    Chat = apps.get_model('messaging', 'Chat')
+    Message = apps.get_model('messaging', 'Message')
+    cipher = None
+    for chat in Chat.objects.all().iterator():
+        latest = (
+            Message.objects.filter(chat_id=chat.pk, is_deleted=False)
+            .order_by('-created_at', '-id')
+            .first()
+        )
+        if latest is None:
+            continue
+        if cipher is None:
+            cipher = _cipher()
+        preview = _preview(_decrypt(cipher, latest.encrypted_content))
+        Chat.objects.filter(pk=chat.pk).update(
+            last_message_id=latest.pk,
+            last_message_sender_id=latest.sender_id,
+            last_message_preview=cipher.encrypt(preview.encode()).decode() if preview else '',
+            last_message_at=latest.created_at,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0005_chatrestrictionauditlog'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chat',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='messaging.message'),
+        ),
+        migrations.AddField(
+            model_name='chat',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='chat',
+            name='last_message_preview',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='chat',
+            name='last_message_sender',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='chatmember',
+            name='last_read_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='chatmember',
+            name='unread_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_last_message, migrations.RunPython.noop),
+    ]
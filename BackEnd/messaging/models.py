@@ -1,8 +1,9 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet
 import os
+import threading
 from django.conf import settings
 from django.core.cache import cache
 
@@ -51,24 +52,56 @@ def get_encryption_key():
     return get_or_create_encryption_key()
 
 
+def get_previous_encryption_keys():
+    """
+    Retired keys that can still decrypt old messages, from the comma separated
+    MESSAGING_ENCRYPTION_OLD_KEYS environment variable (newest first).
+    """
+    raw = os.getenv('MESSAGING_ENCRYPTION_OLD_KEYS', '')
+    return [k.strip().encode() for k in raw.split(',') if k.strip()]
+
+
+_cipher = None
+_cipher_lock = threading.Lock()
+
+
+def get_cipher():
+    """
+    Process-wide cipher, built once from the current key plus any retired keys.
+    New messages are always encrypted with the current key; MultiFernet tries
+    every key on decrypt so rotating MESSAGING_ENCRYPTION_KEY keeps history readable.
+    """
+    global _cipher
+    if _cipher is None:
+        with _cipher_lock:
+            if _cipher is None:
+                keys = [get_encryption_key(), *get_previous_encryption_keys()]
+                _cipher = MultiFernet([Fernet(k) for k in keys])
+    return _cipher
+
+
+def reset_cipher():
+    """Drop the cached cipher so the next call re-reads the keys (after a rotation)."""
+    global _cipher
+    with _cipher_lock:
+        _cipher = None
+
+
 def encrypt_message(text):
     """Encrypt message content."""
     if not text:
         return None
     try:
-        cipher = Fernet(get_encryption_key())
-        return cipher.encrypt(text.encode()).decode()
+        return get_cipher().encrypt(text.encode()).decode()
     except Exception as e:
         print(f"Encryption error: {e}")
         return text  # Return unencrypted if encryption fails
 
 
-def decrypt_message(encrypted_text):
-    """Decrypt message content."""
+def _decrypt_with(cipher, encrypted_text):
     if not encrypted_text:
         return None
     try:
-        cipher = Fernet(get_encryption_key())
         return cipher.decrypt(encrypted_text.encode()).decode()
     except Exception as e:
         print(f"Decryption error: {e}")
@@ -76,6 +109,31 @@ def decrypt_message(encrypted_text):
         return encrypted_text
 
 
+def decrypt_message(encrypted_text):
+    """Decrypt message content."""
+    if not encrypted_text:
+        return None
+    try:
+        cipher = get_cipher()
+    except Exception as e:
+        print(f"Decryption error: {e}")
+        return encrypted_text
+    return _decrypt_with(cipher, encrypted_text)
+
+
+def decrypt_messages(encrypted_texts):
+    """Decrypt many message bodies with a single cipher lookup. Order is preserved."""
+    encrypted_texts = list(encrypted_texts)
+    if not any(encrypted_texts):
+        return [None] * len(encrypted_texts)
+    try:
+        cipher = get_cipher()
+    except Exception as e:
+        print(f"Decryption error: {e}")
+        return [text or None for text in encrypted_texts]
+    return [_decrypt_with(cipher, text) for text in encrypted_texts]
+
+
 
 # ═══════════════════════════════════════════════════════════
 # Profanity Word Management
@@ -167,6 +225,26 @@ class Chat(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Denormalized latest visible message (kept current by messaging.services)
+    # so the chat list never has to touch the messages table.
+    last_message = models.ForeignKey(
+        'Message',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    last_message_sender = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    # Encrypted like the message itself.
+    last_message_preview = models.TextField(blank=True, default='')
+    last_message_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         ordering = ['-updated_at']
         unique_together = [
@@ -196,6 +274,10 @@ class ChatMember(models.Model):
     
     joined_at = models.DateTimeField(auto_now_add=True)
 
+    # Messages from others since the member last opened the chat
+    unread_count = models.PositiveIntegerField(default=0)
+    last_read_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         unique_together = ('chat', 'user')
         ordering = ['joined_at']
@@ -255,12 +337,23 @@ class Message(models.Model):
     @property
     def content(self):
         """Decrypt and return message content."""
-        return decrypt_message(self.encrypted_content)
+        if '_decrypted_content' not in self.__dict__:
+            self._decrypted_content = decrypt_message(self.encrypted_content)
+        return self._decrypted_content
 
     @content.setter
     def content(self, value):
         """Encrypt and store message content."""
         self.encrypted_content = encrypt_message(value)
+        self._decrypted_content = value or None
+
+    @classmethod
+    def decrypt_bulk(cls, messages):
+        """Decrypt a batch of messages up front so `.content` needs no further work."""
+        pending = [m for m in messages if '_decrypted_content' not in m.__dict__]
+        for message, text in zip(pending, decrypt_messages(m.encrypted_content for m in pending)):
+            message._decrypted_content = text
+        return messages
 
     def save(self, *args, **kwargs):
         if not self.encrypted_content and hasattr(self, '_pending_content'):
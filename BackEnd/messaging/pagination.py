@@ -0,0 +1,93 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+# ═══════════════════════════════════════════════════════════
+# MESSAGE HISTORY  —  keyset pagination on (chat, created_at)
+# ═══════════════════════════════════════════════════════════
+def encode_cursor(message):
+    """Opaque cursor for a message's position: its timestamp plus id as a tie-breaker."""
+    raw = f'{message.created_at.isoformat()}|{message.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValidationError({'detail': 'Invalid cursor.'})
+
+
+class MessageHistoryPagination(BasePagination):
+    """
+    Keyset pagination for one chat's messages.
+
+    - no cursor:        the newest page
+    - ?before=<cursor>: the page just older than the cursor
+    - ?after=<cursor>:  the page just newer than the cursor (polling for new messages)
+
+    Each page is a single range scan on the (chat, created_at) index, so the cost
+    does not depend on how long the chat history is. Results are oldest-first.
+    """
+    page_size = 50
+    max_page_size = 200
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.page_size))
+        except (TypeError, ValueError):
+            limit = self.page_size
+        return max(1, min(limit, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        before = request.query_params.get('before')
+        after = request.query_params.get('after')
+        if before and after:
+            raise ValidationError({'detail': 'Use either "before" or "after", not both.'})
+        return self.paginate_keyset(queryset, self.get_limit(request), before=before, after=after)
+
+    def paginate_keyset(self, queryset, limit, before=None, after=None):
+        if after:
+            created_at, pk = decode_cursor(after)
+            rows = list(
+                queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+                .order_by('created_at', 'id')[:limit + 1]
+            )
+            self.has_older = True
+            self.has_newer = len(rows) > limit
+            page = rows[:limit]
+        else:
+            if before:
+                created_at, pk = decode_cursor(before)
+                queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+            rows = list(queryset.order_by('-created_at', '-id')[:limit + 1])
+            self.has_older = len(rows) > limit
+            self.has_newer = bool(before)
+            page = rows[:limit][::-1]
+
+        self.page = page
+        self.after = after
+        return page
+
+    def get_cursors(self):
+        """(older, newer) cursors for the current page."""
+        older = encode_cursor(self.page[0]) if self.page and self.has_older else None
+        # The newest cursor is always returned so clients can poll with ?after=.
+        newer = encode_cursor(self.page[-1]) if self.page else self.after
+        return older, newer
+
+    def get_paginated_response(self, data):
+        older, newer = self.get_cursors()
+        return Response({
+            'results': data,
+            'before': older,
+            'after': newer,
+            'has_older': self.has_older,
+            'has_newer': self.has_newer,
+        })
@@ -2,8 +2,9 @@ from rest_framework import serializers
 from django.utils import timezone
 from .models import (
     ProfanityWord, Chat, ChatMember, Message, ChatRestriction, ChatRestrictionAuditLog, MessageFlag,
-    ChatRequest, MessageReport, MessageDeletionLog, decrypt_message
+    ChatRequest, MessageReport, MessageDeletionLog, decrypt_message, decrypt_messages
 )
+from .pagination import MessageHistoryPagination
 from accounts.models import User, Section, Subject
 
 
@@ -49,6 +50,15 @@ class ChatMemberSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'joined_at']
 
 
+class MessageListSerializer(serializers.ListSerializer):
+    """Decrypts the whole page of messages in one pass before serializing each one."""
+
+    def to_representation(self, data):
+        messages = list(data.all() if hasattr(data, 'all') else data)
+        Message.decrypt_bulk([m for m in messages if not m.is_deleted])
+        return super().to_representation(messages)
+
+
 class MessageSerializer(serializers.ModelSerializer):
     """Serialize messages with decryption."""
     sender = UserMinimalSerializer(read_only=True)
@@ -61,6 +71,7 @@ class MessageSerializer(serializers.ModelSerializer):
             'flagged_words', 'is_deleted', 'created_at'
         ]
         read_only_fields = ['id', 'sender', 'is_flagged', 'is_deleted', 'created_at']
+        list_serializer_class = MessageListSerializer
 
     def get_content(self, obj):
         """Return decrypted content if not deleted."""
@@ -69,6 +80,17 @@ class MessageSerializer(serializers.ModelSerializer):
         return obj.content
 
 
+class ChatSummaryListSerializer(serializers.ListSerializer):
+    """Decrypts every chat's last-message preview in one pass."""
+
+    def to_representation(self, data):
+        chats = list(data.all() if hasattr(data, 'all') else data)
+        previews = decrypt_messages(chat.last_message_preview for chat in chats)
+        for chat, preview in zip(chats, previews):
+            chat._last_message_preview = preview or ''
+        return super().to_representation(chats)
+
+
 class ChatListSerializer(serializers.ModelSerializer):
     """Lightweight chat list serializer."""
     section_name = serializers.CharField(source='section.name', read_only=True, allow_null=True)
@@ -78,14 +100,16 @@ class ChatListSerializer(serializers.ModelSerializer):
     participant_two = UserMinimalSerializer(read_only=True, allow_null=True)
     other_participant = serializers.SerializerMethodField()
     last_message = serializers.SerializerMethodField()
+    unread_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Chat
         fields = [
             'id', 'name', 'chat_type', 'section_name', 'subject_name',
             'creator_name', 'creator', 'participant_two', 'other_participant',
-            'last_message', 'is_active', 'created_at', 'updated_at'
+            'last_message', 'unread_count', 'is_active', 'created_at', 'updated_at'
         ]
+        list_serializer_class = ChatSummaryListSerializer
 
     def get_other_participant(self, obj):
         """Return the other user in individual chats for the current requester."""
@@ -106,15 +130,23 @@ class ChatListSerializer(serializers.ModelSerializer):
         return UserMinimalSerializer(other).data if other else None
 
     def get_last_message(self, obj):
-        """Get the most recent message in chat."""
-        last_msg = obj.messages.filter(is_deleted=False).last()
-        if last_msg:
-            return {
-                'sender': last_msg.sender.username,
-                'preview': last_msg.content[:50] + '...' if len(last_msg.content or '') > 50 else last_msg.content,
-                'created_at': last_msg.created_at,
-            }
-        return None
+        """Most recent visible message, read from the chat's denormalized summary."""
+        if not obj.last_message_id:
+            return None
+        preview = getattr(obj, '_last_message_preview', None)
+        if preview is None:
+            preview = decrypt_message(obj.last_message_preview) or ''
+        sender = obj.last_message_sender
+        return {
+            'id': obj.last_message_id,
+            'sender': sender.username if sender else None,
+            'preview': preview,
+            'created_at': obj.last_message_at,
+        }
+
+    def get_unread_count(self, obj):
+        """Unread messages for the requesting user (annotated by ChatViewSet)."""
+        return getattr(obj, 'my_unread_count', None) or 0
 
 
 class ChatDetailSerializer(serializers.ModelSerializer):
@@ -124,18 +156,39 @@ class ChatDetailSerializer(serializers.ModelSerializer):
     creator = UserMinimalSerializer(read_only=True)
     participant_two = UserMinimalSerializer(read_only=True, allow_null=True)
     members = ChatMemberSerializer(many=True, read_only=True)
-    messages = MessageSerializer(many=True, read_only=True)
+    messages = serializers.SerializerMethodField()
+    messages_before = serializers.SerializerMethodField()
     current_user_restriction = serializers.SerializerMethodField()
 
     class Meta:
         model = Chat
         fields = [
             'id', 'name', 'chat_type', 'section_name', 'subject_name',
-            'creator', 'participant_two', 'members', 'messages',
+            'creator', 'participant_two', 'members', 'messages', 'messages_before',
             'current_user_restriction', 'is_active', 'created_at', 'updated_at', 'school_year'
         ]
         read_only_fields = ['creator', 'created_at', 'updated_at']
 
+    def _latest_page(self, obj):
+        """Newest page of the history; older pages come from /chats/{id}/messages/?before=."""
+        pages = self.__dict__.setdefault('_latest_pages', {})
+        if obj.pk not in pages:
+            paginator = MessageHistoryPagination()
+            page = paginator.paginate_keyset(
+                obj.messages.select_related('sender__profile'), paginator.page_size
+            )
+            pages[obj.pk] = (page, paginator.get_cursors()[0])
+        return pages[obj.pk]
+
+    def get_messages(self, obj):
+        page, _ = self._latest_page(obj)
+        return MessageSerializer(page, many=True, context=self.context).data
+
+    def get_messages_before(self, obj):
+        """Cursor for the next older page, or None when the whole history is already included."""
+        _, older = self._latest_page(obj)
+        return older
+
     def get_current_user_restriction(self, obj):
         request = self.context.get('request')
         user = getattr(request, 'user', None)
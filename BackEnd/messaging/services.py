@@ -0,0 +1,189 @@
+import re
+import threading
+import time
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q
+from django.utils import timezone
+
+from .models import ProfanityWord, Chat, ChatMember, Message, encrypt_message
+
+
+# ═══════════════════════════════════════════════════════════
+# PROFANITY MATCHER  —  compiled once, shared by every request
+# ═══════════════════════════════════════════════════════════
+# How often each process re-reads the word list's fingerprint; changes made
+# through another worker are picked up within this many seconds.
+PROFANITY_RECHECK_SECONDS = 30
+
+
+def _trie_pattern(words):
+    """
+    Regex source for a set of words, factored into a prefix trie so the regex
+    engine follows one branch per character instead of trying every word.
+    Optional groups are greedy, so a phrase wins over a shorter word it starts with.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        ends_here = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if ends_here:
+            # Optional continuation; \b after the group lets the engine back off to the shorter word.
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class ProfanityMatcher:
+    """
+    One case-insensitive regex over the whole word list, matched in a single
+    pass. Longer words are preferred so phrases win over the words inside them.
+    """
+
+    def __init__(self, words):
+        words = sorted({w.strip().lower() for w in words if w and w.strip()})
+        self.words = words
+        self.pattern = (
+            re.compile(r'\b' + _trie_pattern(words) + r'\b', re.IGNORECASE)
+            if words else None
+        )
+
+    def check(self, text):
+        """
+        Scan and censor text in a single pass.
+        Returns: (is_flagged, flagged_words, censored_text)
+        """
+        if not text or self.pattern is None:
+            return False, [], text
+
+        flagged = []
+        seen = set()
+
+        def censor(match):
+            found = match.group()
+            if found.lower() not in seen:
+                seen.add(found.lower())
+                flagged.append(found)
+            return '*' * len(found)
+
+        censored = self.pattern.sub(censor, text)
+        return bool(flagged), flagged, censored
+
+
+_matcher = None
+_matcher_version = None
+_matcher_checked_at = 0.0
+_matcher_lock = threading.Lock()
+
+
+def _profanity_version():
+    """Fingerprint of the word list: changes on every add, edit or delete."""
+    return tuple(ProfanityWord.objects.aggregate(count=Count('id'), latest=Max('updated_at')).values())
+
+
+def get_profanity_matcher():
+    """
+    Process-wide matcher for the active word list. The list's fingerprint is
+    read from the database at most every PROFANITY_RECHECK_SECONDS, and the
+    matcher is rebuilt only when it changed.
+    """
+    global _matcher, _matcher_version, _matcher_checked_at
+    if _matcher is not None and time.monotonic() - _matcher_checked_at < PROFANITY_RECHECK_SECONDS:
+        return _matcher
+    with _matcher_lock:
+        version = _profanity_version()
+        if _matcher is None or _matcher_version != version:
+            words = ProfanityWord.objects.filter(is_active=True).values_list('word', flat=True)
+            _matcher = ProfanityMatcher(words)
+            _matcher_version = version
+        _matcher_checked_at = time.monotonic()
+    return _matcher
+
+
+def invalidate_profanity_matcher():
+    """Rebuild this process's matcher on the next message; other processes follow within the recheck window."""
+    global _matcher
+    with _matcher_lock:
+        _matcher = None
+
+
+# ═══════════════════════════════════════════════════════════
+# CHAT SUMMARY  —  denormalized last message + unread counters
+# ═══════════════════════════════════════════════════════════
+PREVIEW_LENGTH = 50
+
+
+def message_preview(content):
+    """Short preview shown in the chat list."""
+    content = content or ''
+    return content[:PREVIEW_LENGTH] + '...' if len(content) > PREVIEW_LENGTH else content
+
+
+def _last_message_fields(message):
+    if message is None:
+        return {
+            'last_message': None,
+            'last_message_sender': None,
+            'last_message_preview': '',
+            'last_message_at': None,
+        }
+    return {
+        'last_message': message,
+        'last_message_sender_id': message.sender_id,
+        'last_message_preview': encrypt_message(message_preview(message.content)) or '',
+        'last_message_at': message.created_at,
+    }
+
+
+def record_new_message(message):
+    """
+    Point the chat summary at a freshly sent message and bump every other
+    member's unread counter. Two UPDATEs, regardless of chat size.
+    """
+    with transaction.atomic():
+        Chat.objects.filter(pk=message.chat_id).update(**_last_message_fields(message))
+        ChatMember.objects.filter(chat_id=message.chat_id).exclude(
+            user_id=message.sender_id
+        ).update(unread_count=F('unread_count') + 1)
+
+
+def record_message_deleted(message):
+    """
+    Undo a deleted message's effect on the chat summary: re-point the last
+    message if needed and drop it from the counters of members who had not read it yet.
+    """
+    with transaction.atomic():
+        ChatMember.objects.filter(
+            Q(last_read_at__isnull=True) | Q(last_read_at__lt=message.created_at),
+            chat_id=message.chat_id,
+            unread_count__gt=0,
+        ).exclude(user_id=message.sender_id).update(unread_count=F('unread_count') - 1)
+
+        chat = Chat.objects.select_for_update().filter(pk=message.chat_id).first()
+        if chat is not None and chat.last_message_id in (message.pk, None):
+            refresh_last_message(chat)
+
+
+def refresh_last_message(chat):
+    """Recompute the chat summary from the latest visible message (one indexed query)."""
+    latest = (
+        Message.objects.filter(chat_id=chat.pk, is_deleted=False)
+        .order_by('-created_at', '-id')
+        .first()
+    )
+    Chat.objects.filter(pk=chat.pk).update(**_last_message_fields(latest))
+
+
+def mark_chat_read(chat, user):
+    """Reset the user's unread counter for a chat."""
+    ChatMember.objects.filter(chat=chat, user=user).update(unread_count=0, last_read_at=timezone.now())
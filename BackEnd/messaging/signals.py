@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Chat, Message, ProfanityWord
+from .services import invalidate_profanity_matcher, record_message_deleted
+
+
+# ═══════════════════════════════════════════════════════════
+# PROFANITY LIST  —  rebuild the compiled matcher on any change
+# (ProfanityWordViewSet and the Django admin both go through save/delete)
+# ═══════════════════════════════════════════════════════════
+@receiver(post_save, sender=ProfanityWord)
+@receiver(post_delete, sender=ProfanityWord)
+def profanity_word_changed(sender, **kwargs):
+    invalidate_profanity_matcher()
+
+
+# ═══════════════════════════════════════════════════════════
+# CHAT SUMMARY  —  hard deletes (DELETE /messages/<id>/, admin, cascades)
+# undo the message like a soft delete does
+# ═══════════════════════════════════════════════════════════
+@receiver(post_delete, sender=Message)
+def message_hard_deleted(sender, instance, origin=None, **kwargs):
+    # Soft-deleted messages were already taken out of the summary;
+    # a deleted chat takes its summary and members with it.
+    if instance.is_deleted or isinstance(origin, Chat):
+        return
+    record_message_deleted(instance)
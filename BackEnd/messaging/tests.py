@@ -1,3 +1,246 @@
+import os
+import time
+from unittest import mock
+
+from cryptography.fernet import Fernet
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from . import models as messaging_models
+from .models import Chat, ChatMember, Message, ProfanityWord, encrypt_message, decrypt_message, decrypt_messages, reset_cipher
+from .serializers import MessageSerializer
+from .services import PROFANITY_RECHECK_SECONDS, ProfanityMatcher, get_profanity_matcher
+from .views import check_profanity
+
+
+class MessageEncryptionTest(TestCase):
+    def setUp(self):
+        self.key = Fernet.generate_key().decode()
+        patcher = mock.patch.dict(os.environ, {'MESSAGING_ENCRYPTION_KEY': self.key})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        reset_cipher()
+        self.addCleanup(reset_cipher)
+
+        self.user = User.objects.create_user(
+            username='teacher1', email='teacher1@test.com', password='testpass123', role='TEACHER'
+        )
+        self.chat = Chat.objects.create(name='Class chat', chat_type='GROUP_CLASS', creator=self.user)
+
+    def test_cipher_built_once_per_process(self):
+        with mock.patch.object(
+            messaging_models, 'get_or_create_encryption_key', wraps=messaging_models.get_or_create_encryption_key
+        ) as get_key:
+            tokens = [encrypt_message(f'hello {i}') for i in range(5)]
+            self.assertEqual(decrypt_messages(tokens + [None]), [f'hello {i}' for i in range(5)] + [None])
+            self.assertEqual(get_key.call_count, 1)
+
+    def test_rotated_key_still_decrypts_old_messages(self):
+        old_token = encrypt_message('before rotation')
+        new_key = Fernet.generate_key().decode()
+        with mock.patch.dict(os.environ, {
+            'MESSAGING_ENCRYPTION_KEY': new_key,
+            'MESSAGING_ENCRYPTION_OLD_KEYS': self.key,
+        }):
+            reset_cipher()
+            self.assertEqual(decrypt_message(old_token), 'before rotation')
+            new_token = encrypt_message('after rotation')
+            self.assertEqual(Fernet(new_key.encode()).decrypt(new_token.encode()), b'after rotation')
+
+    def test_list_serializer_decrypts_page_in_one_pass(self):
+        for i in range(3):
+            message = Message(chat=self.chat, sender=self.user)
+            message.content = f'message {i}'
+            message.save()
+        Message.objects.filter(pk=message.pk).update(is_deleted=True)
+
+        messages = list(Message.objects.filter(chat=self.chat).order_by('created_at', 'id'))
+        with mock.patch.object(messaging_models, 'decrypt_messages', wraps=decrypt_messages) as bulk, \
+                mock.patch.object(messaging_models, 'decrypt_message') as single:
+            data = MessageSerializer(messages, many=True).data
+
+        self.assertEqual(bulk.call_count, 1)
+        single.assert_not_called()
+        self.assertEqual(
+            [row['content'] for row in data],
+            ['message 0', 'message 1', '[Message deleted by admin]'],
+        )
+
+
+class ProfanityMatcherTest(TestCase):
+    def test_single_pass_flags_and_censors(self):
+        matcher = ProfanityMatcher(['darn', 'dang it', 'heck'])
+        is_flagged, flagged, censored = matcher.check('Darn, DANG IT and darn again. Heckle is fine.')
+        self.assertTrue(is_flagged)
+        self.assertEqual(flagged, ['Darn', 'DANG IT'])
+        self.assertEqual(censored, '****, ******* and **** again. Heckle is fine.')
+        self.assertEqual(matcher.check('all clean'), (False, [], 'all clean'))
+        self.assertEqual(ProfanityMatcher([]).check('darn'), (False, [], 'darn'))
+
+    def test_word_changes_invalidate_matcher(self):
+        word = ProfanityWord.objects.create(word='darn')
+        self.assertTrue(check_profanity('oh darn')[0])
+        with self.assertNumQueries(0):
+            get_profanity_matcher()
+
+        word.is_active = False
+        word.save()
+        self.assertFalse(check_profanity('oh darn')[0])
+
+        ProfanityWord.objects.create(word='heck')
+        self.assertEqual(check_profanity('heck')[1], ['heck'])
+        ProfanityWord.objects.filter(word='heck').delete()
+        self.assertFalse(check_profanity('heck')[0])
+
+        # Written by another process: no signal here, picked up after the recheck window.
+        ProfanityWord.objects.bulk_create([ProfanityWord(word='drat')])
+        self.assertFalse(check_profanity('drat')[0])
+        later = time.monotonic() + PROFANITY_RECHECK_SECONDS
+        with mock.patch('messaging.services.time.monotonic', return_value=later):
+            self.assertTrue(check_profanity('drat')[0])
+
+
+class ChatSummaryTest(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(
+            username='teacher1', email='teacher1@test.com', password='testpass123', role='TEACHER'
+        )
+        self.student = User.objects.create_user(
+            username='student1', email='student1@test.com', password='testpass123', role='PARENT_STUDENT'
+        )
+        self.chat = Chat.objects.create(
+            chat_type='INDIVIDUAL', creator=self.teacher, participant_two=self.student
+        )
+        ChatMember.objects.create(chat=self.chat, user=self.teacher, is_admin=True)
+        ChatMember.objects.create(chat=self.chat, user=self.student)
+        self.client = APIClient()
+
+    def _send(self, user, content):
+        self.client.force_authenticate(user)
+        response = self.client.post('/api/messaging/messages/', {'chat': self.chat.id, 'content': content})
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def _chat_list(self, user):
+        self.client.force_authenticate(user)
+        response = self.client.get('/api/messaging/chats/')
+        self.assertEqual(response.status_code, 200)
+        return response.data[0]
+
+    def test_send_and_delete_update_summary_and_unread(self):
+        first = self._send(self.teacher, 'Hello there')
+        second = self._send(self.teacher, 'x' * 60)
+
+        row = self._chat_list(self.student)
+        self.assertEqual(row['last_message']['id'], second)
+        self.assertEqual(row['last_message']['sender'], 'teacher1')
+        self.assertEqual(row['last_message']['preview'], 'x' * 50 + '...')
+        self.assertEqual(row['unread_count'], 2)
+        self.assertEqual(self._chat_list(self.teacher)['unread_count'], 0)
+
+        self.client.force_authenticate(self.teacher)
+        response = self.client.delete(
+            f'/api/messaging/messages/{second}/delete_by_admin/', {'reason': 'spam'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        row = self._chat_list(self.student)
+        self.assertEqual(row['last_message']['id'], first)
+        self.assertEqual(row['last_message']['preview'], 'Hello there')
+        self.assertEqual(row['unread_count'], 1)
+
+        self.client.get(f'/api/messaging/chats/{self.chat.id}/')
+        self.assertEqual(self._chat_list(self.teacher)['unread_count'], 0)
+        self.client.force_authenticate(self.student)
+        self.client.post(f'/api/messaging/chats/{self.chat.id}/mark_read/')
+        self.assertEqual(self._chat_list(self.student)['unread_count'], 0)
+
+    def test_hard_delete_updates_summary_and_unread(self):
+        first = self._send(self.teacher, 'Hello there')
+        second = self._send(self.teacher, 'Second')
+
+        self.client.force_authenticate(self.teacher)
+        response = self.client.delete(f'/api/messaging/messages/{second}/')
+        self.assertEqual(response.status_code, 204)
+
+        row = self._chat_list(self.student)
+        self.assertEqual(row['last_message']['id'], first)
+        self.assertEqual(row['last_message']['preview'], 'Hello there')
+        self.assertEqual(row['unread_count'], 1)
+
+        Message.objects.get(pk=first).delete()
+        row = self._chat_list(self.student)
+        self.assertIsNone(row['last_message'])
+        self.assertEqual(row['unread_count'], 0)
+        self.chat.refresh_from_db()
+        self.assertEqual(self.chat.last_message_preview, '')
+        self.assertIsNone(self.chat.last_message_at)
+
+    def test_chat_list_query_count_does_not_depend_on_messages(self):
+        self._send(self.teacher, 'one')
+        self.client.force_authenticate(self.student)
+        with self.assertNumQueries(2):
+            self.client.get('/api/messaging/chats/')
+
+        for i in range(10):
+            self._send(self.teacher, f'message {i}')
+        self.client.force_authenticate(self.student)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/messaging/chats/')
+        self.assertEqual(response.data[0]['unread_count'], 11)
+
+
+class MessageHistoryTest(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(
+            username='teacher1', email='teacher1@test.com', password='testpass123', role='TEACHER'
+        )
+        self.outsider = User.objects.create_user(
+            username='teacher2', email='teacher2@test.com', password='testpass123', role='TEACHER'
+        )
+        self.chat = Chat.objects.create(name='Project', chat_type='GROUP_PROJECT', creator=self.teacher)
+        ChatMember.objects.create(chat=self.chat, user=self.teacher, is_admin=True)
+        self.messages = []
+        for i in range(7):
+            message = Message(chat=self.chat, sender=self.teacher)
+            message.content = f'message {i}'
+            message.save()
+            self.messages.append(message)
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+        self.url = f'/api/messaging/chats/{self.chat.id}/messages/'
+
+    def _contents(self, response):
+        return [row['content'] for row in response.data['results']]
+
+    def test_before_and_after_cursors_walk_the_history(self):
+        newest = self.client.get(self.url, {'limit': 3})
+        self.assertEqual(self._contents(newest), ['message 4', 'message 5', 'message 6'])
+        self.assertTrue(newest.data['has_older'])
+
+        older = self.client.get(self.url, {'limit': 3, 'before': newest.data['before']})
+        self.assertEqual(self._contents(older), ['message 1', 'message 2', 'message 3'])
+
+        oldest = self.client.get(self.url, {'limit': 3, 'before': older.data['before']})
+        self.assertEqual(self._contents(oldest), ['message 0'])
+        self.assertFalse(oldest.data['has_older'])
+        self.assertIsNone(oldest.data['before'])
+
+        newer = self.client.get(self.url, {'limit': 2, 'after': oldest.data['after']})
+        self.assertEqual(self._contents(newer), ['message 1', 'message 2'])
+        self.assertTrue(newer.data['has_newer'])
+
+        caught_up = self.client.get(self.url, {'after': newest.data['after']})
+        self.assertEqual(caught_up.data['results'], [])
+        self.assertEqual(caught_up.data['after'], newest.data['after'])
+
+    def test_detail_returns_latest_page_and_rejects_bad_input(self):
+        with mock.patch('messaging.pagination.MessageHistoryPagination.page_size', 5):
+            detail = self.client.get(f'/api/messaging/chats/{self.chat.id}/')
+        self.assertEqual([m['content'] for m in detail.data['messages']][0], 'message 2')
+        self.assertIsNotNone(detail.data['messages_before'])
 
-# Create your tests here.
+        self.assertEqual(self.client.get(self.url, {'before': 'not-a-cursor'}).status_code, 400)
+        self.client.force_authenticate(self.outsider)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
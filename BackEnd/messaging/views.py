@@ -4,8 +4,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 from datetime import timedelta
-from django.db.models import Q, Count
-import re
+from django.db.models import Q, Count, OuterRef, Subquery
 
 from .models import (
     ProfanityWord, Chat, ChatMember, Message, ChatRestriction, ChatRestrictionAuditLog, MessageFlag,
@@ -18,41 +17,20 @@ from .serializers import (
     ChatCreateSerializer, MessageCreateSerializer, ChatRequestSerializer,
     ChatRequestCreateSerializer, MessageReportSerializer, MessageReportCreateSerializer
 )
+from .pagination import MessageHistoryPagination
+from .services import get_profanity_matcher, mark_chat_read, record_new_message, record_message_deleted
 from accounts.models import User, Section, Subject
 
 
 # ═══════════════════════════════════════════════════════════
 # PROFANITY FILTERING UTILITIES
 # ═══════════════════════════════════════════════════════════
-def get_active_profanity_words():
-    """Get all active profanity words (cached in production)."""
-    return list(ProfanityWord.objects.filter(is_active=True).values_list('word', flat=True))
-
-
 def check_profanity(text):
     """
     Scan text for profanity.
     Returns: (is_flagged, flagged_words, censored_text)
     """
-    if not text:
-        return False, [], text
-
-    active_words = get_active_profanity_words()
-    flagged = []
-    censored = text
-
-    for word in active_words:
-        pattern = rf'\b{re.escape(word)}\b'
-        matches = re.finditer(pattern, censored, re.IGNORECASE)
-        
-        for match in matches:
-            if word.lower() not in [w.lower() for w in flagged]:
-                flagged.append(match.group())
-        
-        # Censor the word
-        censored = re.sub(pattern, '*' * len(word), censored, flags=re.IGNORECASE)
-
-    return len(flagged) > 0, flagged, censored
+    return get_profanity_matcher().check(text)
 
 
 # ═══════════════════════════════════════════════════════════
@@ -129,9 +107,42 @@ class ChatViewSet(viewsets.ModelViewSet):
             chat__isnull=False
         ).values_list('chat_id', flat=True)
 
-        return user_chats.exclude(id__in=restricted_chat_ids).prefetch_related(
-            'members__user', 'messages__sender'
+        queryset = user_chats.exclude(id__in=restricted_chat_ids).select_related(
+            'section', 'subject', 'creator__profile', 'participant_two__profile', 'last_message_sender'
+        ).annotate(
+            my_unread_count=Subquery(
+                ChatMember.objects.filter(chat=OuterRef('pk'), user=user).values('unread_count')[:1]
+            )
         )
+        if self.action == 'retrieve':
+            # Only the detail view renders members; messages are paged separately.
+            queryset = queryset.prefetch_related('members__user')
+        return queryset
+
+    def retrieve(self, request, *args, **kwargs):
+        """Chat detail; opening a chat marks it as read for the requester."""
+        chat = self.get_object()
+        mark_chat_read(chat, request.user)
+        return Response(self.get_serializer(chat).data)
+
+    @action(detail=True, methods=['get'])
+    def messages(self, request, pk=None):
+        """
+        Cursor-paginated message history for one chat.
+        ?before=<cursor> for older messages, ?after=<cursor> for newer ones, ?limit= (max 200).
+        """
+        chat = self.get_object()
+        paginator = MessageHistoryPagination()
+        page = paginator.paginate_queryset(
+            Message.objects.filter(chat=chat).select_related('sender__profile'), request, view=self
+        )
+        return paginator.get_paginated_response(MessageSerializer(page, many=True).data)
+
+    @action(detail=True, methods=['post'])
+    def mark_read(self, request, pk=None):
+        """Reset the requester's unread counter for this chat."""
+        mark_chat_read(self.get_object(), request.user)
+        return Response({'detail': 'Chat marked as read.', 'unread_count': 0}, status=status.HTTP_200_OK)
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -407,14 +418,19 @@ class MessageViewSet(viewsets.ModelViewSet):
     """Manage messages (create, list, delete)."""
     permission_classes = [IsAuthenticated]
     serializer_class = MessageSerializer
+    pagination_class = MessageHistoryPagination
 
     def get_queryset(self):
-        """Get messages from chats user is member of."""
+        """Get messages from chats user is member of (optionally one chat via ?chat=)."""
         user = self.request.user
         user_chats = Chat.objects.filter(
             Q(members__user=user) | Q(creator=user)
         ).values_list('id', flat=True)
-        return Message.objects.filter(chat_id__in=user_chats).prefetch_related('sender')
+        queryset = Message.objects.filter(chat_id__in=user_chats).select_related('sender__profile')
+        chat_id = self.request.query_params.get('chat')
+        if self.action == 'list' and chat_id and chat_id.isdigit():
+            queryset = queryset.filter(chat_id=chat_id)
+        return queryset
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -508,6 +524,7 @@ class MessageViewSet(viewsets.ModelViewSet):
         )
         message.content = censored_content  # Encrypt censored version
         message.save()
+        record_new_message(message)
 
         # Create flag if profanity detected
         if is_flagged:
@@ -540,11 +557,14 @@ class MessageViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        was_deleted = message.is_deleted
         message.is_deleted = True
         message.deleted_by = request.user
         message.deleted_at = timezone.now()
         message.deletion_reason = reason
         message.save()
+        if not was_deleted:
+            record_message_deleted(message)
 
         # Audit log for deletion
         MessageDeletionLog.objects.create(
@@ -595,10 +615,13 @@ class MessageFlagViewSet(viewsets.ReadOnlyModelViewSet):
         admin_notes = request.data.get('admin_notes', '')
 
         if action_type == 'delete':
+            was_deleted = flag.message.is_deleted
             flag.message.is_deleted = True
             flag.message.deleted_by = request.user
             flag.message.deleted_at = timezone.now()
             flag.message.save()
+            if not was_deleted:
+                record_message_deleted(flag.message)
             flag.status = 'DELETED'
 
         elif action_type == 'restrict':
@@ -985,11 +1008,14 @@ class MessageReportViewSet(viewsets.ModelViewSet):
 
         if action == 'delete':
             # Delete the reported message
+            was_deleted = report.message.is_deleted
             report.message.is_deleted = True
             report.message.deleted_by = request.user
             report.message.deleted_at = timezone.now()
             report.message.deletion_reason = 'Deleted by admin due to report'
             report.message.save()
+            if not was_deleted:
+                record_message_deleted(report.message)
             report.status = 'RESOLVED'
 
         elif action == 'dismiss':
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+
+from .models import Reminder
+from finance.models import Transaction
+
+User = get_user_model()
+
+
+def pending_payment_transactions():
+    return Transaction.objects.select_related("parent").filter(
+        status__in=["PENDING", "OVERDUE"]
+    )
+
+
+def create_bulk_payment_reminders(sender_id):
+    """
+    Job handler: one PAYMENT reminder per pending/overdue transaction, inserted
+    with a single bulk_create. Returns the number of reminders created.
+    """
+    sender = User.objects.filter(pk=sender_id).first()
+
+    reminders = []
+    for transaction in pending_payment_transactions():
+        amount = getattr(transaction, "amount", None)
+        due_date = getattr(transaction, "due_date", None)
+        transaction_type = getattr(transaction, "transaction_type", "Payment")
+
+        due_text = f" Due date: {due_date}." if due_date else ""
+        amount_text = f"Amount due: ₱{amount}." if amount is not None else ""
+
+        reminders.append(Reminder(
+            recipient=transaction.parent,
+            sender=sender,
+            title=f"Payment Reminder - {transaction_type}",
+            message=(
+                f"Good day. This is a reminder regarding your child's {transaction_type}. "
+                f"{amount_text}{due_text} Please settle this payment as soon as possible."
+            ).strip(),
+            reminder_type="PAYMENT",
+            transaction=transaction,
+            is_read=False,
+        ))
+
+    Reminder.objects.bulk_create(reminders, batch_size=500)
+    return len(reminders)
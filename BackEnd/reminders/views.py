@@ -7,7 +7,9 @@ from django.contrib.auth import get_user_model
 
 from .models import Reminder
 from .serializers import ReminderSerializer
+from .services import pending_payment_transactions
 from finance.models import Transaction
+from jobs.services import enqueue
 
 User = get_user_model()
 
@@ -177,38 +179,13 @@ def send_bulk_payment_reminders(request):
             status=status.HTTP_403_FORBIDDEN
         )
 
-    transactions = Transaction.objects.select_related("parent").filter(
-        status__in=["PENDING", "OVERDUE"]
-    )
-
-    created = []
-
-    for transaction in transactions:
-        recipient = transaction.parent
-        amount = getattr(transaction, "amount", None)
-        due_date = getattr(transaction, "due_date", None)
-        transaction_type = getattr(transaction, "transaction_type", "Payment")
-
-        due_text = f" Due date: {due_date}." if due_date else ""
-        amount_text = f"Amount due: ₱{amount}." if amount is not None else ""
-
-        reminder = Reminder.objects.create(
-            recipient=recipient,
-            sender=request.user,
-            title=f"Payment Reminder - {transaction_type}",
-            message=(
-                f"Good day. This is a reminder regarding your child's {transaction_type}. "
-                f"{amount_text}{due_text} Please settle this payment as soon as possible."
-            ).strip(),
-            reminder_type="PAYMENT",
-            transaction=transaction,
-            is_read=False,
-        )
-        created.append(reminder.id)
+    # Creating one reminder per transaction runs in the job worker.
+    count = pending_payment_transactions().count()
+    enqueue("reminders.services.create_bulk_payment_reminders", {"sender_id": request.user.pk})
 
     return Response(
-        {"detail": f"{len(created)} payment reminders sent successfully."},
-        status=status.HTTP_201_CREATED,
+        {"detail": f"{count} payment reminders queued for sending."},
+        status=status.HTTP_202_ACCEPTED,
     )
     
     
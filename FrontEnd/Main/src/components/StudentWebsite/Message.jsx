@@ -3,6 +3,7 @@ import "../StudentWebsiteCSS/Message.css";
 import {
   listChats,
   getChatDetail,
+  getChatMessages,
   updateChat,
   createClassChat,
   createProjectChat,
@@ -23,6 +24,9 @@ const StudentMessage = () => {
   const [chats, setChats] = useState([]);
   const [selectedChat, setSelectedChat] = useState(null);
   const [messages, setMessages] = useState([]);
+  const [olderCursor, setOlderCursor] = useState(null);
+  const [loadingOlder, setLoadingOlder] = useState(false);
+  const prependScrollRef = useRef(null);
   const [input, setInput] = useState("");
   const [image, setImage] = useState(null);
   const [loading, setLoading] = useState(true);
@@ -76,7 +80,13 @@ const StudentMessage = () => {
 
   useEffect(() => {
     if (scrollRef.current) {
-      scrollRef.current.scrollTop = scrollRef.current.scrollHeight;
+      if (prependScrollRef.current !== null) {
+        // Older messages were prepended: keep the current view in place.
+        scrollRef.current.scrollTop = scrollRef.current.scrollHeight - prependScrollRef.current;
+        prependScrollRef.current = null;
+      } else {
+        scrollRef.current.scrollTop = scrollRef.current.scrollHeight;
+      }
     }
   }, [messages]);
 
@@ -146,12 +156,30 @@ const StudentMessage = () => {
       const chatData = await getChatDetail(chatId);
       setSelectedChat(chatData);
       setMessages(chatData.messages || []);
+      setOlderCursor(chatData.messages_before || null);
       setError("");
     } catch (err) {
       setError("Failed to load chat");
     }
   };
 
+  const loadOlderMessages = async () => {
+    if (!selectedChat || !olderCursor || loadingOlder) return;
+    setLoadingOlder(true);
+    try {
+      const page = await getChatMessages(selectedChat.id, { before: olderCursor });
+      if (scrollRef.current) {
+        prependScrollRef.current = scrollRef.current.scrollHeight - scrollRef.current.scrollTop;
+      }
+      setMessages((prev) => [...(page.results || []), ...prev]);
+      setOlderCursor(page.before || null);
+    } catch (err) {
+      setError("Failed to load older messages");
+    } finally {
+      setLoadingOlder(false);
+    }
+  };
+
   const handleSelectChat = (chat) => {
     loadChatDetail(chat.id);
   };
@@ -833,6 +861,13 @@ const StudentMessage = () => {
 
               {/* chat body */}
               <div className="chatBody" ref={scrollRef}>
+                {olderCursor && (
+                  <div style={{textAlign: "center", padding: "8px"}}>
+                    <button type="button" onClick={loadOlderMessages} disabled={loadingOlder}>
+                      {loadingOlder ? "Loading..." : "Load older messages"}
+                    </button>
+                  </div>
+                )}
                 {messages.length === 0 ? (
                   <div style={{textAlign: "center", padding: "40px", color: "#999"}}>
                     Start the conversation!
@@ -116,6 +116,7 @@ const Grade = () => {
   const [publishMessage, setPublishMessage] = useState("");
   const [showPublishModal, setShowPublishModal] = useState(false);
   const [publishPreviewRows, setPublishPreviewRows] = useState([]);
+  const [publishPreviewToken, setPublishPreviewToken] = useState(null);
   const [publishCanConfirm, setPublishCanConfirm] = useState(false);
   const [publishPreviewError, setPublishPreviewError] = useState("");
   const [publishLoading, setPublishLoading] = useState(false);
@@ -691,6 +692,7 @@ const Grade = () => {
         setShowPublishModal(false);
       } else {
         setPublishPreviewRows(Array.isArray(data.rows) ? data.rows : []);
+        setPublishPreviewToken(data.preview_token || null);
         setPublishCanConfirm(!!data.can_publish);
         setShowPublishModal(true);
         if (!data.can_publish) {
@@ -725,6 +727,7 @@ const Grade = () => {
         section_id: Number(selectedSection),
         subject_id: Number(teacherSubject.subject_id),
         school_year: schoolYearLabel,
+        preview_token: publishPreviewToken,
       };
 
       const res = await apiFetch(`${API}/api/grades/publish-history/`, {
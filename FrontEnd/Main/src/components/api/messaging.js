@@ -118,6 +118,15 @@ export async function deleteChat(chatId) {
 // MESSAGE OPERATIONS
 // ═══════════════════════════════════════════════════════════
 
+export async function getChatMessages(chatId, { before, after, limit } = {}) {
+  const params = new URLSearchParams();
+  if (before) params.append('before', before);
+  if (after) params.append('after', after);
+  if (limit) params.append('limit', limit);
+  const query = params.toString();
+  return apiFetchData(`${API_BASE}/chats/${chatId}/messages/${query ? `?${query}` : ''}`);
+}
+
 export async function sendMessage(chatId, content, imageFile = null) {
   const formData = new FormData();
   formData.append('chat', chatId);
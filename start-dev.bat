@@ -2,7 +2,7 @@
 chcp 65001 >nul 2>&1
 REM =============================================
 REM  CESI Project - Start Development Servers
-REM  Django (port 8000) + React/Vite (port 5173)
+REM  Django (port 8000) + job worker + React/Vite (port 5173)
 REM
 REM  Run from the project ROOT folder:
 REM    start-dev.bat
@@ -112,12 +112,17 @@ echo =============================================
 echo.
 echo    TIP: Open http://localhost:5173 in your browser
 echo    Django runs in the OTHER window that just opened.
+echo    The job worker (emails, reminders, publishing) runs in a third window.
 echo    Press Ctrl+C here to stop the React server.
 echo.
 
 REM Start Django in a separate CMD window (use full paths to avoid quote issues)
 start "CESI Django Server" cmd /k "cd /d "%BACKEND%" & call "%VENV_ACTIVATE%" & echo. & echo ======================================== & echo   Django server running on port 8000 & echo   Press Ctrl+C to stop & echo ======================================== & echo. & "%VENV_PYTHON%" manage.py runserver"
 
+REM Start the job worker in its own window: password-reset and approval emails,
+REM payment reminders and school-wide publishing only run from here.
+start "CESI Job Worker" cmd /k "cd /d "%BACKEND%" & call "%VENV_ACTIVATE%" & echo. & echo ======================================== & echo   Job worker running (manage.py run_worker) & echo   Press Ctrl+C to stop & echo ======================================== & echo. & "%VENV_PYTHON%" manage.py run_worker"
+
 REM Start Vite in THIS window
 cd /d "%FRONTEND%"
 call npm run dev
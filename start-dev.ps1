@@ -10,7 +10,8 @@
       5. Import seed data from db_backup.json (if available)
       6. Set up default school rooms
       7. Start Django dev server (port 8000)
-      8. Start Vite/React dev server (port 5173)
+      8. Start the background job worker (manage.py run_worker)
+      9. Start Vite/React dev server (port 5173)
 
     Both servers run side-by-side. Press Ctrl+C in either
     terminal window to stop that server.
@@ -307,6 +308,7 @@ Write-Host "=============================================" -ForegroundColor Gree
 Write-Host ""
 Write-Host "   TIP: Open http://localhost:5173 in your browser" -ForegroundColor Yellow
 Write-Host "   Django runs in the OTHER window that just opened." -ForegroundColor Yellow
+Write-Host "   The job worker (emails, reminders, publishing) runs in a third window." -ForegroundColor Yellow
 Write-Host "   Press Ctrl+C here to stop the React server." -ForegroundColor Yellow
 Write-Host ""
 
@@ -323,6 +325,20 @@ Read-Host 'Server stopped. Press Enter to close'
 "@
 Start-Process powershell -ArgumentList "-NoExit", "-Command", $djangoCmd
 
+# Start the job worker in its own window: password-reset and approval emails,
+# payment reminders and school-wide publishing only run from here.
+$workerCmd = @"
+Set-Location '$BackendDir'
+& '$ActivateScript'
+Write-Host '========================================' -ForegroundColor Green
+Write-Host '  Job worker running (manage.py run_worker)' -ForegroundColor Green
+Write-Host '  Press Ctrl+C to stop' -ForegroundColor Green
+Write-Host '========================================' -ForegroundColor Green
+& '$VenvPython' manage.py run_worker
+Read-Host 'Worker stopped. Press Enter to close'
+"@
+Start-Process powershell -ArgumentList "-NoExit", "-Command", $workerCmd
+
 # Start Vite in THIS terminal (pinned to port 5173)
 Push-Location "$FrontendDir"
 & npm run dev -- --port 5173
@@ -3,7 +3,7 @@
     CESI Project - Stop Development Servers & Backup Database
 .DESCRIPTION
     This script will:
-      1. Backup the SQLite database to db_backup.json
+      1. Backup the SQLite database to BackEnd/db_backup_raw/ (one NDJSON file per table)
       2. Stop Django dev server (port 8000)
       3. Stop Vite/React dev server (port 5173/5174)
 
@@ -13,7 +13,7 @@
     Run from the project ROOT folder (where BackEnd/ and FrontEnd/ live):
       .\stop-dev.ps1
 
-    The backup file (db_backup.json) can be committed to git.
+    The backup folder (BackEnd/db_backup_raw/) can be committed to git.
 #>
 
 param(
@@ -47,7 +47,7 @@ if (-not $SkipBackup) {
             if (Test-Path $VenvPython) {
                 & $VenvPython $ExportScript
                 if ($LASTEXITCODE -eq 0) {
-                    Write-Host "  Database backed up to: db_backup.json" -ForegroundColor Green
+                    Write-Host "  Database backed up to: db_backup_raw/ (NDJSON)" -ForegroundColor Green
                 } else {
                     Write-Host "  Backup script returned error code: $LASTEXITCODE" -ForegroundColor Red
                 }
@@ -55,7 +55,7 @@ if (-not $SkipBackup) {
                 # Fallback: use system python
                 python $ExportScript
                 if ($LASTEXITCODE -eq 0) {
-                    Write-Host "  Database backed up to: db_backup.json" -ForegroundColor Green
+                    Write-Host "  Database backed up to: db_backup_raw/ (NDJSON)" -ForegroundColor Green
                 } else {
                     Write-Host "  Backup script returned error code: $LASTEXITCODE" -ForegroundColor Red
                 }
@@ -115,5 +115,5 @@ Write-Host "========================================" -ForegroundColor Cyan
 Write-Host "  Done!" -ForegroundColor Green
 Write-Host "========================================" -ForegroundColor Cyan
 Write-Host ""
-Write-Host "Tip: Commit db_backup.json to git to preserve your data." -ForegroundColor DarkGray
+Write-Host "Tip: Commit BackEnd/db_backup_raw/ to git to preserve your data." -ForegroundColor DarkGray
 Write-Host ""